@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:27
+
+from django.db import migrations, models
+
+
+def fill_resume_updated_at(apps, schema_editor):
+    # The last profile save is the latest the resume can have changed
+    Candidate = apps.get_model('accounts', 'Candidate')
+    Candidate.objects.using(schema_editor.connection.alias).exclude(resume='').exclude(
+        resume__isnull=True
+    ).update(resume_updated_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_follow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_resume_updated_at, migrations.RunPython.noop),
+    ]
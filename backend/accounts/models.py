@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 
@@ -134,6 +135,9 @@ class Candidate(models.Model):
     job_preferences = models.JSONField(default=list)
 
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    # When `resume` last changed (unlike updated_at, not on profile edits);
+    # resumes saved after a candidate store build are not indexed yet
+    resume_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     # Profile and cover photos
     profile_picture = models.ImageField(upload_to='candidates/profile_pictures/', blank=True, null=True)
@@ -142,6 +146,29 @@ class Candidate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Resume name as last loaded or saved
+    _saved_resume = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'resume' in field_names:
+            instance._saved_resume = values[field_names.index('resume')] or None
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        saves_resume = 'resume' not in self.get_deferred_fields() and (
+            update_fields is None or 'resume' in update_fields
+        )
+        if saves_resume and (self.resume.name or None) != self._saved_resume:
+            self.resume_updated_at = timezone.now() if self.resume else None
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'resume_updated_at'}
+        super().save(*args, **kwargs)
+        if saves_resume:
+            self._saved_resume = self.resume.name or None
+
     def __str__(self):
         return self.name
 
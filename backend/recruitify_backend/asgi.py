@@ -15,6 +15,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings')
 django_asgi_app = get_asgi_application()
 
+# Build the in-memory search indexes before the first search request
+from vacancies import fuzzy_terms, suggestions  # noqa: E402
+suggestions.warm_up()
+fuzzy_terms.warm_up()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from chat.routing import websocket_urlpatterns
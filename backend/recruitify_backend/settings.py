@@ -100,6 +100,77 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ==================================================
+# ML SCORING
+# ==================================================
+
+# Content-addressed cache of parsed resume features (see vacancies/ml/resume_cache.py)
+RESUME_FEATURE_CACHE = {
+    'DIR': BASE_DIR / 'var' / 'resume_features',  # None keeps the cache in memory only
+    'MAX_ENTRIES': 256,                           # in-process LRU entries
+    'MAX_BYTES': 256 * 1024 * 1024,               # on-disk size cap
+}
+
+# Per-stage timing histograms of the scoring pipeline (see vacancies/ml/timing.py),
+# printed by `manage.py stage_timings`
+STAGE_TIMINGS = {
+    'DIR': BASE_DIR / 'var' / 'stage_timings',  # None keeps the histograms in memory only
+    'FLUSH_INTERVAL': 30,                       # seconds between per-process snapshot writes
+}
+
+# Audit trail of scorer results (see vacancies/score_audit.py), written in
+# batches by a background thread: 'jsonl' (rotated file), 'db' (ScoreAuditRecord) or None
+SCORE_AUDIT = {
+    'BACKEND': 'jsonl',
+    'PATH': BASE_DIR / 'var' / 'score_audit' / 'scores.jsonl',
+    'MAX_BYTES': 64 * 1024 * 1024,  # rotate past this size
+    'BACKUP_COUNT': 5,              # rotated files kept
+    'BATCH_SIZE': 200,              # records per write
+    'FLUSH_INTERVAL': 2.0,          # max seconds a record waits in memory
+    'MAX_QUEUE': 10000,             # records dropped beyond this backlog
+}
+
+# Whole-pool candidate features for "matching candidates" (see vacancies/ml/candidate_store.py),
+# built with `manage.py build_candidate_store` (`--if-stale` from cron)
+CANDIDATE_FEATURE_STORE = {
+    'DIR': BASE_DIR / 'var' / 'candidate_features',
+    'MIN_REBUILD_AGE': 3600,   # seconds before --if-stale rebuilds a store for new resumes
+}
+
+# AI fit summaries generated by the scoring worker (see vacancies/ml/fit_summary.py)
+FIT_SUMMARY = {
+    'TIMEOUT': 20.0,            # seconds per Groq request
+    'MAX_CONCURRENCY': 2,       # parallel Groq requests per process
+    'RATE_PER_MINUTE': 30,      # Groq requests per minute per process (0 = unlimited)
+    'FAILURE_THRESHOLD': 5,     # consecutive failures before falling back to rule-based output
+    'RESET_TIMEOUT': 60.0,      # seconds before retrying Groq after the breaker opens
+    'CACHE_SIZE': 1024,         # cached summaries per process
+}
+
+# ==================================================
+# SEARCH
+# ==================================================
+
+# Per-process autocomplete index of /api/search/suggestions/ (see vacancies/suggestions.py),
+# kept current through model signals
+SEARCH_SUGGESTIONS = {
+    'WARM_ON_STARTUP': True,   # build in a background thread when the app loads
+    'REFRESH_INTERVAL': 600,   # seconds between rebuilds picking up other processes' writes (None = never)
+}
+
+# Typo tolerance of /api/search/ (see vacancies/fuzzy_terms.py): misspelled skills are
+# widened to their nearest words in the skill vocabularies
+SEARCH_TYPO_TOLERANCE = {
+    'ENABLED': True,
+    'REFRESH_INTERVAL': 600,   # seconds between vocabulary rebuilds (None = never)
+}
+
+# Faceted vacancy search of /api/vacancies/search/ (see vacancies/facets.py)
+VACANCY_FACETS = {
+    'MAX_VALUES': 20,                                     # values listed per facet, most common first
+    'SALARY_BUCKETS': [0, 25000, 50000, 100000, 200000],  # lower bounds of the salary facet's buckets
+}
+
 AUTH_USER_MODEL = 'accounts.User'
 
 AUTHENTICATION_BACKENDS = [
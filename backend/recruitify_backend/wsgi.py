@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings')
 application = get_wsgi_application()
+
+# Build the in-memory search indexes before the first search request
+from vacancies import fuzzy_terms, suggestions  # noqa: E402
+suggestions.warm_up()
+fuzzy_terms.warm_up()
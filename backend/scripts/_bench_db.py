@@ -0,0 +1,59 @@
+"""
+Throwaway SQLite database for the benchmark scripts that need one.
+
+    import _bench_db
+    _bench_db.setup('bench_example_')
+
+    from vacancies.models import Vacancy   # models only after setup()
+    ...
+
+    if __name__ == "__main__":
+        _bench_db.run(main)
+
+`setup` points the default database at an empty file in a new temporary
+directory (settings can be overridden too) and sets Django up; `run`
+migrates it, calls `main` and removes the directory, also when `main`
+fails or exits. The real database is never touched.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings')
+
+TMP_DIR = None
+
+
+def setup(prefix: str, **overrides) -> str:
+    """Set Django up on an empty database in a new temp dir; returns the dir."""
+    global TMP_DIR
+    TMP_DIR = tempfile.mkdtemp(prefix=prefix)
+
+    from django.conf import settings
+
+    settings.DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(TMP_DIR, 'bench.sqlite3'),
+    }
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    import django
+    django.setup()
+    return TMP_DIR
+
+
+def run(main) -> None:
+    """Migrate the database made by `setup`, run `main`, then delete it."""
+    from django.core.management import call_command
+
+    try:
+        call_command('migrate', verbosity=0)
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Benchmark "matching candidates" with CandidateFeatureStore.
+
+Builds a store of N synthetic candidates (resumes from
+UpdatedResumeDataSet.csv, repeated with different experience years) in a
+temporary directory, times `top_k` for synthetic vacancies, and checks the
+store's scores against `score_resume_features` for a sample of candidates.
+
+Usage: python scripts/bench_candidate_store.py [--candidates 100000] [--vacancies 20]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from vacancies.ml.candidate_store import CandidateFeatureStore, CandidateStoreBuilder
+from vacancies.ml.resume_cache import ResumeFeatures
+from vacancies.ml.scorer import (
+    CompiledJD,
+    _features_from_text,
+    clean_text,
+    load_master_dictionaries,
+    load_resume_dataset,
+    load_tfidf,
+    score_resume_features,
+)
+
+
+COMPONENTS = (
+    "final_score",
+    "skill_match_pct",
+    "semantic_similarity",
+    "education_match",
+    "experience_score",
+    "keyword_match_pct",
+    "job_title_match",
+)
+
+
+def synthetic_jds(count, seed=11):
+    rng = random.Random(seed)
+    df = load_resume_dataset()
+    skills, titles, degrees = load_master_dictionaries()
+    skills, titles, degrees = sorted(skills), sorted(titles), sorted(degrees)
+    texts = df["Resume"].tolist()
+    keywords = ["api", "agile", "cloud", "rest", "microservices", "testing", "design", "leadership"]
+
+    jds = []
+    for _ in range(count):
+        min_exp = rng.choice([0, 1, 2, 3, 5])
+        jds.append({
+            "job_title": rng.choice(titles),
+            "description": texts[rng.randrange(len(texts))][:1500],
+            "required_skills": set(rng.sample(skills, rng.randint(3, 10))),
+            "education_required": set(rng.sample(degrees, rng.randint(0, 3))),
+            "job_title_aliases": set(rng.sample(titles, rng.randint(1, 3))),
+            "keywords": set(rng.sample(keywords, rng.randint(0, 4))),
+            "min_experience_years": min_exp,
+            "max_experience_years": rng.choice([None, min_exp + 5]),
+            "score_weights": rng.choice([{}, {"skills": 0.45, "semantic": 0.05}]),
+        })
+    return jds
+
+
+def synthetic_candidates(count, seed=3):
+    """Yield (candidate id, ResumeFeatures) built from the resume dataset."""
+    df = load_resume_dataset()
+    texts = df["Resume"].tolist()
+    matrix = load_tfidf().transform([clean_text(text) for text in texts])
+    base = [_features_from_text(f"resume-{i}", text, matrix[i]) for i, text in enumerate(texts)]
+
+    rng = random.Random(seed)
+    for candidate_id in range(1, count + 1):
+        f = base[candidate_id % len(base)]
+        yield candidate_id, ResumeFeatures(
+            f.sha256, f.raw_text, f.cleaned_text, round(rng.uniform(0, 15), 1),
+            f.skills, f.degrees, f.job_titles, f.tfidf_vector,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--vacancies', type=int, default=20)
+    parser.add_argument('--check', type=int, default=300, help='Candidates per vacancy checked exactly')
+    args = parser.parse_args()
+
+    jds = synthetic_jds(args.vacancies)
+    skills, titles, degrees = load_master_dictionaries()
+    vocabulary = set(skills) | set(titles) | set(degrees)
+    for jd in jds:
+        for field in ("required_skills", "education_required", "keywords", "job_title_aliases"):
+            vocabulary.update(map(str.lower, jd[field]))
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_candidates_")
+    try:
+        started = time.perf_counter()
+        builder = CandidateStoreBuilder(vocabulary)
+        features = {}
+        for candidate_id, entry in synthetic_candidates(args.candidates):
+            builder.add(candidate_id, entry)
+            features[candidate_id] = entry
+        store_dir = builder.write(os.path.join(tmp_dir, "store"), "bench")
+        print(f"Store build ({args.candidates} candidates, {len(builder.terms)} terms): "
+              f"{time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        store = CandidateFeatureStore(store_dir)
+        print(f"Store open: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        compiled = [CompiledJD(jd) for jd in jds]
+        for jd in compiled:
+            jd.jd_vector
+
+        timings = []
+        for jd in compiled:
+            started = time.perf_counter()
+            store.top_k(jd, k=20, master_titles=titles)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"top_k (20 of {len(store)}): median {timings[len(timings) // 2] * 1000:.1f} ms, "
+              f"worst {timings[-1] * 1000:.1f} ms")
+
+        rng = random.Random(1)
+        mismatches = 0
+        for jd in compiled:
+            components = store.score_all(jd, master_titles=titles)
+            top = store.top_k(jd, k=20, master_titles=titles)
+            best = sorted(components["final_score"], reverse=True)[:len(top)]
+            if [match["final_score"] for match in top] != [float(score) for score in best]:
+                mismatches += 1
+                print("  top_k order differs from a full sort")
+
+            for row in rng.sample(range(len(store)), min(args.check, len(store))):
+                expected = score_resume_features(features[int(store.candidate_ids[row])], jd)
+                for name in COMPONENTS:
+                    got = components[name][row].item()
+                    if abs(float(got) - float(expected[name])) > 0.011:
+                        mismatches += 1
+                        print(f"  candidate {store.candidate_ids[row]} {name}: store {got} != scorer {expected[name]}")
+                        break
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if mismatches:
+        print(f"❌ {mismatches} candidate score(s) differ from score_resume_features")
+        sys.exit(1)
+    print("✅ Store scores match score_resume_features")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark the compiled entity matcher against the original per-entity loop.
+
+Checks that both produce exactly the same skills / degrees / job titles /
+keywords for every resume in UpdatedResumeDataSet.csv, then reports timings.
+
+Usage: python scripts/bench_entity_matcher.py [--limit N]
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from vacancies.ml.scorer import (
+    clean_text,
+    load_master_dictionaries,
+    load_master_matchers,
+    load_resume_dataset,
+    normalize_token,
+    parse_resume,
+)
+
+
+JD = {
+    "required_skills": {"Python", "Django", "React", "SQL", "Docker", "C++", "machine learning"},
+    "education_required": {"bachelor", "b.tech", "computer science"},
+    "job_title_aliases": {"software engineer", "backend developer", "full stack developer"},
+    "keywords": {"api", "microservices", "agile", "rest"},
+}
+
+
+# --------------------------------------------------
+# Reference implementation (pre-matcher scorer code)
+# --------------------------------------------------
+
+def legacy_extract_entities(text, entities):
+    found = set()
+    norm_text = normalize_token(text)
+
+    for ent in entities:
+        words = clean_text(ent).split()
+        if all(normalize_token(w) in norm_text for w in words):
+            found.add(ent)
+
+    return found
+
+
+def legacy_extract_job_titles(text, titles_master, jd_aliases):
+    found = set()
+    norm_text = normalize_token(text)
+
+    for title in titles_master | jd_aliases:
+        words = clean_text(title).split()
+        if all(normalize_token(w) in norm_text for w in words):
+            found.add(title)
+
+    return found
+
+
+def legacy_parse_resume(text, jd):
+    skills_master, titles_master, degrees_master = load_master_dictionaries()
+    return {
+        "skills": legacy_extract_entities(text, set(map(str.lower, skills_master)) | set(map(str.lower, jd.get("required_skills", set())))),
+        "degrees": legacy_extract_entities(text, set(map(str.lower, degrees_master)) | set(map(str.lower, jd.get("education_required", set())))),
+        "job_titles": legacy_extract_job_titles(text, set(map(str.lower, titles_master)), set(map(str.lower, jd.get("job_title_aliases", set())))),
+        "experience_years": 0.0,
+        "keywords": legacy_extract_entities(text, set(map(str.lower, jd.get("keywords", set())))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--limit', type=int, default=None, help='Only use the first N resumes')
+    args = parser.parse_args()
+
+    df = load_resume_dataset()
+    texts = [clean_text(t) for t in df["Resume"].tolist()[:args.limit]]
+    print(f"Resumes: {len(texts)}")
+
+    started = time.perf_counter()
+    load_master_matchers()
+    print(f"Matcher build (once per process): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    legacy = [legacy_parse_resume(t, JD) for t in texts]
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = [parse_resume(t, JD) for t in texts]
+    compiled_s = time.perf_counter() - started
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy, compiled)) if a != b]
+
+    print(f"Legacy loop:      {legacy_s:8.2f} s  ({legacy_s / len(texts) * 1000:7.2f} ms/resume)")
+    print(f"Compiled matcher: {compiled_s:8.2f} s  ({compiled_s / len(texts) * 1000:7.2f} ms/resume)")
+    print(f"Speedup:          {legacy_s / compiled_s:8.1f}x")
+
+    if mismatches:
+        print(f"❌ {len(mismatches)} resume(s) differ, first: #{mismatches[0]}")
+        sys.exit(1)
+    print("✅ Identical entity sets for every resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Check and benchmark the experience-section parser (extract_experience_years).
+
+Compares the current parser with the previous regex implementation,
+kept below as the reference, on every resume of UpdatedResumeDataSet.csv,
+the PDFs under media/resumes and random strings built from the tokens the
+parser reacts to. Then times both on pathological inputs; the reference
+runs in a subprocess and is stopped after --timeout seconds.
+
+Usage: python scripts/bench_experience_parser.py [--fuzz 20000] [--timeout 10]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from vacancies.ml.scorer import extract_experience_years, extract_text_from_pdf, load_resume_dataset
+
+
+def reference_experience_years(text):
+    """extract_experience_years as it was before the precompiled, linear-time parser."""
+    text = text.lower()
+    exp_section = re.search(
+        r"experience\s*\n(.*?)(?:\n\s*education|\n\s*skills|\n\s*projects|\Z)",
+        text, re.I | re.DOTALL,
+    )
+    if not exp_section:
+        return 0.0
+
+    section = exp_section.group(1)
+    current_year = datetime.now().year
+    ranges = []
+
+    for start, end in re.findall(r"(20\d{2})\s*(?:-|to|–|—)\s*(20\d{2}|present|current)", section):
+        start = int(start)
+        end = current_year if end in ["present", "current"] else int(end)
+        if end > start:
+            ranges.append((start, end))
+
+    for _, start, end in re.findall(
+        r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(20\d{2}).{0,15}(20\d{2}|present|current)",
+        section,
+    ):
+        start = int(start)
+        end = current_year if end in ["present", "current"] else int(end)
+        if end > start:
+            ranges.append((start, end))
+
+    if not ranges:
+        return 0.0
+
+    ranges.sort()
+    total = 0
+    last_end = None
+    for start, end in ranges:
+        if last_end is None:
+            total += end - start
+            last_end = end
+        elif start <= last_end:
+            total += max(0, end - last_end)
+            last_end = max(last_end, end)
+        else:
+            total += end - start
+            last_end = end
+
+    return round(total, 2)
+
+
+FUZZ_TOKENS = [
+    "experience", "Experience", "EXPERIENCE", "education", "skills", "projects", "Projects",
+    "\n", "\n\n", " ", "  ", "\t", " \n ", "2015", "2018", "2019", "2021", "2030", "201", "20",
+    "jan", "january", "mar", "march", "sept", "dec", "may", "x", "at", "-", " - ", "to", " to ",
+    "–", "—", "present", "current", "presentmay", "decpresent", ".", ",", "workexperience", "ſkills", "experıence",
+]
+
+
+def fuzz_texts(count, seed=17):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 60)))
+
+
+def corpus_texts():
+    df = load_resume_dataset()
+    yield from df["Resume"].tolist()
+
+    resumes_dir = os.path.join(BASE_DIR, "media", "resumes")
+    if os.path.isdir(resumes_dir):
+        for name in sorted(os.listdir(resumes_dir)):
+            if name.lower().endswith(".pdf"):
+                yield extract_text_from_pdf(os.path.join(resumes_dir, name))
+
+
+def pathological_inputs():
+    df = load_resume_dataset()
+    cv = next(t for t in df["Resume"].tolist() if reference_experience_years(t) > 0)
+    page = "Experience\n" + cv + "\nJan 2018 - Present  Senior Engineer\n2014 to 2017 Engineer\n"
+    return {
+        "blank lines (20k)": "Experience\nEngineer\n" + "\n" * 20000 + "x",
+        "blank lines (60k)": "Experience\nEngineer\n" + "\n" * 60000 + "x",
+        "letter run (60k)": "Experience\n" + "mar" * 20000 + " 2020",
+        "spaced ranges (60k)": "Experience\n" + "2019" + " " * 30000 + "-" + " " * 30000 + "x",
+        "50-page CV": "\n".join([page] * 50),
+    }
+
+
+def _reference_worker(text, queue):
+    started = time.perf_counter()
+    result = reference_experience_years(text)
+    queue.put((result, time.perf_counter() - started))
+
+
+def time_reference(text, timeout):
+    """(result, seconds), or (None, None) if the reference takes longer than `timeout`."""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_reference_worker, args=(text, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None, None
+    return queue.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fuzz', type=int, default=20000, help='Random token strings to compare')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds before the reference is stopped')
+    args = parser.parse_args()
+
+    mismatches = 0
+    checked = 0
+    for source, texts in (("corpus", corpus_texts()), ("fuzz", fuzz_texts(args.fuzz))):
+        for text in texts:
+            checked += 1
+            expected, got = reference_experience_years(text), extract_experience_years(text)
+            if expected != got:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  {source}: reference {expected} != parser {got} for {text[:80]!r}")
+    print(f"Compared {checked} texts")
+
+    print()
+    print(f"{'input':<22} {'chars':>8} {'parser':>10} {'reference':>12}")
+    for name, text in pathological_inputs().items():
+        started = time.perf_counter()
+        got = extract_experience_years(text)
+        elapsed = time.perf_counter() - started
+
+        expected, reference_elapsed = time_reference(text, args.timeout)
+        if expected is None:
+            reference = f"> {args.timeout:g} s"
+        else:
+            reference = f"{reference_elapsed * 1000:.1f} ms"
+            if expected != got:
+                mismatches += 1
+                print(f"  {name}: reference {expected} != parser {got}")
+        print(f"{name:<22} {len(text):>8} {elapsed * 1000:>7.1f} ms {reference:>12}")
+
+    if mismatches:
+        print(f"❌ {mismatches} result(s) differ from the reference parser")
+        sys.exit(1)
+    print("✅ Parser matches the reference parser")
+
+
+if __name__ == "__main__":
+    main()
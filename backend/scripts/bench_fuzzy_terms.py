@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Check and benchmark typo-tolerant term lookup (vacancies/fuzzy_terms.py).
+
+Builds a TermIndex of N words (the master skill words, padded with
+synthetic skill-like words), then looks up misspellings of random
+vocabulary words (one edit; two for words of 8+ letters) and of words
+that aren't in it. Each lookup is compared with a brute-force scan computing
+the edit distance to every word (at most 2% may differ, as lookups
+are bounded), and both are timed.
+
+Usage: python scripts/bench_fuzzy_terms.py [--terms 100000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings')
+
+import django
+django.setup()
+
+from vacancies.fuzzy_terms import MAX_EXPANSIONS, TermIndex, edit_distance, max_edits, vocabulary_words
+from vacancies.ml.scorer import load_master_dictionaries
+
+
+SYLLABLES = [onset + vowel for onset in ['b', 'ch', 'd', 'f', 'g', 'k', 'l', 'm', 'n', 'p', 'qu', 'r', 's',
+                                          'sh', 't', 'th', 'tr', 'v', 'w', 'z'] for vowel in 'aeiouy'] + ['ck', 'x', 'js', 'ql']
+
+
+def vocabulary(count, rng):
+    words = set()
+    for skill in load_master_dictionaries()[0]:
+        words.update(vocabulary_words(skill))
+    words = sorted(words)[:count]
+    seen = set(words)
+    while len(words) < count:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def misspell(word, edits, rng):
+    for _ in range(edits):
+        i = rng.randrange(len(word))
+        op = rng.choice(('substitute', 'insert', 'delete', 'transpose'))
+        if op == 'substitute':
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+        elif op == 'insert':
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+        elif op == 'delete' and len(word) > 4:
+            word = word[:i] + word[i + 1:]
+        elif i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def brute_force(index, word):
+    k = max_edits(word)
+    if k == 0:
+        return []
+    matches = []
+    for word_id, candidate in enumerate(index._words):
+        distance = edit_distance(word, candidate, k)
+        if distance <= k:
+            matches.append((distance, -index._uses[word_id], candidate))
+    matches.sort()
+    return [candidate for _, _, candidate in matches[:MAX_EXPANSIONS]]
+
+
+def percentile(timings, fraction):
+    return sorted(timings)[min(len(timings) - 1, int(len(timings) * fraction))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--terms', type=int, default=100000, help='Vocabulary size')
+    parser.add_argument('--queries', type=int, default=2000, help='Misspelled lookups')
+    parser.add_argument('--brute-force', type=int, default=200, help='Lookups also checked by a full scan')
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    words = vocabulary(args.terms, rng)
+    index = TermIndex()
+    started = time.perf_counter()
+    for word in words:
+        index.add(word, uses=rng.randint(0, 50))
+    print(f"Indexed {len(index)} words in {time.perf_counter() - started:.2f} s")
+
+    queries = []
+    for _ in range(args.queries):
+        word = rng.choice(words)
+        if len(word) < 4:
+            continue
+        queries.append((misspell(word, 2 if len(word) >= 8 else 1, rng), word))
+    for _ in range(args.queries // 10):
+        # Words with nothing near them
+        queries.append((''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))), None))
+
+    timings, found = [], 0
+    results = {}
+    for query, original in queries:
+        started = time.perf_counter()
+        results[query] = nearest = index.nearest(query)
+        timings.append(time.perf_counter() - started)
+        if original is not None and (original in nearest or query == original):
+            found += 1
+    typos = sum(1 for _, original in queries if original is not None)
+    print(f"{len(queries)} lookups: p50 {percentile(timings, 0.5):.2f} ms   p99 {percentile(timings, 0.99):.2f} ms   "
+          f"max {max(timings) * 1000:.2f} ms")
+    print(f"Original word among the expansions for {found}/{typos} misspellings ({found / typos * 100:.1f}%)")
+
+    mismatches, scan_timings = 0, []
+    for query, _ in queries[:args.brute_force]:
+        started = time.perf_counter()
+        expected = brute_force(index, query)
+        scan_timings.append(time.perf_counter() - started)
+        if results[query] != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  {query!r}: index {results[query]} != scan {expected}")
+    print(f"Full scan: p50 {percentile(scan_timings, 0.5):.1f} ms per lookup")
+
+    # Lookups read a bounded number of postings and candidates, so a dense
+    # vocabulary can occasionally crowd out a match the scan finds
+    if mismatches > len(scan_timings) * 0.02:
+        print(f"❌ {mismatches}/{len(scan_timings)} lookups differ from the full scan")
+        sys.exit(1)
+    print(f"✅ {len(scan_timings) - mismatches}/{len(scan_timings)} lookups match the full scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+"""
+Benchmark the global search: LIKE scans against the full-text index.
+
+Builds a throwaway SQLite database with N synthetic vacancies and
+candidates, then times, per query,
+
+    - like:  the previous GlobalSearchView approach (icontains over the text
+             columns, then a Python pass over every row for the JSON lists)
+    - index: search_index.search, one BM25-ranked page of 10
+
+and checks that the index returns exactly the rows in which every query
+word starts some word of an indexed field.
+
+Usage: python scripts/bench_global_search.py [--rows 10000]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+import _bench_db
+_bench_db.setup('bench_search_')
+
+from django.db import connection
+from django.db.models import Q
+
+from accounts.models import Candidate, Organization, User
+from vacancies import search_index
+from vacancies.models import Vacancy
+
+
+SKILLS = [
+    'python', 'django', 'react', 'javascript', 'typescript', 'sql', 'postgresql', 'docker',
+    'kubernetes', 'aws', 'machine learning', 'deep learning', 'pandas', 'java', 'spring',
+    'c++', 'go', 'rust', 'figma', 'excel', 'accounting', 'sales', 'marketing', 'seo',
+]
+TITLES = [
+    'software engineer', 'data scientist', 'frontend developer', 'backend developer',
+    'devops engineer', 'product designer', 'accountant', 'sales manager', 'marketing lead',
+]
+CITIES = ['kathmandu', 'pokhara', 'london', 'berlin', 'remote', 'new york', 'lalitpur']
+FILLER = (
+    'we are looking for a motivated person to join our growing team and help us build '
+    'reliable products for customers across the region with modern tools and practices'
+).split()
+
+QUERIES = ['python', 'pyth', 'machine learning', 'engineer london', 'kathmandu', 'rust', 'excel sales', 'zzz']
+
+
+def populate(count):
+    rng = random.Random(42)
+    org_user = User.objects.create(email='org@bench.local', user_type='organization')
+    org = Organization.objects.create(user=org_user, name='Bench', contact_email='org@bench.local')
+
+    vacancies = []
+    for i in range(count):
+        vacancies.append(Vacancy(
+            organization=org,
+            title=rng.choice(TITLES),
+            description=' '.join(rng.choices(FILLER, k=60)),
+            required_skills=rng.sample(SKILLS, 4),
+            keywords=rng.sample(SKILLS, 2),
+            location=rng.choice(CITIES),
+            experience_level=rng.choice(['junior', 'mid', 'senior']),
+            is_public=rng.random() < 0.9,
+            status='open' if rng.random() < 0.8 else 'closed',
+        ))
+    Vacancy.objects.bulk_create(vacancies, batch_size=2000)
+
+    users = User.objects.bulk_create(
+        [User(email=f'c{i}@bench.local', user_type='candidate') for i in range(count)],
+        batch_size=2000,
+    )
+    Candidate.objects.bulk_create(
+        [
+            Candidate(
+                user=user,
+                name=f'Candidate {i}',
+                email=user.email,
+                address=rng.choice(CITIES),
+                availability=rng.choice(['immediately', 'two weeks', 'one month']),
+                skills=rng.sample(SKILLS, 5),
+                job_preferences=rng.sample(TITLES, 2),
+            )
+            for i, user in enumerate(users)
+        ],
+        batch_size=2000,
+    )
+
+    # bulk_create sends no post_save, so fill the index in one go
+    return search_index.rebuild(connection)
+
+
+def like_search(query):
+    """The previous GlobalSearchView body, minus serialization."""
+    vacancy_query = Q(title__icontains=query) | Q(description__icontains=query) | \
+        Q(location__icontains=query) | Q(experience_level__icontains=query)
+    vacancies = Vacancy.objects.filter(vacancy_query, is_public=True, status='open')
+    filtered_vacancies = []
+    for vacancy in vacancies:
+        skills_match = any(query.lower() in str(skill).lower() for skill in vacancy.required_skills)
+        keywords_match = any(query.lower() in str(keyword).lower() for keyword in vacancy.keywords)
+        if skills_match or keywords_match or vacancy in vacancies:
+            filtered_vacancies.append(vacancy)
+    vacancy_ids = set(v.id for v in filtered_vacancies)
+    vacancies = list(Vacancy.objects.filter(id__in=vacancy_ids, is_public=True, status='open')[:10])
+
+    candidate_query = Q(name__icontains=query) | Q(email__icontains=query) | \
+        Q(address__icontains=query) | Q(availability__icontains=query)
+    candidates = Candidate.objects.filter(candidate_query)
+    filtered_candidates = []
+    for candidate in candidates:
+        skills_match = any(query.lower() in str(skill).lower() for skill in candidate.skills)
+        prefs_match = any(query.lower() in str(pref).lower() for pref in candidate.job_preferences)
+        if skills_match or prefs_match or candidate in candidates:
+            filtered_candidates.append(candidate)
+    candidate_ids = set(c.id for c in filtered_candidates)
+    candidates = list(Candidate.objects.filter(id__in=candidate_ids)[:10])
+    return vacancies, candidates
+
+
+def index_search(query):
+    return search_index.search('vacancies', query), search_index.search('candidates', query)
+
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def expected_ids(kind, query):
+    """Ids of rows where every query word starts a word of an indexed field, computed in Python."""
+    index = search_index.INDEXES[kind]
+    model = Vacancy if kind == 'vacancies' else Candidate
+    words = [w.lower() for w in _TOKEN.findall(query)]
+    ids = set()
+    for instance in model.objects.filter(**index.visible).iterator():
+        tokens = set(_TOKEN.findall(' '.join(search_index.document(index, instance)).lower()))
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            ids.add(instance.id)
+    return ids
+
+
+def all_ids(kind, query):
+    _, total = search_index.search(kind, query, limit=1)
+    results, _ = search_index.search(kind, query, limit=max(total, 1))
+    return {instance.id for instance in results}, total
+
+
+def timed(fn, query, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(query)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='Synthetic vacancies and candidates each')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per query')
+    args = parser.parse_args()
+
+    if not search_index.fts5_available(connection):
+        print('❌ This SQLite build has no FTS5')
+        sys.exit(1)
+
+    started = time.perf_counter()
+    counts = populate(args.rows)
+    print(f"Created and indexed {counts['vacancies']} vacancies and {counts['candidates']} candidates "
+          f"in {time.perf_counter() - started:.1f} s")
+
+    mismatches = 0
+    print(f"{'query':<18} {'matches':>16} {'like':>10} {'index':>10}")
+    for query in QUERIES:
+        totals = []
+        for kind in ('vacancies', 'candidates'):
+            ids, total = all_ids(kind, query)
+            totals.append(total)
+            expected = expected_ids(kind, query)
+            if ids != expected or total != len(expected):
+                mismatches += 1
+                print(f"  {query!r} {kind}: index {len(ids)} != expected {len(expected)}")
+        like_ms = timed(like_search, query, args.repeat)
+        index_ms = timed(index_search, query, args.repeat)
+        print(f"{query:<18} {totals[0]:>7} / {totals[1]:>6} {like_ms:>7.1f} ms {index_ms:>7.1f} ms")
+
+    if mismatches:
+        print(f"❌ {mismatches} result set(s) differ from the expected prefix matches")
+        sys.exit(1)
+    print("✅ Index results match the expected prefix matches")
+
+
+if __name__ == "__main__":
+    _bench_db.run(main)
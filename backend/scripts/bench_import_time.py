@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Import-time budget for the Django app.
+
+Every process (runserver, migrate, management commands, the scoring worker)
+imports vacancies.views -> scoring_queue -> ml_scoring -> ml.scorer. The
+scorer must defer its heavy dependencies to first use. This runs the import
+in a fresh interpreter under `python -X importtime` and fails when:
+
+    - any heavy module (pandas, numpy, scipy, sklearn, pdfplumber, groq) is
+      loaded by the import, or
+    - the cumulative import time of vacancies.ml_scoring exceeds the budget
+
+Usage: python scripts/bench_import_time.py [--budget-ms 150] [--runs 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'sklearn', 'pdfplumber', 'groq')
+
+# Modules whose cumulative import time is reported; the budget applies to the first
+REPORTED_MODULES = ('vacancies.ml_scoring', 'vacancies.ml.scorer', 'vacancies.views')
+
+PROGRAM = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings'); "
+    "django.setup(); "
+    "import vacancies.views"
+)
+
+
+def run_once():
+    """Cumulative import time per module, in microseconds."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROGRAM],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(proc.returncode)
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumul, name = line[len('import time:'):].split('|')
+        try:
+            cumulative[name.strip()] = int(cumul)
+        except ValueError:
+            # header line
+            continue
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='Max cumulative import time of vacancies.ml_scoring (default: 150)')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to sample (default: 3)')
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+
+    loaded_heavy = sorted({
+        name for sample in samples for name in sample
+        if name.split('.')[0] in HEAVY_MODULES
+    })
+
+    for module in REPORTED_MODULES:
+        times = [sample.get(module, 0) / 1000 for sample in samples]
+        print(f"{module:24s} best {min(times):8.1f} ms   worst {max(times):8.1f} ms")
+
+    failed = False
+    if loaded_heavy:
+        roots = sorted({name.split('.')[0] for name in loaded_heavy})
+        print(f"❌ Heavy modules imported at startup: {', '.join(roots)}")
+        failed = True
+
+    best = min(sample.get(REPORTED_MODULES[0], 0) for sample in samples) / 1000
+    if best > args.budget_ms:
+        print(f"❌ {REPORTED_MODULES[0]} took {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print(f"✅ Within budget ({args.budget_ms:.0f} ms), no heavy modules imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Check and benchmark the cursor-paginated vacancy and application lists.
+
+Builds a throwaway SQLite database with one organization, N vacancies with
+long descriptions and N applications carrying a full ml_result, then
+compares the list endpoints (first page; every page walked through `next`)
+against serializing the whole list with the full serializers, as the
+endpoints used to. Walking the pages must return each row exactly once,
+in order, also when many rows tie on the ordering column.
+
+Usage: python scripts/bench_list_payloads.py [--rows 5000]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import _bench_db
+_bench_db.setup('bench_list_payloads_', ALLOWED_HOSTS=['*'])
+
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import Candidate, Organization, User
+from vacancies.models import Application, Vacancy
+from vacancies.serializers import ApplicationSerializer, VacancySerializer
+
+
+def populate(count, rng):
+    org_user = User.objects.create(email='org@bench.local', user_type='organization')
+    org = Organization.objects.create(user=org_user, name='Bench', contact_email='org@bench.local')
+    words = 'python django react sql docker team product deliver scale remote senior build'.split()
+    Vacancy.objects.bulk_create([
+        Vacancy(
+            organization=org,
+            title=f'Vacancy {i}',
+            description=' '.join(rng.choice(words) for _ in range(400)),
+            required_skills=rng.sample(words, 5),
+            keywords=rng.sample(words, 6),
+            allowed_candidates=[rng.randrange(10000) for _ in range(20)],
+            location='Kathmandu',
+        )
+        for i in range(count)
+    ], batch_size=500)
+    vacancy_ids = list(Vacancy.objects.values_list('id', flat=True))
+
+    users = User.objects.bulk_create(
+        [User(email=f'c{i}@bench.local', user_type='candidate') for i in range(count)], batch_size=2000,
+    )
+    candidates = Candidate.objects.bulk_create([
+        Candidate(
+            user=user, name=f'Candidate {i}', summary=' '.join(rng.choice(words) for _ in range(80)),
+            skills=rng.sample(words, 6), experience=[{'title': 'Engineer', 'years': 2}] * 3,
+        )
+        for i, user in enumerate(users)
+    ], batch_size=2000)
+
+    applications = []
+    for candidate in candidates:
+        # A third still unscored: many ties on final_score
+        score = round(rng.uniform(0, 100), 2) if rng.random() < 0.66 else 0.0
+        applications.append(Application(
+            vacancy_id=rng.choice(vacancy_ids),
+            candidate=candidate,
+            final_score=score,
+            ml_result={
+                'final_score': score,
+                'matched_skills': rng.sample(words, 4),
+                'missing_skills': rng.sample(words, 3),
+                'fit_summary': ' '.join(rng.choice(words) for _ in range(150)),
+                'strengths': [' '.join(rng.choice(words) for _ in range(12)) for _ in range(5)],
+                'weaknesses': [' '.join(rng.choice(words) for _ in range(12)) for _ in range(5)],
+                'resume_sections': {f'section_{n}': ' '.join(rng.choice(words) for _ in range(60)) for n in range(4)},
+            },
+            scoring_state='done' if score else 'pending',
+        ))
+    Application.objects.bulk_create(applications, batch_size=2000)
+    return org_user
+
+
+def full_list(serializer_class, queryset, user):
+    request = APIRequestFactory().get('/')
+    request.user = user
+    started = time.perf_counter()
+    data = serializer_class(queryset, many=True, context={'request': request}).data
+    body = json.dumps(data, default=str).encode()
+    return time.perf_counter() - started, len(body)
+
+
+def walk(client, url, params):
+    """(first page seconds, first page bytes, all ids, total seconds, total bytes)"""
+    ids, total_bytes = [], 0
+    started = time.perf_counter()
+    response = client.get(url, params)
+    first = time.perf_counter() - started
+    first_bytes = len(response.content)
+    while True:
+        total_bytes += len(response.content)
+        ids.extend(row['id'] for row in response.data['results'])
+        if not response.data['next']:
+            break
+        response = client.get(response.data['next'])
+    return first, first_bytes, ids, time.perf_counter() - started, total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help='Vacancies and applications each')
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    started = time.perf_counter()
+    user = populate(args.rows, rng)
+    print(f"Populated {args.rows} vacancies and applications in {time.perf_counter() - started:.1f} s")
+
+    client = APIClient()
+    client.force_authenticate(user)
+
+    checks = [
+        ('vacancies', '/api/vacancies/', {}, VacancySerializer,
+         Vacancy.objects.select_related('organization'), ['-id']),
+        ('applications', '/api/applications/', {}, ApplicationSerializer,
+         Application.objects.select_related('vacancy__organization', 'candidate'), ['-id']),
+        ('applications by score', '/api/applications/', {'ordering': '-final_score'}, ApplicationSerializer,
+         Application.objects.select_related('vacancy__organization', 'candidate'), ['-final_score', 'id']),
+    ]
+    failures = 0
+    for label, url, params, serializer_class, queryset, ordering in checks:
+        full_seconds, full_bytes = full_list(serializer_class, queryset.order_by(*ordering), user)
+        first, first_bytes, ids, all_seconds, all_bytes = walk(client, url, {**params, 'page_size': args.page_size})
+        expected = list(queryset.order_by(*ordering).values_list('id', flat=True))
+        ok = ids == expected
+        failures += not ok
+        print(f"{label:<22} full list {full_bytes / 1e6:>6.1f} MB {full_seconds * 1000:>7.0f} ms   "
+              f"first page {first_bytes / 1e3:>5.1f} kB {first * 1000:>5.0f} ms   "
+              f"all pages {all_bytes / 1e6:>5.2f} MB {all_seconds * 1000:>6.0f} ms   "
+              f"{'ok' if ok else f'BAD ({len(ids)} ids, {len(set(ids))} distinct, {len(expected)} expected)'}")
+
+    if failures:
+        print(f"❌ {failures} list(s) skip, repeat or reorder rows across pages")
+        sys.exit(1)
+    print("✅ Every page walk returns each row once, in order")
+
+
+if __name__ == "__main__":
+    _bench_db.run(main)
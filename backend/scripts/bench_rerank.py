@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark re-ranking a vacancy from stored score components.
+
+Builds a throwaway SQLite database with one vacancy and N synthetic scored
+applications, changes the vacancy's weights and thresholds, and times
+`rerank_vacancy` (one bulk UPDATE). The results are checked against the
+scorer's formula and `categorize_score` computed in Python, and the score
+kept in `ml_result` against the column.
+
+Usage: python scripts/bench_rerank.py [--applications 10000]
+"""
+import argparse
+import random
+import sys
+import time
+
+import _bench_db
+_bench_db.setup('bench_rerank_')
+
+from accounts.models import Candidate, Organization, User
+from vacancies.models import Application, Vacancy
+from vacancies.ml_scoring import (
+    categorize_score,
+    category_thresholds,
+    rerank_vacancy,
+    score_weights,
+)
+
+
+def populate(count):
+    org_user = User.objects.create(email='org@bench.local', user_type='organization')
+    org = Organization.objects.create(user=org_user, name='Bench', contact_email='org@bench.local')
+    vacancy = Vacancy.objects.create(organization=org, title='Bench vacancy', description='bench')
+
+    users = User.objects.bulk_create(
+        [User(email=f'c{i}@bench.local', user_type='candidate') for i in range(count)],
+        batch_size=2000,
+    )
+    candidates = Candidate.objects.bulk_create(
+        [Candidate(user=user, name=f'Candidate {i}') for i, user in enumerate(users)],
+        batch_size=2000,
+    )
+
+    rng = random.Random(42)
+    applications = []
+    for candidate in candidates:
+        applications.append(Application(
+            vacancy=vacancy,
+            candidate=candidate,
+            ml_result={'final_score': 0.0},
+            scoring_state='done',
+            skill_match_pct=round(rng.uniform(0, 100), 2),
+            semantic_similarity=round(rng.uniform(0, 60), 2),
+            education_match=rng.random() < 0.6,
+            experience_years=round(rng.uniform(0, 12), 1),
+            experience_score=round(rng.uniform(0, 100), 2),
+            keyword_match_pct=round(rng.uniform(0, 100), 2),
+            job_title_match=rng.random() < 0.3,
+        ))
+    Application.objects.bulk_create(applications, batch_size=2000)
+    return vacancy
+
+
+def expected_score(app, weights):
+    return round(
+        weights['skills'] * app.skill_match_pct
+        + weights['semantic'] * app.semantic_similarity
+        + weights['education'] * (100 if app.education_match else 0)
+        + weights['experience'] * app.experience_score
+        + weights['keywords'] * app.keyword_match_pct
+        + weights['title'] * (100 if app.job_title_match else 0),
+        2,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--applications', type=int, default=10000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    vacancy = populate(args.applications)
+    print(f"Populated {args.applications} applications in {time.perf_counter() - started:.1f} s")
+
+    rerank_vacancy(vacancy)  # warm up
+
+    vacancy.score_weights = {'skills': 0.5, 'semantic': 0.1, 'keywords': 0.02}
+    vacancy.category_thresholds = {'highly_preferred': 70, 'mid_preference': 55}
+    vacancy.save()
+
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        updated = rerank_vacancy(vacancy)
+        timings.append(time.perf_counter() - started)
+
+    print(f"rerank_vacancy: {updated} rows, best {min(timings) * 1000:.1f} ms, "
+          f"worst {max(timings) * 1000:.1f} ms")
+
+    weights, thresholds = score_weights(vacancy), category_thresholds(vacancy)
+    mismatches = 0
+    for app in Application.objects.filter(vacancy=vacancy).iterator():
+        # SQL and Python may round a trailing 5 differently
+        if abs(app.final_score - expected_score(app, weights)) > 0.011:
+            mismatches += 1
+        elif app.category != categorize_score(app.final_score, thresholds):
+            mismatches += 1
+        elif app.ml_result['final_score'] != app.final_score:
+            mismatches += 1
+
+    if mismatches:
+        print(f"❌ {mismatches} application(s) differ from the Python formula or their ml_result")
+        sys.exit(1)
+    print("✅ Scores, categories and ml_result match the Python formula")
+
+
+if __name__ == "__main__":
+    _bench_db.run(main)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+"""
+Benchmark the scoring pipeline on a synthetic resume corpus.
+
+Generates N synthetic PDF resumes of controllable length from
+UpdatedResumeDataSet.csv text plus a set of synthetic vacancies, then scores
+every resume against every vacancy:
+
+    - serial:  score_resume, one resume at a time
+    - batched: score_resumes_batch, one call per vacancy
+
+Each mode runs in a fresh interpreter with an empty resume feature cache
+(cold) and then once more in the same process (warm). Reported per run:
+resume/vacancy pairs scored per second, p50/p95/p99 per stage (from the
+stage timers, see vacancies/ml/timing.py) and peak RSS of the process and of
+its PDF extraction workers. AI fit summaries are not part of the benchmark.
+
+Results are written as JSON so runs can be compared across commits:
+
+    python scripts/bench_scoring.py --output before.json
+    git checkout <other commit>
+    python scripts/bench_scoring.py --output after.json --compare before.json
+
+Usage: python scripts/bench_scoring.py [--resumes 200] [--chars 4000] [--vacancies 5]
+                                        [--workers 4] [--corpus DIR] [--output FILE]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+MODES = ('serial', 'batched')
+PERCENTILES = (50, 95, 99)
+
+
+# --------------------------------------------------
+# Synthetic corpus
+# --------------------------------------------------
+
+def _pdf_escape(line):
+    line = line.encode('latin-1', errors='replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, text, chars_per_line=100, lines_per_page=64):
+    """Write `text` as a minimal multi-page PDF (Helvetica, no dependencies)."""
+    lines = []
+    for paragraph in text.splitlines() or ['']:
+        lines.extend(textwrap.wrap(paragraph, chars_per_line) or [''])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # 1: catalog, 2: page tree, 3: font, then a (page, content) pair per page
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    page_ids = []
+    for page_lines in pages:
+        stream = 'BT /F1 9 Tf 11 TL 40 800 Td\n'
+        stream += ''.join(f'({_pdf_escape(line)}) Tj T*\n' for line in page_lines)
+        stream += 'ET'
+        data = stream.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(data), data))
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        page_ids.append(len(objects))
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % pid for pid in page_ids), len(page_ids),
+    )
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as fh:
+        fh.write(out)
+
+
+def build_corpus(directory, count, chars, seed=5):
+    """N distinct resumes of about `chars` characters each; returns their paths."""
+    from vacancies.ml.scorer import load_resume_dataset
+
+    df = load_resume_dataset()
+    texts = [t for t in df['Resume'].tolist() if len(t) > 200]
+    rng = random.Random(seed)
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        start_year = rng.randint(2008, 2020)
+        parts = [
+            f'Candidate {i}',
+            'Experience',
+            f'Software Engineer {start_year} - {start_year + rng.randint(1, 4)}',
+        ]
+        length = sum(len(p) for p in parts)
+        while length < chars:
+            part = texts[rng.randrange(len(texts))]
+            parts.append(part)
+            length += len(part)
+        body = '\n'.join(parts)[:chars]
+
+        path = os.path.join(directory, f'resume_{i:05d}.pdf')
+        write_pdf(path, body)
+        paths.append(path)
+    return paths
+
+
+def synthetic_jds(count, seed=13):
+    from vacancies.ml.scorer import load_master_dictionaries, load_resume_dataset
+
+    rng = random.Random(seed)
+    df = load_resume_dataset()
+    skills, titles, degrees = load_master_dictionaries()
+    skills, titles, degrees = sorted(skills), sorted(titles), sorted(degrees)
+    texts = df['Resume'].tolist()
+    keywords = ['api', 'agile', 'cloud', 'rest', 'microservices', 'testing', 'design', 'leadership']
+
+    jds = []
+    for _ in range(count):
+        min_exp = rng.choice([0, 1, 2, 3, 5])
+        jds.append({
+            'job_title': rng.choice(titles),
+            'description': texts[rng.randrange(len(texts))][:1500],
+            'required_skills': set(rng.sample(skills, rng.randint(3, 10))),
+            'education_required': set(rng.sample(degrees, rng.randint(0, 3))),
+            'job_title_aliases': set(rng.sample(titles, rng.randint(1, 3))),
+            'keywords': set(rng.sample(keywords, rng.randint(0, 4))),
+            'min_experience_years': min_exp,
+            'max_experience_years': rng.choice([None, min_exp + 5]),
+        })
+    return jds
+
+
+# --------------------------------------------------
+# One mode, in a fresh process
+# --------------------------------------------------
+
+def _peak_rss_mb(who):
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def _score_pass(mode, paths, jds, workers):
+    from vacancies.ml.scorer import CompiledJD, score_resume, score_resumes_batch
+    from vacancies.ml.timing import get_stage_timings
+
+    timings = get_stage_timings()
+    timings.reset()
+
+    compiled = [CompiledJD(jd) for jd in jds]
+    failures = 0
+    started = time.perf_counter()
+    for jd in compiled:
+        if mode == 'serial':
+            for path in paths:
+                try:
+                    score_resume(path, jd)
+                except Exception:
+                    failures += 1
+        else:
+            results = score_resumes_batch(paths, jd, max_workers=workers)
+            failures += sum(isinstance(r, Exception) for r in results)
+    elapsed = time.perf_counter() - started
+
+    pairs = len(paths) * len(jds)
+    stages = {
+        stage: {
+            'count': histogram.count,
+            'mean_ms': round(histogram.total_ms / histogram.count, 3),
+            **{f'p{q}_ms': round(histogram.percentile(q), 3) for q in PERCENTILES},
+        }
+        for stage, histogram in sorted(timings.histograms().items())
+    }
+    return {
+        'pairs': pairs,
+        'failures': failures,
+        'seconds': round(elapsed, 3),
+        'pairs_per_sec': round(pairs / elapsed, 2) if elapsed else None,
+        'stages': stages,
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'children_peak_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_mode(mode, corpus_dir, jd_count, workers):
+    """Entry point of the child process: cold then warm pass for `mode`."""
+    from vacancies.ml import resume_cache
+    from vacancies.ml.scorer import load_master_matchers, load_tfidf
+
+    # Datasets and the TF-IDF artifact are loaded once per process, not per resume
+    load_tfidf()
+    load_master_matchers()
+    jds = synthetic_jds(jd_count)
+    paths = sorted(os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir) if name.endswith('.pdf'))
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_scoring_cache_')
+    try:
+        # Empty cache (memory + disk tier) for the cold pass
+        resume_cache._cache = resume_cache.ResumeFeatureCache(directory=cache_dir, max_bytes=4 * 1024 ** 3)
+        runs = []
+        for phase in ('cold', 'warm'):
+            run = _score_pass(mode, paths, jds, workers)
+            runs.append({'mode': mode, 'phase': phase, **run})
+        return runs
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+# --------------------------------------------------
+# Driver
+# --------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _print_run(run):
+    print(f"\n{run['mode']} / {run['phase']}: {run['pairs']} pairs in {run['seconds']:.2f} s "
+          f"-> {run['pairs_per_sec']:.1f} pairs/s, peak RSS {run['peak_rss_mb']:.0f} MB "
+          f"(workers {run['children_peak_rss_mb']:.0f} MB), {run['failures']} failures")
+    for stage, row in run['stages'].items():
+        print(f"    {stage:<18}{row['count']:>7}" + ''.join(
+            f"  p{q} {row[f'p{q}_ms']:>9.2f} ms" for q in PERCENTILES
+        ))
+
+
+def _compare(report, baseline_path):
+    with open(baseline_path, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    before = {(r['mode'], r['phase']): r for r in baseline.get('runs', [])}
+
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit')}):")
+    for run in report['runs']:
+        old = before.get((run['mode'], run['phase']))
+        if not old or not old.get('pairs_per_sec'):
+            continue
+        change = (run['pairs_per_sec'] / old['pairs_per_sec'] - 1) * 100
+        print(f"    {run['mode']:<8}{run['phase']:<6}{old['pairs_per_sec']:>9.1f} -> "
+              f"{run['pairs_per_sec']:>9.1f} pairs/s ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--chars', type=int, default=4000, help='Approximate characters per resume')
+    parser.add_argument('--vacancies', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='PDF extraction processes in batched mode')
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated subset of: ' + ', '.join(MODES))
+    parser.add_argument('--corpus', help='Re-use (or create) the synthetic PDFs in this directory')
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--compare', help='Print throughput changes against an earlier JSON report')
+    parser.add_argument('--run-mode', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.corpus, args.vacancies, args.workers)))
+        return
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix='bench_scoring_corpus_')
+    try:
+        existing = [n for n in os.listdir(corpus_dir) if n.endswith('.pdf')] if os.path.isdir(corpus_dir) else []
+        if len(existing) != args.resumes:
+            started = time.perf_counter()
+            for name in existing:
+                os.remove(os.path.join(corpus_dir, name))
+            build_corpus(corpus_dir, args.resumes, args.chars)
+            print(f"Generated {args.resumes} resumes (~{args.chars} chars) in {time.perf_counter() - started:.1f} s")
+
+        report = {
+            'commit': _git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'params': {
+                'resumes': args.resumes,
+                'chars': args.chars,
+                'vacancies': args.vacancies,
+                'workers': args.workers,
+                'cpu_count': os.cpu_count(),
+                'python': sys.version.split()[0],
+            },
+            'runs': [],
+        }
+
+        for mode in modes:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--run-mode', mode, '--corpus', corpus_dir,
+                 '--vacancies', str(args.vacancies), '--workers', str(args.workers)],
+                cwd=BASE_DIR, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(proc.stderr[-3000:])
+                sys.exit(proc.returncode)
+            for run in json.loads(proc.stdout.strip().splitlines()[-1]):
+                report['runs'].append(run)
+                _print_run(run)
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        _compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+Check and benchmark the autocomplete index (vacancies/suggestions.py).
+
+Fills a SuggestionIndex with N synthetic open vacancies, organizations and
+candidates plus random applications, then applies a stream of updates
+(edits, closings, deletions, new applications) like the model signals do,
+first with lookups in between, then as one backlog. After each phase, every query's suggestions are compared with a brute-force
+scan of the same entries, and lookups are timed.
+
+Usage: python scripts/bench_suggestions.py [--vacancies 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruitify_backend.settings')
+
+import django
+django.setup()
+
+from vacancies.suggestions import SuggestionIndex, normalize, word_suffixes
+
+
+SKILLS = [
+    'Python', 'Django', 'React', 'JavaScript', 'TypeScript', 'SQL', 'PostgreSQL', 'Docker',
+    'Kubernetes', 'AWS', 'Machine Learning', 'Deep Learning', 'Pandas', 'Java', 'Spring Boot',
+    'C++', 'Go', 'Rust', 'Figma', 'Excel', 'Accounting', 'Sales', 'Marketing', 'SEO', 'Node.js',
+]
+TITLE_WORDS = [
+    'senior', 'junior', 'lead', 'software', 'data', 'frontend', 'backend', 'devops', 'product',
+    'engineer', 'developer', 'scientist', 'designer', 'analyst', 'manager', 'accountant', 'intern',
+]
+CITIES = ['Kathmandu', 'Pokhara', 'Lalitpur', 'London', 'Berlin', 'Remote', 'New York', 'São Paulo', 'Zürich']
+NAMES = ['Anita', 'Bikash', 'Chloé', 'David', 'Elena', 'Farhan', 'Gita', 'Hari', 'Ines', 'José', 'Kiran', 'Laxmi']
+
+
+def random_title(rng):
+    return ' '.join(rng.sample(TITLE_WORDS, rng.randint(2, 4))).title() + f' {rng.randint(1, 999)}'
+
+
+class Reference:
+    """Same entries kept in plain dicts; suggestions found by scanning them all."""
+
+    def __init__(self):
+        self.entries = {kind: {} for kind in SuggestionIndex.LIMITS}  # kind -> key -> (weight, text, payload, strings)
+
+    def load(self, index: SuggestionIndex):
+        for kind, prefix_index in index.indexes.items():
+            self.entries[kind] = {
+                key: (-rank[0], rank[1], payload, self.strings(kind, payload))
+                for key, (rank, payload, _) in prefix_index._entries.items()
+            }
+
+    @staticmethod
+    def strings(kind, payload):
+        texts = [payload['text']]
+        if kind == 'vacancy' and payload['subtitle'] != 'Job':
+            texts.append(payload['subtitle'])  # the location
+        return set().union(*(word_suffixes(normalize(text)) for text in texts))
+
+    def suggest(self, query, limit=10):
+        query = normalize(query)
+        suggestions = []
+        for kind, per_kind in SuggestionIndex.LIMITS.items():
+            matches = [
+                ((-weight, text, key), payload)
+                for key, (weight, text, payload, strings) in self.entries[kind].items()
+                if any(s.startswith(query) for s in strings)
+            ]
+            matches.sort(key=lambda match: match[0])
+            suggestions.extend(payload for _, payload in matches[:per_kind])
+        return suggestions[:limit]
+
+
+def populate(index, rng, vacancies, organizations, candidates):
+    for org_id in range(organizations):
+        index.update_organization(org_id, f'{rng.choice(NAMES)} {rng.choice(["Labs", "Tech", "Group", "Bank"])}')
+    for candidate_id in range(candidates):
+        index.update_candidate(candidate_id, f'{rng.choice(NAMES)} {rng.choice(NAMES)}son')
+    for vacancy_id in range(vacancies):
+        index.update_vacancy(
+            vacancy_id, rng.randrange(organizations), random_title(rng), rng.choice(CITIES),
+            rng.sample(SKILLS, rng.randint(2, 6)), visible=True,
+        )
+    for _ in range(vacancies):
+        index.count_application(rng.randrange(vacancies), rng.randrange(candidates), 1)
+
+
+def mutate(index, rng, vacancies, organizations, candidates, count, query_list, every=10):
+    """Apply `count` updates with a timed lookup after every `every` of them; returns update and lookup seconds."""
+    update_timings, lookup_timings = [], []
+    for i in range(count):
+        if i % every == 0:
+            # Lookups between updates leave some nodes fresh and others stale
+            started = time.perf_counter()
+            index.suggest(rng.choice(query_list))
+            lookup_timings.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        vacancy_id = rng.randrange(vacancies)
+        action = rng.random()
+        if action < 0.4:
+            index.update_vacancy(
+                vacancy_id, rng.randrange(organizations), random_title(rng), rng.choice(CITIES),
+                rng.sample(SKILLS, rng.randint(1, 4)), visible=rng.random() < 0.8,
+            )
+        elif action < 0.5:
+            index.remove_vacancy(vacancy_id)
+        elif action < 0.6:
+            index.update_candidate(rng.randrange(candidates), rng.choice(NAMES))
+        else:
+            index.count_application(vacancy_id, rng.randrange(candidates), rng.choice((1, 1, 1, -1)))
+        update_timings.append(time.perf_counter() - started)
+    return update_timings, lookup_timings
+
+
+def queries(rng, count):
+    words = TITLE_WORDS + [normalize(s) for s in SKILLS + CITIES + NAMES]
+    out = []
+    for _ in range(count):
+        word = rng.choice(words)
+        out.append(word[:rng.randint(2, max(2, len(word)))])
+    return out + ['sao', 'zur', 'chloe', 'machine le', 'senior software engineer developer scientist x', 'qq']
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"{label:<32} {len(timings):>6}   p50 {p50:>7.1f} µs   p99 {p99:>8.1f} µs   max {timings[-1] * 1e6:>8.1f} µs")
+
+
+def check_and_time(label, index, reference, query_list):
+    # Timed first: after updates, lookups recompute the stale nodes they hit
+    timings = []
+    for query in query_list:
+        started = time.perf_counter()
+        index.suggest(query)
+        timings.append(time.perf_counter() - started)
+    report(label, timings)
+
+    reference.load(index)
+    mismatches = 0
+    for query in query_list:
+        if index.suggest(query) != reference.suggest(query):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  {label}: suggestions for {query!r} differ from the scan")
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vacancies', type=int, default=100000, help='Synthetic open vacancies')
+    parser.add_argument('--queries', type=int, default=2000, help='Random prefixes per phase')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    organizations = max(1, args.vacancies // 20)
+    candidates = max(1, args.vacancies // 2)
+
+    index = SuggestionIndex(deferred=True)
+    started = time.perf_counter()
+    populate(index, rng, args.vacancies, organizations, candidates)
+    index.warm()
+    print(f"Built index of {args.vacancies} vacancies, {organizations} organizations, "
+          f"{candidates} candidates in {time.perf_counter() - started:.1f} s "
+          f"({sum(len(i._children) for i in index.indexes.values())} trie nodes)")
+
+    reference = Reference()
+    query_list = queries(rng, args.queries)
+    mismatches = check_and_time('lookups after build', index, reference, query_list)
+
+    updates = max(1, args.vacancies // 10)
+    update_timings, lookup_timings = mutate(index, rng, args.vacancies, organizations, candidates, updates, query_list)
+    report('updates', update_timings)
+    report('lookups between updates', lookup_timings)
+    mismatches += check_and_time('lookups after updates', index, reference, query_list)
+
+    # A backlog of updates with no lookups: the first lookups pay for it
+    mutate(index, rng, args.vacancies, organizations, candidates, updates, query_list, every=updates)
+    mismatches += check_and_time(f'first lookups after {updates} updates', index, reference, query_list)
+
+    if mismatches:
+        print(f"❌ {mismatches} lookup(s) differ from the brute-force scan")
+        sys.exit(1)
+    print("✅ Suggestions match the brute-force scan")
+
+
+if __name__ == "__main__":
+    main()
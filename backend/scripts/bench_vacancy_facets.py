@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Check and benchmark the faceted vacancy search (vacancies/facets.py).
+
+Builds a throwaway SQLite database with N synthetic vacancies, fills the
+skill table and salary bounds with `facets.rebuild`, then runs filter
+combinations through `facets.search`. Each result (page, total and every
+facet count) is compared with a Python pass over all vacancies, filtering
+the required_skills JSON the way the list views used to, and both are timed.
+
+Usage: python scripts/bench_vacancy_facets.py [--vacancies 20000]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+import _bench_db
+_bench_db.setup('bench_vacancy_facets_')
+
+from django.conf import settings
+
+from accounts.models import Organization, User
+from vacancies import facets
+from vacancies.models import Vacancy
+
+
+SKILLS = [
+    'Python', 'Django', 'React', 'JavaScript', 'TypeScript', 'SQL', 'PostgreSQL', 'Docker',
+    'Kubernetes', 'AWS', 'Machine Learning', 'Pandas', 'Java', 'Spring Boot', 'C++', 'Go',
+    'Figma', 'Excel', 'Accounting', 'Sales', 'Marketing', 'SEO', 'Node.js', 'Café Management',
+]
+CITIES = ['Kathmandu', 'Pokhara', 'Lalitpur', 'London', 'Berlin', 'Remote', '']
+LEVELS = ['Entry Level', 'Mid Level', 'Senior Level', 'Lead', None]
+SALARIES = ['$40k - $60k', 'NPR 50,000 - 80,000', '90-120k', '150000', 'Negotiable', None, '$200k+']
+
+
+def populate(count, rng):
+    user = User.objects.create(email='org@bench.local', user_type='organization')
+    org = Organization.objects.create(user=user, name='Bench', contact_email='org@bench.local')
+    Vacancy.objects.bulk_create([
+        Vacancy(
+            organization=org,
+            title=f'Vacancy {i}',
+            description='bench',
+            # Mixed spellings of the same skill count once
+            required_skills=[
+                skill.lower() if rng.random() < 0.2 else skill
+                for skill in rng.sample(SKILLS, rng.randint(1, 6))
+            ],
+            location=rng.choice(CITIES),
+            experience_level=rng.choice(LEVELS),
+            salary_range=rng.choice(SALARIES),
+            is_public=rng.random() < 0.9,
+            status='open' if rng.random() < 0.8 else 'closed',
+        )
+        for i in range(count)
+    ], batch_size=2000)
+
+
+def python_search(filters, offset, limit):
+    """Same answer from every vacancy loaded into Python."""
+    rows = []
+    for vacancy in Vacancy.objects.filter(is_public=True, status='open').order_by('-created_at', '-id'):
+        salary_min, salary_max = facets.parse_salary_range(vacancy.salary_range)
+        rows.append((vacancy, set(facets.vacancy_skills(vacancy.required_skills)), salary_min, salary_max))
+
+    wanted_skills = {facets.skill_key(name) for name in filters.get('skills') or ()}
+    tests = {}
+    if wanted_skills:
+        tests['skills'] = lambda row: bool(row[1] & wanted_skills)
+    if filters.get('locations'):
+        tests['locations'] = lambda row: row[0].location in filters['locations']
+    if filters.get('experience_levels'):
+        tests['experience_levels'] = lambda row: row[0].experience_level in filters['experience_levels']
+    if filters.get('salary_min') is not None or filters.get('salary_max') is not None:
+        tests['salary'] = lambda row: (
+            row[3] is not None
+            and (filters.get('salary_min') is None or row[3] >= filters['salary_min'])
+            and (filters.get('salary_max') is None or row[2] <= filters['salary_max'])
+        )
+
+    def matching(excluding=None):
+        return [row for row in rows if all(test(row) for facet, test in tests.items() if facet != excluding)]
+
+    matches = matching()
+    skills = Counter(key for row in matching('skills') for key in row[1])
+    locations = Counter(row[0].location for row in matching('locations') if row[0].location)
+    levels = Counter(row[0].experience_level for row in matching('experience_levels') if row[0].experience_level)
+    bounds = sorted(settings.VACANCY_FACETS['SALARY_BUCKETS'])
+    salary_rows = [row for row in matching('salary') if row[2] is not None]
+    salary = [
+        sum(1 for row in salary_rows if row[3] >= low and (high is None or row[2] < high))
+        for low, high in zip(bounds, bounds[1:] + [None])
+    ]
+    return [row[0].pk for row in matches[offset:offset + limit]], len(matches), skills, locations, levels, salary
+
+
+def agrees(found, expected):
+    vacancies, total, counts = found
+    ids, expected_total, skills, locations, levels, salary = expected
+    if [vacancy.pk for vacancy in vacancies] != ids or total != expected_total:
+        return False
+    for facet, counter in (('skills', skills), ('locations', locations), ('experience_levels', levels)):
+        if any(counter[value['value']] != value['count'] for value in counts[facet]):
+            return False
+        # The values listed are the most common ones
+        if counts[facet] and len(counts[facet]) < len(counter) and max(
+            (count for value, count in counter.items() if value not in {v['value'] for v in counts[facet]}),
+            default=0,
+        ) > counts[facet][-1]['count']:
+            return False
+    return [bucket['count'] for bucket in counts['salary']] == salary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vacancies', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    started = time.perf_counter()
+    populate(args.vacancies, rng)
+    print(f"Populated {args.vacancies} vacancies in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    rows = facets.rebuild('default')
+    print(f"rebuild: {rows} skill rows in {time.perf_counter() - started:.1f} s")
+
+    cases = [
+        {},
+        {'skills': ['python']},
+        {'skills': ['Python', 'Django'], 'locations': ['Kathmandu']},
+        {'experience_levels': ['Senior Level'], 'salary_min': 60000},
+        {'skills': ['café management'], 'salary_min': 50000, 'salary_max': 100000},
+        {'skills': ['Kubernetes'], 'locations': ['Remote', 'Berlin'], 'experience_levels': ['Lead', 'Mid Level']},
+        {'skills': ['Cobol']},
+    ]
+    mismatches = 0
+    for filters in cases:
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            found = facets.search(filters, offset=10, limit=10)
+            timings.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        expected = python_search(filters, offset=10, limit=10)
+        scan = time.perf_counter() - started
+        ok = agrees(found, expected)
+        mismatches += not ok
+        print(f"{'ok ' if ok else 'BAD'} {found[1]:>6} matches   facets {min(timings) * 1000:>7.1f} ms   "
+              f"python scan {scan * 1000:>8.1f} ms   {filters}")
+
+    if mismatches:
+        print(f"❌ {mismatches} filter combination(s) differ from the Python scan")
+        sys.exit(1)
+    print("✅ Results and facet counts match the Python scan")
+
+
+if __name__ == "__main__":
+    _bench_db.run(main)
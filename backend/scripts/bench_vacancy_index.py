@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark reverse matching with VacancyIndex.
+
+Builds N synthetic vacancies from the master dictionaries, ranks resumes from
+UpdatedResumeDataSet.csv against all of them, and checks the vectorized
+scores against `score_resume_features` for a sample of vacancies. Also times
+an incremental sync after editing and closing a few vacancies.
+
+Usage: python scripts/bench_vacancy_index.py [--vacancies 5000] [--resumes 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from vacancies.ml.scorer import (
+    _features_from_text,
+    clean_text,
+    load_master_dictionaries,
+    load_resume_dataset,
+    load_tfidf,
+    score_resume_features,
+)
+from vacancies.ml.vacancy_index import VacancyIndex
+
+
+COMPONENTS = (
+    "final_score",
+    "skill_match_pct",
+    "semantic_similarity",
+    "education_match",
+    "experience_score",
+    "keyword_match_pct",
+    "job_title_match",
+)
+
+
+def synthetic_jds(count, seed=7):
+    rng = random.Random(seed)
+    df = load_resume_dataset()
+    skills, titles, degrees = load_master_dictionaries()
+    skills, titles, degrees = sorted(skills), sorted(titles), sorted(degrees)
+    texts = df["Resume"].tolist()
+    keywords = ["api", "agile", "cloud", "rest", "microservices", "testing", "design", "leadership"]
+
+    jds = {}
+    for vid in range(1, count + 1):
+        min_exp = rng.choice([0, 0, 1, 2, 3, 5])
+        jds[vid] = {
+            "job_title": rng.choice(titles),
+            "description": texts[rng.randrange(len(texts))][:1500],
+            "required_skills": set(rng.sample(skills, rng.randint(3, 10))),
+            "education_required": set(rng.sample(degrees, rng.randint(0, 3))),
+            "job_title_aliases": set(rng.sample(titles, rng.randint(1, 3))),
+            "keywords": set(rng.sample(keywords, rng.randint(0, 4))),
+            "min_experience_years": min_exp,
+            "max_experience_years": rng.choice([None, min_exp + 5, 0]),
+            "score_weights": rng.choice([{}, {"skills": 0.45, "semantic": 0.05}]),
+        }
+    return jds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vacancies', type=int, default=5000)
+    parser.add_argument('--resumes', type=int, default=5)
+    parser.add_argument('--check', type=int, default=300, help='Vacancies per resume checked exactly')
+    args = parser.parse_args()
+
+    jds = synthetic_jds(args.vacancies)
+    versions = {vid: 1 for vid in jds}
+    load_jds = lambda ids: {vid: jds[vid] for vid in ids}  # noqa: E731
+
+    df = load_resume_dataset()
+    texts = df["Resume"].tolist()[:args.resumes]
+    tfidf = load_tfidf()
+    resumes = [_features_from_text(str(i), text, tfidf.transform([clean_text(text)])) for i, text in enumerate(texts)]
+
+    index = VacancyIndex()
+    started = time.perf_counter()
+    index.sync(versions, load_jds)
+    index.rank(resumes[0], limit=1)  # materialize matrices + matcher
+    print(f"Index build ({len(index)} vacancies): {time.perf_counter() - started:.2f} s")
+
+    timings = []
+    for features in resumes:
+        started = time.perf_counter()
+        index.rank(features, limit=20)
+        timings.append(time.perf_counter() - started)
+    print(f"rank (top 20 of {len(index)}): best {min(timings) * 1000:.1f} ms, worst {max(timings) * 1000:.1f} ms")
+
+    # Edit 10 vacancies, close 10
+    for vid in range(1, 11):
+        jds[vid] = dict(jds[vid], required_skills={"python", "django"})
+        versions[vid] = 2
+    for vid in range(11, 21):
+        del versions[vid]
+    started = time.perf_counter()
+    compiled, removed = index.sync(versions, load_jds)
+    index.rank(resumes[0], limit=1)
+    print(f"Incremental sync ({compiled} compiled, {removed} removed): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    mismatches = 0
+    for features in resumes:
+        ids, components = index.score_all(features)
+        for row in rng.sample(range(len(ids)), min(args.check, len(ids))):
+            expected = score_resume_features(features, jds[int(ids[row])])
+            for name in COMPONENTS:
+                got = components[name][row].item()
+                if abs(float(got) - float(expected[name])) > 0.011:
+                    mismatches += 1
+                    print(f"  vacancy {ids[row]} {name}: index {got} != scorer {expected[name]}")
+                    break
+
+    if mismatches:
+        print(f"❌ {mismatches} vacancy score(s) differ from score_resume_features")
+        sys.exit(1)
+    print("✅ Index scores match score_resume_features")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Measure the resident memory a scoring worker keeps after warming up.
+
+Each mode runs in a fresh interpreter that loads what a worker needs to
+score (TF-IDF artifact, master dictionary matchers), scores the dataset's
+resumes against one vacancy and reports its RSS:
+
+    - legacy:  the master dictionaries come from the old lru_cached
+               load_master_data, which kept the resume DataFrame resident
+               for the life of the process
+    - current: load_master_dictionaries, read from its JSON cache; the
+               corpus is only loaded while fitting the vectorizer
+
+The difference grows with the size of UpdatedResumeDataSet.csv.
+
+Also checks that both modes produce the same dictionaries.
+
+Usage: python scripts/bench_worker_memory.py [--resumes 200]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+MODES = ('legacy', 'current')
+
+
+def _rss_mb():
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+
+def legacy_load_master_data():
+    """load_master_data as it was: the corpus DataFrame plus the three master sets."""
+    from vacancies.ml.scorer import _read_master_dictionaries, load_resume_dataset
+
+    masters = _read_master_dictionaries()
+    return load_resume_dataset(), set(masters['skills']), set(masters['titles']), set(masters['degrees'])
+
+
+def resume_texts(count):
+    """Resumes to score, read with the csv module so only the legacy mode holds a DataFrame."""
+    import csv
+
+    from vacancies.ml.scorer import RESUME_DATASET_CSV
+
+    csv.field_size_limit(1 << 24)
+    for encoding in ('utf-8', 'latin1'):
+        try:
+            with open(RESUME_DATASET_CSV, encoding=encoding, newline='') as fh:
+                return [row['Resume'] for _, row in zip(range(count), csv.DictReader(fh))]
+        except UnicodeDecodeError:
+            continue
+    return []
+
+
+def run_mode(mode, resumes):
+    """Entry point of the child process."""
+    import gc
+
+    from vacancies.ml import scorer
+    from vacancies.ml.matcher import EntityMatcher
+
+    baseline = _rss_mb()
+    scorer.load_tfidf()
+
+    if mode == 'legacy':
+        # Kept referenced, like the lru_cache did
+        cached = legacy_load_master_data()
+        _, skills, titles, degrees = cached
+        scorer.load_master_matchers.cache_clear()
+        matchers = {
+            'skills': EntityMatcher(skills),
+            'degrees': EntityMatcher(degrees),
+            'job_titles': EntityMatcher(titles),
+        }
+        scorer.load_master_matchers = lambda: matchers
+    else:
+        skills, titles, degrees = scorer.load_master_dictionaries()
+        scorer.load_master_matchers()
+    texts = resume_texts(resumes)
+
+    jd = scorer.CompiledJD({
+        'job_title': 'data scientist',
+        'description': 'python machine learning sql statistics',
+        'required_skills': {'python', 'machine learning', 'sql'},
+        'job_title_aliases': {'data scientist'},
+    })
+    tfidf = scorer.load_tfidf()
+    for i, text in enumerate(texts):
+        vector = tfidf.transform([scorer.clean_text(text)])
+        scorer.score_resume_features(scorer._features_from_text(f'resume-{i}', text, vector), jd)
+    del texts
+    gc.collect()
+
+    return {
+        'mode': mode,
+        'baseline_rss_mb': baseline,
+        'rss_mb': _rss_mb(),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'dictionaries': [len(skills), len(titles), len(degrees)],
+        'dictionaries_hash': hash((frozenset(skills), frozenset(titles), frozenset(degrees))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=200, help='Resumes scored while warming up')
+    parser.add_argument('--run-mode', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.resumes)))
+        return
+
+    # Build the TF-IDF artifact and the dictionary cache first, so no mode pays for them
+    subprocess.run(
+        [sys.executable, '-c', 'from vacancies.ml.scorer import load_master_dictionaries, load_tfidf; '
+                               'load_tfidf(); load_master_dictionaries()'],
+        cwd=BASE_DIR, check=True,
+    )
+
+    runs = {}
+    for mode in MODES:
+        # Same hash seed in both children, so the dictionary hashes are comparable
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-mode', mode, '--resumes', str(args.resumes)],
+            cwd=BASE_DIR, capture_output=True, text=True, env={**os.environ, 'PYTHONHASHSEED': '0'},
+        )
+        if proc.returncode != 0:
+            print(proc.stderr[-3000:])
+            sys.exit(proc.returncode)
+        runs[mode] = run = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{mode:<8} RSS {run['rss_mb']:>7.1f} MB   peak {run['peak_rss_mb']:>7.1f} MB   "
+              f"dictionaries: {'/'.join(map(str, run['dictionaries']))} terms")
+
+    saved = runs['legacy']['rss_mb'] - runs['current']['rss_mb']
+    print(f"Saved per worker: {saved:.1f} MB RSS "
+          f"({saved / runs['legacy']['rss_mb'] * 100:.0f}% of the legacy worker)")
+
+    if runs['legacy']['dictionaries_hash'] != runs['current']['dictionaries_hash']:
+        print("❌ Master dictionaries differ between the legacy and current loaders")
+        sys.exit(1)
+    print("✅ Same master dictionaries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Exercise FitSummaryService against a local fake Groq client (no network).
+
+Checks caching, the concurrency limit, timeouts being passed through, the
+circuit breaker falling back to the rule-based recommendation, and recovery
+once the breaker resets.
+
+Usage: python scripts/test_fit_summary.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from vacancies.ml.fit_summary import FitSummaryService
+
+
+RESULT = {
+    "final_score": 55.2,
+    "skill_match_pct": 60.0,
+    "experience_years": 3.0,
+    "education_match": True,
+    "job_title_match": False,
+    "semantic_similarity": 21.4,
+    "matched_skills": ["python", "django"],
+    "missing_skills": ["react"],
+    "missing_keywords": ["api"],
+}
+
+JD = {
+    "job_title": "backend developer",
+    "required_skills": {"python", "django", "react"},
+    "min_experience_years": 2,
+}
+
+
+class FakeGroqClient:
+    """Mimics `client.chat.completions.create` of the Groq SDK."""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.timeouts = set()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens, timeout=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.timeouts.add(timeout)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise TimeoutError("fake upstream timeout")
+            content = json.dumps({
+                "fit_summary": "Solid backend candidate.",
+                "recommendation": "Consider",
+                "strengths": ["python"],
+                "weaknesses": ["react"],
+            })
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def check(condition, message):
+    print(f"{'✅' if condition else '❌'} {message}")
+    if not condition:
+        sys.exit(1)
+
+
+def main():
+    client = FakeGroqClient()
+    service = FitSummaryService(client=client, timeout=5, max_concurrency=2, rate_per_minute=0)
+
+    first = service.summarize(RESULT, JD)
+    second = service.summarize(dict(RESULT), dict(JD))
+    check(first["fit_summary"] == "Solid backend candidate.", "summary parsed from fake client")
+    check(client.calls == 1 and second == first, "identical evaluation served from cache")
+    check(client.timeouts == {5}, "request timeout passed to the client")
+
+    futures = [service.submit(dict(RESULT, final_score=float(i)), JD) for i in range(8)]
+    for future in futures:
+        future.result()
+    check(client.max_in_flight <= 2, f"concurrency limited (max in flight: {client.max_in_flight})")
+
+    failing = FakeGroqClient(delay=0, fail=True)
+    service = FitSummaryService(client=failing, failure_threshold=3, reset_timeout=0.2, rate_per_minute=0)
+    outcomes = [service.summarize(dict(RESULT, final_score=float(i)), JD) for i in range(6)]
+    check(failing.calls == 3, f"breaker opened after 3 failures ({failing.calls} upstream calls)")
+    check(
+        outcomes[-1]["recommendation"] == "Not Recommended" and "temporarily unavailable" in outcomes[-1]["fit_summary"],
+        "open breaker falls back to the rule-based recommendation",
+    )
+
+    time.sleep(0.25)
+    failing.fail = False
+    recovered = service.summarize(RESULT, JD)
+    check(recovered["fit_summary"] == "Solid backend candidate." and service.breaker.state == "closed",
+          "half-open trial succeeds and closes the breaker")
+
+    service = FitSummaryService(client=None)
+    check("not configured" in service.summarize(RESULT, JD)["fit_summary"], "no API key falls back")
+
+
+if __name__ == "__main__":
+    main()
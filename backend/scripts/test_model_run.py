@@ -45,7 +45,7 @@ job_description = {
 print("Resume path:", resume_path)
 
 try:
-    result = score_resume(resume_path, job_description)
+    result = score_resume(resume_path, job_description, with_summary=True)
     print("\n=== MODEL RESULT ===")
     for k, v in result.items():
         print(f"{k}: {v}")
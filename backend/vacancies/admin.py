@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Vacancy, Application
+from .models import Vacancy, Application, ScoringJob, ScoreAuditRecord
 
 
 @admin.register(Vacancy)
@@ -39,13 +39,19 @@ class ApplicationAdmin(admin.ModelAdmin):
         'vacancy',
         'candidate',
         'final_score',
+        'skill_match_pct',
         'category',
+        'scoring_state',
         'status',
         'applied_at',
     )
 
     list_filter = (
         'status',
+        'scoring_state',
+        'category',
+        'education_match',
+        'job_title_match',
     )
 
     search_fields = (
@@ -65,3 +71,61 @@ class ApplicationAdmin(admin.ModelAdmin):
         'vacancy',
         'candidate',
     )
+
+
+@admin.register(ScoringJob)
+class ScoringJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'application',
+        'kind',
+        'components',
+        'state',
+        'attempts',
+        'run_after',
+        'locked_by',
+        'created_at',
+    )
+
+    list_filter = (
+        'kind',
+        'state',
+    )
+
+    ordering = ('-created_at',)
+
+    readonly_fields = (
+        'created_at',
+        'updated_at',
+    )
+
+    raw_id_fields = ('application',)
+
+
+@admin.register(ScoreAuditRecord)
+class ScoreAuditRecordAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'application_id',
+        'vacancy_id',
+        'candidate_id',
+        'final_score',
+        'created_at',
+    )
+
+    search_fields = (
+        'application_id',
+        'vacancy_id',
+    )
+
+    ordering = ('-created_at',)
+
+    readonly_fields = (
+        'application_id',
+        'vacancy_id',
+        'candidate_id',
+        'resume_path',
+        'final_score',
+        'scorer_result',
+        'created_at',
+    )
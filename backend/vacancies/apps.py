@@ -5,3 +5,10 @@ class VacanciesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vacancies'
     verbose_name = 'Vacancies & Applications'
+
+    def ready(self):
+        from . import fuzzy_terms, search_index, suggestions
+
+        search_index.connect_signals()
+        suggestions.connect_signals()
+        fuzzy_terms.connect_signals()
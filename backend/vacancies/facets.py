@@ -0,0 +1,224 @@
+# backend/vacancies/facets.py
+"""
+Faceted vacancy search (`/api/vacancies/search/`): open public vacancies
+filtered by skill, location, experience level and salary, with the number
+of matches per facet value.
+
+Skill filters and counts read the `VacancySkill` join table, one indexed
+row per (vacancy, skill) of `required_skills`, rewritten whenever a vacancy
+is saved (see Vacancy.save). Salary filters read `salary_min` /
+`salary_max`, parsed from the free-text `salary_range` on save.
+`manage.py rebuild_vacancy_facets` refills both after bulk imports.
+
+Several values of one facet match any of them; different facets must all
+match. Each facet's counts apply the filters of the other facets only, so
+the alternatives to a selected value stay visible:
+
+    VACANCY_FACETS = {
+        'MAX_VALUES': 20,                                    # values listed per facet
+        'SALARY_BUCKETS': [0, 25000, 50000, 100000, 200000],  # lower bounds
+    }
+"""
+
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Min, Q
+
+from vacancies.suggestions import normalize
+
+
+DEFAULT_MAX_VALUES = 20
+DEFAULT_SALARY_BUCKETS = [0, 25000, 50000, 100000, 200000]
+
+SKILL_LENGTH = 100
+
+_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([km]\b)?", re.IGNORECASE)
+_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+
+def _options() -> dict:
+    return getattr(settings, 'VACANCY_FACETS', {}) or {}
+
+
+def skill_key(name) -> str:
+    """Form of a skill name that skills are filtered and grouped by."""
+    return normalize(name)[:SKILL_LENGTH]
+
+
+def parse_salary_range(text):
+    """
+    (low, high) amounts of a free-text salary range, or (None, None):
+    "$100k - $120k" -> (100000, 120000), "NPR 50,000" -> (50000, 50000),
+    "50-80k" and "50k-80" -> (50000, 80000), "Negotiable" -> (None, None).
+    A reversed range ("80k-50k") is read low to high.
+    """
+    amounts = []
+    for number, suffix in _AMOUNT.findall(text or '')[:2]:
+        try:
+            value = float(number.replace(',', ''))
+        except ValueError:
+            continue
+        amounts.append((value, _MULTIPLIERS.get(suffix.lower(), 1) if suffix else None))
+    if not amounts:
+        return None, None
+    if len(amounts) == 2 and (amounts[0][1] is None) != (amounts[1][1] is None) and amounts[0][0] <= amounts[1][0]:
+        # "50-80k", "50k-80": the suffix applies to both ends. Not to "800-1.2k"
+        multiplier = amounts[0][1] or amounts[1][1]
+        amounts = [(value, multiplier) for value, _ in amounts]
+    values = sorted(value * (multiplier or 1) for value, multiplier in amounts)
+    return values[0], values[-1]
+
+
+def vacancy_skills(required_skills) -> dict:
+    """{skill key: name} of a required_skills list, first spelling kept."""
+    skills = {}
+    for name in required_skills or []:
+        name = " ".join(str(name).split())[:SKILL_LENGTH]
+        key = skill_key(name)
+        if key:
+            skills.setdefault(key, name)
+    return skills
+
+
+def sync_vacancy_skills(vacancy) -> None:
+    """Rewrite the VacancySkill rows of `vacancy` to match its required_skills."""
+    VacancySkill = apps.get_model('vacancies', 'VacancySkill')
+    using = vacancy._state.db
+    wanted = vacancy_skills(vacancy.required_skills)
+    existing = set(
+        VacancySkill.objects.using(using).filter(vacancy_id=vacancy.pk).values_list('skill', flat=True)
+    )
+    stale = existing - wanted.keys()
+    if stale:
+        VacancySkill.objects.using(using).filter(vacancy_id=vacancy.pk, skill__in=stale).delete()
+    VacancySkill.objects.using(using).bulk_create([
+        VacancySkill(vacancy_id=vacancy.pk, skill=key, name=name)
+        for key, name in wanted.items() if key not in existing
+    ])
+
+
+def rebuild(using, app_registry=apps, batch_size: int = 1000) -> int:
+    """
+    Refill VacancySkill and the salary bounds of every vacancy, in one
+    transaction. `app_registry` lets migrations pass their historical
+    models. Returns the number of skill rows.
+    """
+    Vacancy = app_registry.get_model('vacancies', 'Vacancy')
+    VacancySkill = app_registry.get_model('vacancies', 'VacancySkill')
+    connection = connections[using]
+    update_salary = (
+        f"UPDATE {connection.ops.quote_name(Vacancy._meta.db_table)} SET salary_min = %s, salary_max = %s WHERE id = %s"
+    )
+
+    count = 0
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        VacancySkill.objects.using(using).all().delete()
+        skills, salaries = [], []
+        rows = Vacancy._base_manager.using(using).values_list('pk', 'required_skills', 'salary_range')
+        for pk, required_skills, salary_range in rows.iterator(chunk_size=batch_size):
+            skills.extend(
+                VacancySkill(vacancy_id=pk, skill=key, name=name)
+                for key, name in vacancy_skills(required_skills).items()
+            )
+            salaries.append((*parse_salary_range(salary_range), pk))
+            if len(salaries) >= batch_size:
+                VacancySkill.objects.using(using).bulk_create(skills, batch_size=batch_size)
+                cursor.executemany(update_salary, salaries)
+                count += len(skills)
+                skills, salaries = [], []
+        VacancySkill.objects.using(using).bulk_create(skills, batch_size=batch_size)
+        cursor.executemany(update_salary, salaries)
+        count += len(skills)
+    return count
+
+
+# ---------- queries ----------
+
+def _conditions(filters: dict) -> dict:
+    """{facet: Q} of the facets `filters` selects values of."""
+    VacancySkill = apps.get_model('vacancies', 'VacancySkill')
+
+    conditions = {}
+    skills = {skill_key(name) for name in filters.get('skills') or ()} - {''}
+    if skills:
+        conditions['skills'] = Q(id__in=VacancySkill.objects.filter(skill__in=skills).values('vacancy_id'))
+    if filters.get('locations'):
+        conditions['locations'] = Q(location__in=filters['locations'])
+    if filters.get('experience_levels'):
+        conditions['experience_levels'] = Q(experience_level__in=filters['experience_levels'])
+    salary = Q()
+    if filters.get('salary_min') is not None:
+        salary &= Q(salary_max__gte=filters['salary_min'])
+    if filters.get('salary_max') is not None:
+        salary &= Q(salary_min__lte=filters['salary_max'])
+    if salary:
+        conditions['salary'] = salary
+    return conditions
+
+
+def _vacancies(conditions: dict, excluding: str = None):
+    Vacancy = apps.get_model('vacancies', 'Vacancy')
+
+    queryset = Vacancy.objects.filter(is_public=True, status='open')
+    for facet, condition in conditions.items():
+        if facet != excluding:
+            queryset = queryset.filter(condition)
+    return queryset
+
+
+def _value_counts(queryset, field: str, limit: int) -> list:
+    rows = (
+        queryset.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+        .order_by().values(field).annotate(count=Count('id'))
+        .order_by('-count', field)[:limit]
+    )
+    return [{'value': row[field], 'label': row[field], 'count': row['count']} for row in rows]
+
+
+def facet_counts(conditions: dict) -> dict:
+    """Per-facet value counts, each under the filters of the other facets."""
+    VacancySkill = apps.get_model('vacancies', 'VacancySkill')
+
+    options = _options()
+    limit = options.get('MAX_VALUES', DEFAULT_MAX_VALUES)
+
+    skills = (
+        VacancySkill.objects.filter(vacancy__in=_vacancies(conditions, excluding='skills').values('id'))
+        .values('skill').annotate(count=Count('id'), name=Min('name'))
+        .order_by('-count', 'skill')[:limit]
+    )
+
+    bounds = sorted(options.get('SALARY_BUCKETS', DEFAULT_SALARY_BUCKETS))
+    buckets = list(zip(bounds, bounds[1:] + [None]))
+    # A vacancy counts towards every bucket its range overlaps
+    salary = _vacancies(conditions, excluding='salary').aggregate(**{
+        f'bucket_{i}': Count('id', filter=Q(salary_max__gte=low) & (Q(salary_min__lt=high) if high is not None else Q()))
+        for i, (low, high) in enumerate(buckets)
+    })
+
+    return {
+        'skills': [{'value': row['skill'], 'label': row['name'], 'count': row['count']} for row in skills],
+        'locations': _value_counts(_vacancies(conditions, excluding='locations'), 'location', limit),
+        'experience_levels': _value_counts(
+            _vacancies(conditions, excluding='experience_levels'), 'experience_level', limit
+        ),
+        'salary': [
+            {'min': low, 'max': high, 'count': salary[f'bucket_{i}']}
+            for i, (low, high) in enumerate(buckets)
+        ],
+    }
+
+
+def search(filters: dict, offset: int, limit: int):
+    """
+    (vacancies, total, facets) for `filters`:
+    {'skills': [...], 'locations': [...], 'experience_levels': [...],
+    'salary_min': number or None, 'salary_max': number or None}.
+    Newest vacancies first.
+    """
+    conditions = _conditions(filters)
+    queryset = _vacancies(conditions).select_related('organization').order_by('-created_at', '-id')
+    return list(queryset[offset:offset + limit]), queryset.count(), facet_counts(conditions)
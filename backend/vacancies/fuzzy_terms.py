@@ -0,0 +1,336 @@
+# backend/vacancies/fuzzy_terms.py
+"""
+Typo tolerance for the global search: "kuberentes" -> "kubernetes".
+
+A `TermIndex` holds the words of the skill vocabularies (the master
+`Technology Skills.xlsx` list, vacancy `required_skills` and candidate
+`skills`) with a trigram index over them. Query words that aren't a
+vocabulary word or a prefix of one are looked up there, and the nearest
+words (fewest edits, then most used) are OR-ed into the full-text query
+(see search_index.match_expression).
+
+Lookups are bounded in work, whatever the vocabulary size:
+
+    - an edit touches at most 4 of a word's padded trigrams, so a word
+      within `k` edits shares at least len(trigrams) - 4k of them with
+      the query. Candidates are collected from the rarest query trigrams
+      only, which is where such a word must appear;
+    - at most MAX_POSTINGS posting entries are read and MAX_CANDIDATES
+      candidates (the ones sharing the most trigrams) get a banded
+      edit-distance check.
+
+Each process keeps one index, built at startup or on first use. Vacancy and candidate
+saves add their new skill words; a background rebuild every
+`REFRESH_INTERVAL` seconds drops words no longer used:
+
+    SEARCH_TYPO_TOLERANCE = {
+        'ENABLED': True,
+        'REFRESH_INTERVAL': 600,   # seconds between rebuilds (None = never)
+    }
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from vacancies.suggestions import normalize
+
+
+logger = logging.getLogger(__name__)
+
+MIN_WORD_LENGTH = 3
+MAX_EXPANSIONS = 3
+MAX_POSTINGS = 60000
+MAX_CANDIDATES = 400
+
+DEFAULT_REFRESH_INTERVAL = 600
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def vocabulary_words(text) -> list:
+    """Words of `text` worth correcting to: lowercased, no digits-only or short tokens."""
+    return [
+        word for word in _WORD.findall(normalize(text))
+        if len(word) >= MIN_WORD_LENGTH and not word.isdigit()
+    ]
+
+
+def trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(word: str) -> int:
+    """Edits tolerated for a word of this length."""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal-string-alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or limit + 1 once it exceeds `limit`.
+    Only the diagonal band |i - j| <= limit of the table is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    over = limit + 1
+    width = len(b) + 1
+    previous2 = None
+    previous = [j if j <= limit else over for j in range(width)]
+    for i in range(1, len(a) + 1):
+        start, stop = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * width
+        if i <= limit:
+            current[0] = i
+        lowest = current[0]
+        char = a[i - 1]
+        for j in range(start, stop + 1):
+            value = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (previous2 is not None and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous2[j - 2] + 1 < value):
+                value = previous2[j - 2] + 1
+            if value > over:
+                value = over
+            current[j] = value
+            if value < lowest:
+                lowest = value
+        if lowest > limit:
+            return over
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else over
+
+
+class TermIndex:
+    def __init__(self):
+        self._words = []                       # word id -> word
+        self._ids = {}                         # word -> word id
+        self._uses = array('I')                # word id -> vacancies/candidates using it
+        self._sizes = array('H')               # word id -> distinct trigrams
+        self._postings = defaultdict(lambda: array('I'))  # trigram -> word ids
+        self._sorted = []                      # words, sorted, for prefix checks
+        self._sorted_stale = False
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, word: str, uses: int = 0) -> None:
+        word_id = self._ids.get(word)
+        if word_id is not None:
+            self._uses[word_id] += uses
+            return
+        word_id = self._ids[word] = len(self._words)
+        self._words.append(word)
+        self._uses.append(uses)
+        word_trigrams = trigrams(word)
+        self._sizes.append(min(len(word_trigrams), 0xFFFF))
+        for trigram in word_trigrams:
+            self._postings[trigram].append(word_id)
+        self._sorted_stale = True
+
+    def add_text(self, text, uses: int = 1) -> None:
+        for word in set(vocabulary_words(text)):
+            self.add(word, uses)
+
+    def is_known(self, word: str) -> bool:
+        """True when `word` is a vocabulary word or the start of one."""
+        if word in self._ids:
+            return True
+        if self._sorted_stale:
+            self._sorted = sorted(self._words)
+            self._sorted_stale = False
+        i = bisect.bisect_left(self._sorted, word)
+        return i < len(self._sorted) and self._sorted[i].startswith(word)
+
+    def nearest(self, word: str, limit: int = MAX_EXPANSIONS,
+                max_postings: int = MAX_POSTINGS, max_candidates: int = MAX_CANDIDATES) -> list:
+        """Vocabulary words within max_edits(word) of `word`, nearest and most used first."""
+        k = max_edits(word)
+        if k == 0:
+            return []
+        query = trigrams(word)
+        lists = sorted((self._postings[t] for t in query if t in self._postings), key=len)
+        # Words within k edits share at least this many trigrams with `word`,
+        # so each appears in one of the (len(query) - needed + 1) rarest lists
+        needed = max(1, len(query) - 4 * k)
+        scanned = 0
+        overlap = Counter()
+        for postings in lists[:len(query) - needed + 1]:
+            if scanned and scanned + len(postings) > max_postings:
+                break
+            overlap.update(postings)
+            scanned += len(postings)
+        if not overlap:
+            return []
+        # Overlap with the remaining lists orders the candidates and, once
+        # complete, rules out those sharing too few trigrams either way.
+        # Words more than k letters longer or shorter can't be within k edits
+        complete = True
+        for postings in lists[len(query) - needed + 1:]:
+            if scanned + len(postings) > max_postings:
+                complete = False
+                break
+            overlap.update(i for i in postings if i in overlap)
+            scanned += len(postings)
+
+        words, sizes = self._words, self._sizes
+        low, high = len(word) - k, len(word) + k
+        if complete:
+            candidates = [
+                (shared, word_id) for word_id, shared in overlap.items()
+                if shared >= needed and shared >= sizes[word_id] - 4 * k and low <= len(words[word_id]) <= high
+            ]
+        else:
+            candidates = [
+                (shared, word_id) for word_id, shared in overlap.items()
+                if low <= len(words[word_id]) <= high
+            ]
+
+        matches = []
+        for shared, word_id in heapq.nlargest(max_candidates, candidates):
+            candidate = words[word_id]
+            distance = edit_distance(word, candidate, k)
+            if distance <= k:
+                matches.append((distance, -self._uses[word_id], candidate))
+        matches.sort()
+        return [candidate for _, _, candidate in matches[:limit]]
+
+    def expand(self, query: str, limit: int = MAX_EXPANSIONS) -> dict:
+        """
+        {lowercased query word: nearest vocabulary words} for the words of
+        `query` the vocabulary doesn't know.
+        """
+        expansions = {}
+        for token in _WORD.findall(query):
+            word = normalize(token)
+            if (len(word) < MIN_WORD_LENGTH or not word.isalnum() or word.isdigit()
+                    or token.lower() in expansions or self.is_known(word)):
+                continue
+            nearest = self.nearest(word, limit=limit)
+            if nearest:
+                expansions[token.lower()] = nearest
+        return expansions
+
+
+def build_term_index() -> TermIndex:
+    from accounts.models import Candidate
+    from vacancies.ml.scorer import load_master_dictionaries
+    from vacancies.models import Vacancy
+
+    index = TermIndex()
+    for skill in load_master_dictionaries()[0]:
+        index.add_text(skill, uses=0)
+    for skills in Vacancy.objects.values_list('required_skills', flat=True).iterator():
+        index.add_text(" ".join(map(str, skills or [])))
+    for skills in Candidate.objects.values_list('skills', flat=True).iterator():
+        index.add_text(" ".join(map(str, skills or [])))
+    return index
+
+
+# ---------- process-wide instance ----------
+
+_index = None
+_built_at = 0.0
+_lock = threading.Lock()        # guards reads and updates of _index
+_build_lock = threading.Lock()  # one build at a time
+
+
+def _options() -> dict:
+    return getattr(settings, 'SEARCH_TYPO_TOLERANCE', {}) or {}
+
+
+def _build() -> None:
+    global _index, _built_at
+
+    index = build_term_index()
+    with _lock:
+        _index, _built_at = index, time.monotonic()
+
+
+def _build_in_background() -> None:
+    from django.db import connection
+
+    try:
+        with _build_lock:
+            _build()
+    except Exception:
+        logger.exception("Failed to build the search term index")
+    finally:
+        # This runs on its own thread, which owns its own connection
+        connection.close()
+
+
+def warm_up() -> None:
+    """Start building the index in a background thread, unless disabled or already built."""
+    if _index is None and _options().get('ENABLED', True):
+        threading.Thread(target=_build_in_background, name='search-terms-warm-up', daemon=True).start()
+
+
+def expand_query(query: str) -> dict:
+    """{misspelled query word: nearest skill words}; empty when typo tolerance is off."""
+    options = _options()
+    if not options.get('ENABLED', True):
+        return {}
+
+    if _index is None:
+        with _build_lock:
+            if _index is None:
+                _build()
+    else:
+        interval = options.get('REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+        if interval and time.monotonic() - _built_at > interval and not _build_lock.locked():
+            threading.Thread(target=_build_in_background, name='search-terms-refresh', daemon=True).start()
+
+    with _lock:
+        return _index.expand(query)
+
+
+# ---------- signals ----------
+
+def _add_skills(skills) -> None:
+    # Additive only (and re-saves count again): the periodic rebuild
+    # drops unused words and resets the use counts
+    text = " ".join(map(str, skills or []))
+
+    def apply():
+        with _lock:
+            if _index is not None:
+                _index.add_text(text)
+
+    transaction.on_commit(apply)
+
+
+def _on_vacancy_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _add_skills(instance.required_skills)
+
+
+def _on_candidate_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _add_skills(instance.skills)
+
+
+def connect_signals() -> None:
+    from django.db.models.signals import post_save
+
+    from accounts.models import Candidate
+    from vacancies.models import Vacancy
+
+    post_save.connect(_on_vacancy_save, sender=Vacancy, dispatch_uid='fuzzy_terms_save_vacancy')
+    post_save.connect(_on_candidate_save, sender=Candidate, dispatch_uid='fuzzy_terms_save_candidate')
@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from vacancies.recommendations import (
+    build_candidate_store,
+    candidate_store_dir,
+    candidate_store_min_age,
+    rebuild_stale_candidate_store,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the memory-mapped candidate feature store used to rank the whole '
+        'candidate pool for a vacancy ("matching candidates")'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Store directory (default: CANDIDATE_FEATURE_STORE["DIR"])',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Resumes loaded per batch (default: 200)',
+        )
+        parser.add_argument(
+            '--if-stale',
+            action='store_true',
+            help='Only rebuild a missing or outdated store, or one older than --min-age '
+                 'with resumes saved since (for cron)',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            help='Seconds, with --if-stale (default: CANDIDATE_FEATURE_STORE["MIN_REBUILD_AGE"])',
+        )
+
+    def handle(self, *args, **options):
+        output = options['output'] or candidate_store_dir()
+        batch_size = max(1, options['batch_size'])
+
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total} resumes')
+
+        started = time.perf_counter()
+        if options['if_stale']:
+            min_age = candidate_store_min_age() if options['min_age'] is None else timedelta(seconds=options['min_age'])
+            built = rebuild_stale_candidate_store(min_age, output, batch_size=batch_size, progress=progress)
+            if built is None:
+                self.stdout.write('Candidate store is up to date')
+                return
+            written, skipped = built
+        else:
+            written, skipped = build_candidate_store(output, batch_size=batch_size, progress=progress)
+
+        for candidate_id, error in skipped:
+            self.stdout.write(self.style.WARNING(f'  Skipped candidate {candidate_id}: {error}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} candidates to {output} '
+            f'({len(skipped)} skipped, {time.perf_counter() - started:.1f}s)'
+        ))
@@ -0,0 +1,48 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from vacancies.ml import tfidf_artifact
+from vacancies.ml.scorer import RESUME_DATASET_CSV, fit_tfidf
+
+
+class Command(BaseCommand):
+    help = 'Fit the resume TF-IDF vectorizer once and persist it as a memory-mappable artifact'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Refit even if the existing artifact matches the dataset checksum',
+        )
+        parser.add_argument(
+            '--output',
+            default=str(tfidf_artifact.DEFAULT_ARTIFACT_DIR),
+            help='Artifact directory (default: vacancies/ml/artifacts/tfidf)',
+        )
+
+    def handle(self, *args, **options):
+        artifact_dir = Path(options['output'])
+        checksum = tfidf_artifact.file_checksum(RESUME_DATASET_CSV)
+
+        if not options['force'] and tfidf_artifact.load_artifact(checksum, artifact_dir) is not None:
+            self.stdout.write(self.style.SUCCESS(
+                f'Artifact at {artifact_dir} is up to date (dataset sha256 {checksum[:12]})'
+            ))
+            return
+
+        self.stdout.write(f'Fitting TF-IDF on {RESUME_DATASET_CSV.name}...')
+        started = time.perf_counter()
+        tfidf = fit_tfidf()
+        fit_seconds = time.perf_counter() - started
+
+        tfidf_artifact.save_artifact(tfidf, checksum, artifact_dir)
+
+        started = time.perf_counter()
+        tfidf_artifact.load_artifact(checksum, artifact_dir)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(tfidf.vocabulary_)} features to {artifact_dir} '
+            f'(fit {fit_seconds:.2f}s, reload {load_ms:.1f}ms, dataset sha256 {checksum[:12]})'
+        ))
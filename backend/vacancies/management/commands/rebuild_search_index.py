@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from vacancies import search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text index of the global search from the vacancy, candidate and organization tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the index of',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not search_index.fts5_available(connection):
+            raise CommandError('Full-text search needs an SQLite database with FTS5')
+
+        search_index.create_tables(connection)
+        counts = search_index.rebuild(connection)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Indexed ' + ', '.join(f'{count} {kind}' for kind, count in counts.items())
+        ))
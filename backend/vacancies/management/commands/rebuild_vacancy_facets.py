@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from vacancies import facets
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the vacancy skill table and salary bounds behind the faceted vacancy search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the facets of',
+        )
+
+    def handle(self, *args, **options):
+        count = facets.rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} vacancy skills'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from vacancies.models import Application
+from vacancies.resume_store import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Bring media/sorted_resumes in line with the applications: move entries whose '
+        'category changed, remove orphans, replace full copies with links to the resume '
+        'blobs and delete unused blobs'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would change',
+        )
+
+    def handle(self, *args, **options):
+        applications = (
+            Application.objects
+            .filter(ml_result__isnull=False)
+            .select_related('candidate', 'vacancy')
+            .iterator()
+        )
+        counts = reconcile(applications, dry_run=options['dry_run'])
+
+        prefix = 'Would have ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}linked {counts['linked']} missing entries, "
+            f"replaced {counts['relinked']} copies with links, "
+            f"removed {counts['removed']} stale entries and {counts['blobs_removed']} unused blobs"
+        ))
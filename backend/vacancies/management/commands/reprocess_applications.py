@@ -1,6 +1,52 @@
-from django.core.management.base import BaseCommand
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from vacancies.models import Application
-from vacancies.ml_scoring import score_application_and_store_resume
+from vacancies.ml.scorer import CompiledJD, score_resumes_batch
+from vacancies.ml_scoring import (
+    build_jd,
+    get_compiled_jd,
+    resolve_resume_path,
+    store_score_result,
+)
+from vacancies.scoring_queue import enqueue_fit_summaries
+
+
+# JSON lines: {"signature": ..., "done": [ids]} then one [ids] line per stored chunk
+DEFAULT_CHECKPOINT = Path(settings.BASE_DIR) / 'var' / 'reprocess_checkpoint.jsonl'
+
+# Compiled JDs inside a pool worker process, keyed on (vacancy id, updated_at)
+_worker_jds = {}
+
+
+def _score_chunk(jd_key, jd, resume_paths):
+    """
+    Runs in a pool worker: score one chunk of resumes for one vacancy.
+    The worker never touches the database; the parent stores the results.
+    """
+    compiled = _worker_jds.get(jd_key)
+    if compiled is None:
+        compiled = _worker_jds[jd_key] = CompiledJD(jd)
+
+    # No nested process pool for PDF extraction inside a pool worker
+    results = score_resumes_batch(resume_paths, compiled, max_workers=1)
+    # Exceptions are not always picklable; ship their message instead
+    return [RuntimeError(str(r)) if isinstance(r, Exception) else r for r in results]
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f'{seconds // 3600}h{seconds % 3600 // 60:02d}m'
+    if seconds >= 60:
+        return f'{seconds // 60}m{seconds % 60:02d}s'
+    return f'{seconds}s'
 
 
 class Command(BaseCommand):
@@ -12,49 +58,245 @@ class Command(BaseCommand):
             action='store_true',
             help='Re-process all applications, even those already scored',
         )
+        parser.add_argument(
+            '--vacancy',
+            type=int,
+            help='Only re-process applications for this vacancy ID',
+        )
+        parser.add_argument(
+            '--organization',
+            type=int,
+            help='Only re-process applications for vacancies of this organization ID',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of scoring processes (default: 1, in-process)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Applications of one vacancy scored per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(DEFAULT_CHECKPOINT),
+            help='Checkpoint file used to resume an interrupted run',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore an existing checkpoint and start from scratch',
+        )
+
+    # ---------- checkpoint ----------
+
+    def _run_signature(self, options):
+        return {
+            'all': bool(options['all']),
+            'vacancy': options['vacancy'],
+            'organization': options['organization'],
+        }
+
+    def _load_checkpoint(self, path, signature):
+        try:
+            with open(path, encoding='utf-8') as fh:
+                header = json.loads(fh.readline())
+                lines = fh.readlines()
+        except (OSError, ValueError):
+            return set()
+
+        if not isinstance(header, dict) or header.get('signature') != signature:
+            self.stdout.write(self.style.WARNING(
+                f'  ⚠ Checkpoint {path} belongs to a different run; starting from scratch'
+            ))
+            return set()
+
+        done_ids = set(header.get('done', []))
+        for line in lines:
+            try:
+                done_ids.update(json.loads(line))
+            except ValueError:
+                # Cut short by a crash mid-append; those applications run again
+                break
+        return done_ids
+
+    def _write_checkpoint(self, path, signature, done_ids):
+        """Rewrite the checkpoint as one header line (at the start and the end of a run)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump({'signature': signature, 'done': sorted(done_ids)}, fh)
+            fh.write('\n')
+        os.replace(tmp_path, path)
+
+    def _append_checkpoint(self, path, ids):
+        """Record one chunk's finished applications, in O(chunk) writes."""
+        if ids:
+            with open(path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(ids) + '\n')
+
+    # ---------- main ----------
 
     def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers and --batch-size must be at least 1')
+
         if options['all']:
             applications = Application.objects.all()
-            self.stdout.write(f'Re-processing ALL {applications.count()} applications...')
         else:
             applications = Application.objects.filter(final_score=0.0)
-            self.stdout.write(f'Re-processing {applications.count()} applications without ML scores...')
 
-        success_count = 0
-        error_count = 0
+        if options['vacancy']:
+            applications = applications.filter(vacancy_id=options['vacancy'])
+        if options['organization']:
+            applications = applications.filter(vacancy__organization_id=options['organization'])
+
+        checkpoint_path = Path(options['checkpoint'])
+        signature = self._run_signature(options)
+        done_ids = set() if options['restart'] else self._load_checkpoint(checkpoint_path, signature)
 
+        applications = applications.select_related('candidate', 'vacancy').order_by('vacancy_id', 'id')
+        total = applications.count()
+        scope = 'ALL' if options['all'] else 'unscored'
+        self.stdout.write(f'Re-processing {total} {scope} applications...')
+        if done_ids:
+            self.stdout.write(f'  Resuming from checkpoint: {len(done_ids)} already done')
+
+        # Group by vacancy so each chunk shares one compiled JD
+        chunks = []
+        by_vacancy = {}
         for app in applications:
+            if app.id in done_ids:
+                continue
+            if not app.candidate.resume:
+                self.stdout.write(self.style.WARNING(
+                    f'  ⚠ App {app.id}: No resume for {app.candidate.name}'
+                ))
+                continue
+            by_vacancy.setdefault(app.vacancy_id, []).append(app)
+
+        for vacancy_apps in by_vacancy.values():
+            vacancy = vacancy_apps[0].vacancy
+            for start in range(0, len(vacancy_apps), options['batch_size']):
+                chunks.append((vacancy, vacancy_apps[start:start + options['batch_size']]))
+
+        pending = sum(len(apps) for _, apps in chunks)
+        self.stats = {'success': 0, 'error': 0, 'processed': 0, 'pending': pending, 'started': time.monotonic()}
+
+        self._write_checkpoint(checkpoint_path, signature, done_ids)
+        try:
+            if options['workers'] == 1:
+                for vacancy, apps in chunks:
+                    results = self._score_locally(vacancy, apps)
+                    self._store_chunk(vacancy, apps, results, done_ids, checkpoint_path)
+            else:
+                self._run_pool(chunks, options['workers'], done_ids, checkpoint_path)
+        except KeyboardInterrupt:
+            self._write_checkpoint(checkpoint_path, signature, done_ids)
+            self.stdout.write(self.style.WARNING(
+                f'\nInterrupted; progress saved to {checkpoint_path}. Re-run the same command to continue.'
+            ))
+            return
+
+        if self.stats['error'] == 0:
+            # Finished cleanly; the next run starts fresh
+            checkpoint_path.unlink(missing_ok=True)
+        else:
+            self._write_checkpoint(checkpoint_path, signature, done_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nCompleted: {self.stats["success"]} successful, {self.stats["error"]} errors'
+        ))
+
+    def _chunk_inputs(self, vacancy, apps):
+        paths = [resolve_resume_path(app.candidate) for app in apps]
+        return paths, [p for p in paths if p is not None]
+
+    def _score_locally(self, vacancy, apps):
+        paths, scorable = self._chunk_inputs(vacancy, apps)
+        results = iter(score_resumes_batch(scorable, get_compiled_jd(vacancy)) if scorable else [])
+        return [next(results) if path is not None else None for path in paths]
+
+    def _run_pool(self, chunks, workers, done_ids, checkpoint_path):
+        # Forked workers must not share the parent's DB connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for vacancy, apps in chunks:
+                paths, scorable = self._chunk_inputs(vacancy, apps)
+                jd_key = (vacancy.id, vacancy.updated_at)
+                future = pool.submit(_score_chunk, jd_key, build_jd(vacancy), scorable)
+                futures[future] = (vacancy, apps, paths)
+
             try:
-                if not app.candidate.resume:
-                    self.stdout.write(self.style.WARNING(
-                        f'  ⚠ App {app.id}: No resume for {app.candidate.name}'
-                    ))
-                    continue
-
-                self.stdout.write(f'  Processing App {app.id}: {app.candidate.name} -> {app.vacancy.title}')
-                
-                final_score, category = score_application_and_store_resume(
-                    candidate=app.candidate,
-                    vacancy=app.vacancy,
-                    application=app,
-                )
-                
-                app.final_score = final_score
-                app.category = category
-                app.save(update_fields=['final_score', 'category'])
-                
-                self.stdout.write(self.style.SUCCESS(
-                    f'    ✓ Score: {final_score:.2f}, Category: {category}'
+                for future in as_completed(futures):
+                    vacancy, apps, paths = futures[future]
+                    try:
+                        scored = iter(future.result())
+                        results = [next(scored) if path is not None else None for path in paths]
+                    except Exception as e:
+                        results = [e] * len(apps)
+                    self._store_chunk(vacancy, apps, results, done_ids, checkpoint_path)
+            except KeyboardInterrupt:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _store_chunk(self, vacancy, apps, results, done_ids, checkpoint_path):
+        """Persist one chunk's results (always in the parent process)."""
+        chunk_done_ids = []
+        scored_ids = []
+        for app, result in zip(apps, results):
+            if isinstance(result, Exception):
+                self.stdout.write(self.style.ERROR(
+                    f'    ✗ App {app.id}: Error: {str(result)}'
                 ))
-                success_count += 1
+                self.stats['error'] += 1
+                continue
 
+            try:
+                if result is None:
+                    # Resume file missing on disk
+                    final_score, category = 0.0, 'no_visit'
+                else:
+                    final_score, category = store_score_result(
+                        app.candidate, vacancy, app, resolve_resume_path(app.candidate), result,
+                    )
             except Exception as e:
                 self.stdout.write(self.style.ERROR(
-                    f'    ✗ Error: {str(e)}'
+                    f'    ✗ App {app.id}: Error: {str(e)}'
                 ))
-                error_count += 1
+                self.stats['error'] += 1
+                continue
 
-        self.stdout.write(self.style.SUCCESS(
-            f'\nCompleted: {success_count} successful, {error_count} errors'
-        ))
+            app.final_score = final_score
+            app.category = category
+            app.scoring_state = 'done'
+            app.save(update_fields=['final_score', 'category', 'scoring_state'])
+            done_ids.add(app.id)
+            chunk_done_ids.append(app.id)
+            self.stats['success'] += 1
+            if result is not None:
+                scored_ids.append(app.id)
+
+        # AI summaries are generated afterwards by run_scoring_worker
+        if scored_ids:
+            enqueue_fit_summaries(scored_ids)
+
+        self._append_checkpoint(checkpoint_path, chunk_done_ids)
+
+        stats = self.stats
+        stats['processed'] += len(apps)
+        elapsed = time.monotonic() - stats['started']
+        rate = stats['processed'] / elapsed if elapsed > 0 else 0.0
+        remaining = stats['pending'] - stats['processed']
+        eta = _format_duration(remaining / rate) if rate > 0 else '?'
+        self.stdout.write(
+            f'  [{stats["processed"]}/{stats["pending"]}] {vacancy.title}: '
+            f'{rate:.2f} apps/s, elapsed {_format_duration(elapsed)}, ETA {eta} '
+            f'({stats["success"]} ok, {stats["error"]} errors)'
+        )
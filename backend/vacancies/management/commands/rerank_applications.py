@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from vacancies.models import Vacancy
+from vacancies.ml_scoring import rerank_vacancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute final scores and categories from stored score components '
+        'using each vacancy\'s weights and thresholds (no PDF re-parsing)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vacancy',
+            type=int,
+            help='Only re-rank applications for this vacancy ID',
+        )
+        parser.add_argument(
+            '--organization',
+            type=int,
+            help='Only re-rank applications for vacancies of this organization ID',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-rank applications of every vacancy',
+        )
+
+    def handle(self, *args, **options):
+        if not (options['all'] or options['vacancy'] or options['organization']):
+            raise CommandError('Pass --vacancy, --organization or --all')
+
+        vacancies = Vacancy.objects.all()
+        if options['vacancy']:
+            vacancies = vacancies.filter(id=options['vacancy'])
+        if options['organization']:
+            vacancies = vacancies.filter(organization_id=options['organization'])
+
+        total = 0
+        for vacancy in vacancies.order_by('id'):
+            started = time.perf_counter()
+            updated = rerank_vacancy(vacancy)
+            total += updated
+            self.stdout.write(
+                f'  {vacancy.title}: {updated} applications in '
+                f'{(time.perf_counter() - started) * 1000:.1f} ms'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'\nRe-ranked {total} applications'))
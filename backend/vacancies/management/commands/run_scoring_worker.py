@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from vacancies.scoring_queue import (
+    default_worker_id,
+    process_available_jobs,
+    requeue_stale_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run the background worker that scores queued applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue and exit instead of polling forever',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Number of jobs to claim per iteration (default: 10)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Seconds after which a running job is considered abandoned (default: 600)',
+        )
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        stale_after = timedelta(seconds=options['stale_after'])
+
+        self.stdout.write(f'Scoring worker {worker_id} started')
+
+        try:
+            while True:
+                requeued = requeue_stale_jobs(stale_after)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'  ⚠ Re-queued {requeued} stale job(s)'))
+
+                succeeded, failed = process_available_jobs(worker_id, limit=options['batch_size'])
+                if succeeded or failed:
+                    self.stdout.write(f'  Processed batch: {succeeded} done, {failed} failed')
+                    continue
+
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Scoring worker stopped'))
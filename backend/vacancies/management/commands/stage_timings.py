@@ -0,0 +1,70 @@
+import json
+import shutil
+
+from django.core.management.base import BaseCommand, CommandError
+from vacancies.ml.timing import get_stage_timings, load_snapshots
+
+
+PERCENTILES = (50, 95, 99)
+
+
+class Command(BaseCommand):
+    help = (
+        'Print p50/p95/p99 per scoring pipeline stage, merged from the timing '
+        'snapshots every web and worker process writes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the summary as JSON',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete the collected snapshots (running processes keep their own histograms)',
+        )
+
+    def handle(self, *args, **options):
+        directory = get_stage_timings().directory
+        if directory is None:
+            raise CommandError('STAGE_TIMINGS["DIR"] is not set; timings are only kept in memory')
+
+        if options['reset']:
+            shutil.rmtree(directory, ignore_errors=True)
+            self.stdout.write(self.style.SUCCESS(f'Removed timing snapshots in {directory}'))
+            return
+
+        histograms = load_snapshots(directory)
+        # Most expensive stages first
+        stages = sorted(histograms.items(), key=lambda item: item[1].total_ms, reverse=True)
+
+        summary = {
+            stage: {
+                'count': histogram.count,
+                'mean_ms': round(histogram.total_ms / histogram.count, 3) if histogram.count else 0.0,
+                **{f'p{q}_ms': round(histogram.percentile(q), 3) for q in PERCENTILES},
+                'max_ms': round(histogram.max_ms, 3),
+            }
+            for stage, histogram in stages
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        if not summary:
+            self.stdout.write(f'No timings recorded yet in {directory}')
+            return
+
+        header = f'{"stage":<18}{"count":>9}{"mean":>11}' + ''.join(f'{f"p{q}":>11}' for q in PERCENTILES) + f'{"max":>11}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for stage, row in summary.items():
+            self.stdout.write(
+                f'{stage:<18}{row["count"]:>9}{row["mean_ms"]:>9.1f}ms'
+                + ''.join(f'{row[f"p{q}_ms"]:>9.1f}ms' for q in PERCENTILES)
+                + f'{row["max_ms"]:>9.1f}ms'
+            )
+        self.stdout.write('\nPercentiles are bucket upper bounds (~9% resolution).')
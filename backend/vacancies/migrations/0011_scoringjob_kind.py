@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0010_application_scoring_state_scoringjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoringjob',
+            name='kind',
+            field=models.CharField(choices=[('score', 'Score'), ('fit_summary', 'AI fit summary')], default='score', max_length=16),
+        ),
+    ]
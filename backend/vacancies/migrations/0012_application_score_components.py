@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:54
+
+from django.db import migrations, models
+
+
+# Frozen copy of ml_scoring.SCORE_COMPONENT_FIELDS at the time of this migration
+COMPONENT_FIELDS = {
+    'skill_match_pct': float,
+    'semantic_similarity': float,
+    'education_match': bool,
+    'experience_years': float,
+    'experience_score': float,
+    'keyword_match_pct': float,
+    'job_title_match': bool,
+}
+
+
+def backfill_score_components(apps, schema_editor):
+    Application = apps.get_model('vacancies', 'Application')
+
+    batch = []
+    for application in Application.objects.exclude(ml_result=None).only('id', 'ml_result').iterator(chunk_size=500):
+        result = application.ml_result
+        if not isinstance(result, dict):
+            continue
+        for field, kind in COMPONENT_FIELDS.items():
+            try:
+                value = kind(result[field]) if result.get(field) is not None else kind()
+            except (TypeError, ValueError):
+                value = kind()
+            setattr(application, field, value)
+        batch.append(application)
+
+        if len(batch) >= 500:
+            Application.objects.bulk_update(batch, list(COMPONENT_FIELDS))
+            batch = []
+
+    if batch:
+        Application.objects.bulk_update(batch, list(COMPONENT_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_follow'),
+        ('vacancies', '0011_scoringjob_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='education_match',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='experience_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='experience_years',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='job_title_match',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='keyword_match_pct',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='semantic_similarity',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='skill_match_pct',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(
+            backfill_score_components,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['vacancy', 'final_score'], name='vacancies_a_vacancy_18c297_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['vacancy', 'category'], name='vacancies_a_vacancy_42cb27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['vacancy', 'skill_match_pct'], name='vacancies_a_vacancy_1dc5c9_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0012_application_score_components'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='category_thresholds',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='score_weights',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
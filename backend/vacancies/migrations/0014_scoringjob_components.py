@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0013_vacancy_ranking_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoringjob',
+            name='components',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
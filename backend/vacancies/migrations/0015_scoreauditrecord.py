@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0014_scoringjob_components'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreAuditRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_id', models.IntegerField(db_index=True)),
+                ('vacancy_id', models.IntegerField(db_index=True)),
+                ('candidate_id', models.IntegerField()),
+                ('resume_path', models.CharField(blank=True, max_length=1024)),
+                ('final_score', models.FloatField()),
+                ('scorer_result', models.JSONField()),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
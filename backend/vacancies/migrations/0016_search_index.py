@@ -0,0 +1,32 @@
+# FTS5 tables of the global search (see vacancies/search_index.py)
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from vacancies import search_index
+
+    connection = schema_editor.connection
+    if not search_index.fts5_available(connection):
+        return
+    search_index.create_tables(connection)
+    search_index.rebuild(connection, app_registry=apps)
+
+
+def drop_search_index(apps, schema_editor):
+    from vacancies import search_index
+
+    if schema_editor.connection.vendor == 'sqlite':
+        search_index.drop_tables(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_follow'),
+        ('vacancies', '0015_scoreauditrecord'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
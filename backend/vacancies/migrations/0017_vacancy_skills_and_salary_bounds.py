@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_facets(apps, schema_editor):
+    from vacancies import facets
+
+    facets.rebuild(schema_editor.connection.alias, app_registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_follow'),
+        ('vacancies', '0016_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancySkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='salary_max',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='salary_min',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'is_public', 'location'], name='vacancies_v_status_4c0ee3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'is_public', 'experience_level'], name='vacancies_v_status_7d7156_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['salary_min', 'salary_max'], name='vacancies_v_salary__d1c4df_idx'),
+        ),
+        migrations.AddField(
+            model_name='vacancyskill',
+            name='vacancy',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_entries', to='vacancies.vacancy'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancyskill',
+            index=models.Index(fields=['skill', 'vacancy'], name='vacancies_v_skill_7e7bac_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vacancyskill',
+            constraint=models.UniqueConstraint(fields=('vacancy', 'skill'), name='unique_skill_per_vacancy'),
+        ),
+        migrations.RunPython(fill_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Salary bounds parsed before "$50k-80" was read as 50000-80000
+
+from django.db import migrations
+
+
+def reparse_salary_ranges(apps, schema_editor):
+    from vacancies.facets import parse_salary_range
+
+    Vacancy = apps.get_model('vacancies', 'Vacancy')
+    vacancies = Vacancy.objects.using(schema_editor.connection.alias).exclude(salary_range='')
+    changed = []
+    for vacancy in vacancies.only('salary_range', 'salary_min', 'salary_max').iterator():
+        bounds = parse_salary_range(vacancy.salary_range)
+        if bounds != (vacancy.salary_min, vacancy.salary_max):
+            vacancy.salary_min, vacancy.salary_max = bounds
+            changed.append(vacancy)
+    Vacancy.objects.using(schema_editor.connection.alias).bulk_update(
+        changed, ['salary_min', 'salary_max'], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0017_vacancy_skills_and_salary_bounds'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse_salary_ranges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,294 @@
+# backend/vacancies/ml/candidate_store.py
+"""
+Precomputed, memory-mapped features of the whole candidate pool, used to rank
+every candidate with a resume against one vacancy.
+
+Both structures are stored term-major so a query only touches the parts that
+belong to the vacancy's own terms:
+
+    tfidf_*.npy     candidates' L2-normalized TF-IDF rows, transposed: for each
+                    TF-IDF feature the candidates containing it (CSR arrays)
+    bitsets.npy     one packed bitset over candidates per dictionary term
+                    (V x ceil(N / 8) uint8), bit set = term present in resume
+
+plus candidate ids, experience years, the term vocabulary and meta.json.
+Term presence uses the scorer's matching rule, so for vacancy terms in the
+vocabulary the components equal what `score_resume_features` computes.
+Terms added after the store was built are reported as not indexed until the
+next `manage.py build_candidate_store`; so are candidates who saved their
+resume after the build started (`built_at`).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from vacancies.ml.matcher import EntityMatcher
+from vacancies.ml.tfidf_artifact import replace_directory
+
+
+STORE_FORMAT_VERSION = 1
+
+
+def _bit_columns(n_rows: int) -> int:
+    return (n_rows + 7) // 8
+
+
+class CandidateStoreBuilder:
+    """
+    Accumulates what the store needs from each candidate's ResumeFeatures
+    (TF-IDF row, experience, present terms) and writes the store files.
+    """
+
+    def __init__(self, vocabulary):
+        self.terms = sorted(set(vocabulary))
+        self.columns = {term: col for col, term in enumerate(self.terms)}
+        self.matcher = EntityMatcher(self.terms)
+
+        self.candidate_ids = []
+        self.vectors = []
+        self.experience_years = []
+        self.term_columns = []
+        # The same resume uploaded by several candidates is matched once
+        self._columns_by_sha = {}
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    def add(self, candidate_id: int, features) -> None:
+        self.candidate_ids.append(candidate_id)
+        self.vectors.append(features.tfidf_vector)
+        self.experience_years.append(features.experience_years)
+        cols = self._columns_by_sha.get(features.sha256)
+        if cols is None:
+            cols = self._columns_by_sha[features.sha256] = sorted(
+                self.columns[term] for term in self.matcher.find_normalized(features.norm_text)
+            )
+        self.term_columns.append(cols)
+
+    def write(self, directory, fingerprint: str, built_at: str = "") -> Path:
+        """
+        Write the store to `directory`, replacing it atomically. `built_at`
+        (ISO 8601) is when the candidates were read.
+        """
+        import numpy as np
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        n = len(self.candidate_ids)
+
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".candidates-", dir=directory.parent))
+        os.chmod(tmp_dir, 0o755)
+        try:
+            # --- term bitsets, written straight into the memory-mapped file
+            bits = np.lib.format.open_memmap(
+                tmp_dir / "bitsets.npy", mode="w+", dtype=np.uint8, shape=(len(self.terms), _bit_columns(n)),
+            )
+            for row, cols in enumerate(self.term_columns):
+                if cols:
+                    bits[cols, row >> 3] |= np.uint8(0x80 >> (row & 7))
+            bits.flush()
+            del bits
+
+            # --- TF-IDF, feature-major
+            n_features = next((v.shape[1] for v in self.vectors if v is not None), 0)
+            empty = sp.csr_matrix((1, n_features))
+            matrix = sp.vstack([v if v is not None else empty for v in self.vectors], format="csr") \
+                if n else sp.csr_matrix((0, n_features))
+            # normalize() rejects a pool without candidates
+            transposed = (normalize(matrix) if n else matrix).T.tocsr()
+            np.save(tmp_dir / "tfidf_indptr.npy", transposed.indptr.astype(np.int64))
+            np.save(tmp_dir / "tfidf_indices.npy", transposed.indices.astype(np.int32))
+            np.save(tmp_dir / "tfidf_data.npy", transposed.data.astype(np.float32))
+
+            np.save(tmp_dir / "candidate_ids.npy", np.asarray(self.candidate_ids, dtype=np.int64))
+            np.save(tmp_dir / "experience_years.npy", np.asarray(self.experience_years, dtype=np.float64))
+
+            # Dictionary terms never contain newlines
+            with open(tmp_dir / "vocabulary.txt", "w", encoding="utf-8") as fh:
+                fh.write("\n".join(self.terms))
+            with open(tmp_dir / "meta.json", "w", encoding="utf-8") as fh:
+                json.dump({
+                    "format_version": STORE_FORMAT_VERSION,
+                    "fingerprint": fingerprint,
+                    "built_at": built_at,
+                    "n_candidates": n,
+                    "n_terms": len(self.terms),
+                    "n_features": n_features,
+                }, fh, indent=2)
+
+            replace_directory(tmp_dir, directory)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        return directory
+
+
+class CandidateFeatureStore:
+    """Read side of a store written by `CandidateStoreBuilder`; arrays are memory-mapped."""
+
+    def __init__(self, directory):
+        import numpy as np
+
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json", encoding="utf-8") as fh:
+            self.meta = json.load(fh)
+        if self.meta.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported candidate store format in {self.directory}")
+        # Stores written before the build time was recorded: when they were written
+        self.built_at = self.meta.get("built_at") or datetime.fromtimestamp(
+            (self.directory / "meta.json").stat().st_mtime, tz=timezone.utc,
+        ).isoformat()
+
+        with open(self.directory / "vocabulary.txt", encoding="utf-8") as fh:
+            terms = fh.read().split("\n") if self.meta["n_terms"] else []
+        self.columns = {term: col for col, term in enumerate(terms)}
+
+        def load(name):
+            return np.load(self.directory / name, mmap_mode="r")
+
+        self.candidate_ids = load("candidate_ids.npy")
+        self.experience_years = load("experience_years.npy")
+        self.bitsets = load("bitsets.npy")
+        self.tfidf_indptr = load("tfidf_indptr.npy")
+        self.tfidf_indices = load("tfidf_indices.npy")
+        self.tfidf_data = load("tfidf_data.npy")
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    @property
+    def fingerprint(self) -> str:
+        return self.meta.get("fingerprint", "")
+
+    # ---------- term presence ----------
+
+    def _any_present(self, terms):
+        """Boolean array: candidate contains at least one of `terms`."""
+        import numpy as np
+
+        cols = sorted({self.columns[t] for t in terms if t in self.columns})
+        if not cols:
+            return np.zeros(len(self), dtype=bool)
+        packed = np.bitwise_or.reduce(self.bitsets[cols], axis=0)
+        return np.unpackbits(packed, count=len(self)).astype(bool)
+
+    def _count_present(self, terms):
+        import numpy as np
+
+        counts = np.zeros(len(self), dtype=np.float64)
+        for col in sorted({self.columns[t] for t in terms if t in self.columns}):
+            counts += np.unpackbits(self.bitsets[col], count=len(self))
+        return counts
+
+    def missing_terms(self, jd) -> list:
+        """Vacancy terms the store has no bitset for (added after the build)."""
+        terms = jd.required_skills | jd.education_required | jd.keywords | jd.job_title_aliases
+        return sorted(t for t in terms if t not in self.columns)
+
+    # ---------- scoring ----------
+
+    def _semantic(self, jd_vector):
+        import numpy as np
+
+        scores = np.zeros(len(self), dtype=np.float64)
+        if jd_vector is None or jd_vector.nnz == 0:
+            return scores
+
+        norm = float(np.sqrt(jd_vector.multiply(jd_vector).sum()))
+        if norm == 0:
+            return scores
+
+        indptr, indices, data = self.tfidf_indptr, self.tfidf_indices, self.tfidf_data
+        for feature, weight in zip(jd_vector.indices, jd_vector.data):
+            start, end = indptr[feature], indptr[feature + 1]
+            if start != end:
+                # A candidate appears at most once per feature
+                scores[indices[start:end]] += (weight / norm) * data[start:end].astype(np.float64)
+        return np.round(scores * 100, 2)
+
+    def _title_columns(self, jd, master_titles) -> set:
+        """Terms whose presence makes match_resume_to_jd's title rule succeed."""
+        extracted_pool = (set(master_titles) | jd.job_title_aliases) & self.columns.keys()
+        satisfying = set()
+        for alias in jd.job_title_aliases:
+            alias_words = set(alias.split())
+            for title in extracted_pool:
+                overlap = len(set(title.split()) & alias_words)
+                if overlap and overlap >= max(1, len(alias_words) - 1):
+                    satisfying.add(title)
+        return satisfying
+
+    def score_all(self, jd, master_titles=()) -> dict:
+        """Components and final score of every candidate against `jd` (CompiledJD)."""
+        import numpy as np
+
+        n_skills = len(jd.required_skills)
+        n_keywords = len(jd.keywords)
+        skill_pct = self._count_present(jd.required_skills) / n_skills * 100 if n_skills else np.zeros(len(self))
+        keyword_pct = self._count_present(jd.keywords) / n_keywords * 100 if n_keywords else np.zeros(len(self))
+        education = self._any_present(jd.education_required)
+        title = self._any_present(self._title_columns(jd, master_titles))
+        semantic = self._semantic(jd.jd_vector)
+
+        # Vectorized experience_score
+        years = np.asarray(self.experience_years, dtype=np.float64)
+        min_exp = jd.jd.get("min_experience_years", 0)
+        max_exp = jd.jd.get("max_experience_years")
+        if min_exp:
+            experience = np.minimum(100.0, (years / min_exp) * 100)
+        else:
+            experience = np.full(len(self), 100.0)
+        if max_exp:
+            experience[years > max_exp] = 100.0
+        experience[years < min_exp] = 0.0
+
+        weights = jd.weights
+        final = (
+            weights["skills"] * skill_pct
+            + weights["semantic"] * semantic
+            + weights["education"] * education * 100
+            + weights["experience"] * experience
+            + weights["keywords"] * keyword_pct
+            + weights["title"] * title * 100
+        )
+
+        return {
+            "final_score": np.round(final, 2),
+            "skill_match_pct": np.round(skill_pct, 2),
+            "semantic_similarity": semantic,
+            "education_match": education,
+            "experience_years": years,
+            "experience_score": np.round(experience, 2),
+            "keyword_match_pct": np.round(keyword_pct, 2),
+            "job_title_match": title,
+        }
+
+    def top_k(self, jd, k: int = 20, exclude=(), master_titles=()) -> list:
+        """Best `k` candidates for `jd`, best first, via a partial sort."""
+        import numpy as np
+
+        if not len(self):
+            return []
+
+        components = self.score_all(jd, master_titles)
+        final = components["final_score"].copy()
+        if exclude:
+            final[np.isin(self.candidate_ids, list(exclude))] = -np.inf
+
+        rows = np.flatnonzero(np.isfinite(final))
+        if k < len(rows):
+            rows = rows[np.argpartition(-final[rows], k - 1)[:k]]
+        ids = np.asarray(self.candidate_ids)
+        rows = rows[np.lexsort((ids[rows], -final[rows]))]
+
+        return [
+            {"candidate_id": int(ids[row]), **{name: values[row].item() for name, values in components.items()}}
+            for row in rows
+        ]
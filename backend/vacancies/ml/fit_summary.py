@@ -0,0 +1,457 @@
+# backend/vacancies/ml/fit_summary.py
+"""
+Recruiter-style AI fit summaries (Groq), as a stage separate from scoring.
+
+Scoring only attaches a rule-based recommendation. The LLM summary is produced
+afterwards by `FitSummaryService`, which adds:
+
+    - a per-request timeout and a concurrency limit
+    - a requests-per-minute rate limit
+    - a circuit breaker that short-circuits to the rule-based fallback after
+      repeated failures
+    - an LRU cache keyed by a hash of the structured result plus the JD, so an
+      identical evaluation is only paid for once
+
+Configured through the `FIT_SUMMARY` Django setting when available.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from vacancies.ml.timing import collecting, timed
+
+
+MODEL = "llama-3.3-70b-versatile"
+
+DEFAULTS = {
+    "TIMEOUT": 20.0,            # seconds per LLM request
+    "MAX_CONCURRENCY": 2,       # parallel LLM requests per process
+    "RATE_PER_MINUTE": 30,      # LLM requests per minute per process (0 = unlimited)
+    "FAILURE_THRESHOLD": 5,     # consecutive failures before the breaker opens
+    "RESET_TIMEOUT": 60.0,      # seconds the breaker stays open
+    "CACHE_SIZE": 1024,         # cached summaries per process
+}
+
+# Result fields that feed the prompt; the cache key is derived from these
+PROMPT_RESULT_FIELDS = (
+    "final_score",
+    "skill_match_pct",
+    "experience_years",
+    "education_match",
+    "job_title_match",
+    "semantic_similarity",
+    "matched_skills",
+    "missing_skills",
+    "missing_keywords",
+)
+
+
+# ==================================================
+# GROQ CLIENT
+# ==================================================
+
+@lru_cache(maxsize=1)
+def get_groq_client():
+    """Groq client built on first use, or None when no API key is configured."""
+    from dotenv import load_dotenv
+
+    # Try loading common .env locations (project root and ml_standalone)
+    here = Path(__file__).resolve()
+    try:
+        project_root = here.parents[3]
+    except Exception:
+        project_root = here.parent
+
+    for candidate in (
+        project_root / ".env",
+        project_root / "ml_standalone" / ".env",
+        here.parent / ".env",
+    ):
+        if candidate.exists():
+            try:
+                load_dotenv(candidate)
+                print(f"[DEBUG] Loaded .env from: {candidate}")
+                break
+            except Exception as e:
+                print(f"[DEBUG] Failed to load .env from {candidate}: {e}")
+
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        print("[DEBUG] GROQ_API_KEY not set, AI summaries disabled")
+        return None
+
+    try:
+        from groq import Groq
+
+        return Groq(api_key=api_key)
+    except Exception as e:
+        print(f"[DEBUG] Failed to initialize Groq client: {e}")
+        return None
+
+
+# ==================================================
+# PROMPT / FALLBACK
+# ==================================================
+
+# Rule-based recommendation: the first whose minimum final_score is reached.
+# Summaries record where their recommendation came from as
+# `recommendation_source`, "score" (this rule) or "ai", so a re-rank can
+# recompute the rule-based ones (see ml_scoring.rerank_vacancy).
+SCORE_RECOMMENDATIONS = (
+    (60, "Strongly Recommend Interview"),
+    (50, "Consider"),
+    (25, "Low Priority"),
+)
+NOT_RECOMMENDED = "Not Recommended"
+
+# Start of every fallback summary's fit_summary
+FALLBACK_PREFIX = "AI summary "
+
+
+def _recommendation_from_score(score: float) -> str:
+    try:
+        s = float(score)
+    except Exception:
+        return "Unknown"
+    for minimum, recommendation in SCORE_RECOMMENDATIONS:
+        if s >= minimum:
+            return recommendation
+    return NOT_RECOMMENDED
+
+
+def fallback_summary(result: dict, message: str) -> dict:
+    return {
+        "fit_summary": message,
+        "recommendation": _recommendation_from_score(result.get("final_score", 0.0)),
+        "recommendation_source": "score",
+        "strengths": [],
+        "weaknesses": [],
+    }
+
+
+def build_prompt(result: dict, jd: dict) -> str:
+    return f"""
+You are a senior technical recruiter.
+
+Evaluate this candidate for the role of {jd.get('job_title')}.
+
+Job Requirements:
+- Required Skills: {', '.join(jd.get('required_skills', []))}
+- Minimum Experience: {jd.get('min_experience_years')}
+
+Candidate Evaluation Data:
+- Final Score: {result.get('final_score')}%
+- Skill Match: {result.get('skill_match_pct')}%
+- Experience Years: {result.get('experience_years')}
+- Education Match: {result.get('education_match')}
+- Job Title Match: {result.get('job_title_match')}
+- Semantic Similarity: {result.get('semantic_similarity')}%
+- Matched Skills: {', '.join(result.get('matched_skills', []))}
+- Missing Skills: {', '.join(result.get('missing_skills', []))}
+- Missing Keywords: {', '.join(result.get('missing_keywords', []))}
+
+Respond STRICTLY in JSON format:
+
+{{
+  "fit_summary": "...5-7 sentence professional recruiter explanation...",
+  "recommendation": "Strongly Recommend Interview | Consider | Low Priority | Not Recommended",
+  "strengths": ["point1", "point2", "point3"],
+  "weaknesses": ["point1", "point2"]
+}}
+"""
+
+
+def parse_summary_response(content: str, result: dict) -> dict:
+    # extract JSON substring
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0]
+    elif '{' in content and '}' in content:
+        start = content.find('{')
+        end = content.rfind('}') + 1
+        content = content[start:end]
+
+    parsed = json.loads(content)
+    # Ensure recommendation present
+    if "recommendation" not in parsed:
+        parsed["recommendation"] = _recommendation_from_score(result.get("final_score", 0.0))
+        parsed["recommendation_source"] = "score"
+    else:
+        parsed["recommendation_source"] = "ai"
+    return parsed
+
+
+def summary_cache_key(result: dict, jd: dict) -> str:
+    """Stable hash of everything that influences the prompt."""
+    def _normalize(value):
+        if isinstance(value, (set, frozenset, list, tuple)):
+            return sorted(str(v) for v in value)
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return value
+        return str(value)
+
+    payload = {
+        "model": MODEL,
+        "result": {k: _normalize(result.get(k)) for k in PROMPT_RESULT_FIELDS},
+        "jd": {
+            "job_title": _normalize(jd.get("job_title")),
+            "required_skills": _normalize(jd.get("required_skills", [])),
+            "min_experience_years": _normalize(jd.get("min_experience_years")),
+        },
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# ==================================================
+# RESILIENCE HELPERS
+# ==================================================
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. While open, calls
+    are rejected until `reset_timeout` has passed; then one trial call is let
+    through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open trial that never reached the service."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+class RateLimiter:
+    """Token bucket allowing `rate_per_minute` acquisitions per minute."""
+
+    def __init__(self, rate_per_minute: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate_per_minute = rate_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(rate_per_minute)
+        self._updated = clock()
+
+    def acquire(self, timeout: float) -> bool:
+        if not self.rate_per_minute:
+            return True
+
+        deadline = self._clock() + timeout
+        per_second = self.rate_per_minute / 60.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.rate_per_minute, self._tokens + (now - self._updated) * per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / per_second
+
+            if self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+# ==================================================
+# SERVICE
+# ==================================================
+
+class FitSummaryService:
+    def __init__(
+        self,
+        client=None,
+        timeout=DEFAULTS["TIMEOUT"],
+        max_concurrency=DEFAULTS["MAX_CONCURRENCY"],
+        rate_per_minute=DEFAULTS["RATE_PER_MINUTE"],
+        failure_threshold=DEFAULTS["FAILURE_THRESHOLD"],
+        reset_timeout=DEFAULTS["RESET_TIMEOUT"],
+        cache_size=DEFAULTS["CACHE_SIZE"],
+    ):
+        # `client` may be a Groq-compatible client or a zero-argument factory
+        self._client = client
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.rate_limiter = RateLimiter(rate_per_minute)
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if callable(self._client) and not hasattr(self._client, "chat"):
+            self._client = self._client()
+        return self._client
+
+    # ---------- cache ----------
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self._cache.move_to_end(key)
+            return summary
+
+    def _cache_put(self, key, summary):
+        with self._cache_lock:
+            self._cache[key] = summary
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---------- calls ----------
+
+    def _request(self, result: dict, jd: dict) -> dict:
+        response = self.client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": "You are an expert HR recruiter."},
+                {"role": "user", "content": build_prompt(result, jd)},
+            ],
+            temperature=0.3,
+            max_tokens=800,
+            timeout=self.timeout,
+        )
+        return parse_summary_response(response.choices[0].message.content, result)
+
+    def summarize(self, result: dict, jd: dict) -> dict:
+        """
+        Summary for one scorer result. Never raises: failures, an open circuit
+        or a missing API key yield the rule-based fallback (which is not cached).
+        """
+        with timed("fit_summary"):
+            return self._summarize(result, jd)
+
+    def _summarize(self, result: dict, jd: dict) -> dict:
+        if self.client is None:
+            return fallback_summary(result, "AI summary unavailable (GROQ_API_KEY not configured).")
+
+        key = summary_cache_key(result, jd)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached)
+
+        if not self.breaker.allow():
+            return fallback_summary(result, "AI summary temporarily unavailable (too many recent failures).")
+
+        if not self.rate_limiter.acquire(timeout=self.timeout):
+            # Not a failure of the upstream service; don't trip the breaker
+            self.breaker.release()
+            return fallback_summary(result, "AI summary skipped (rate limit reached).")
+
+        with self._slots:
+            try:
+                summary = self._request(result, jd)
+            except Exception as e:
+                self.breaker.record_failure()
+                return fallback_summary(result, f"AI summary failed: {str(e)}")
+
+        self.breaker.record_success()
+        self._cache_put(key, summary)
+        return dict(summary)
+
+    def submit(self, result: dict, jd: dict):
+        """
+        Run `summarize` in the background; returns a Future of the summary,
+        with the time it took under `timings`.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="fit-summary",
+                )
+        return self._executor.submit(self._summarize_timed, result, jd)
+
+    def _summarize_timed(self, result: dict, jd: dict) -> dict:
+        with collecting() as timings:
+            summary = self.summarize(result, jd)
+        return dict(summary, timings=timings)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def _configured_options() -> dict:
+    options = dict(DEFAULTS)
+    try:
+        from django.conf import settings
+
+        if settings.configured:
+            options.update(getattr(settings, "FIT_SUMMARY", {}) or {})
+    except ImportError:
+        pass
+    return options
+
+
+def get_fit_summary_service() -> FitSummaryService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                options = _configured_options()
+                _service = FitSummaryService(
+                    client=get_groq_client,
+                    timeout=options["TIMEOUT"],
+                    max_concurrency=options["MAX_CONCURRENCY"],
+                    rate_per_minute=options["RATE_PER_MINUTE"],
+                    failure_threshold=options["FAILURE_THRESHOLD"],
+                    reset_timeout=options["RESET_TIMEOUT"],
+                    cache_size=options["CACHE_SIZE"],
+                )
+    return _service
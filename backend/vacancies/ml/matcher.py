@@ -0,0 +1,127 @@
+# backend/vacancies/ml/matcher.py
+"""
+Multi-pattern entity matcher.
+
+The scorer's matching rule is: an entity (skill, degree, job title) is present
+when every word of `clean_text(entity)` occurs as a substring of the
+resume's `normalize_token` form. Checking that rule entity by entity costs
+O(|dictionary| x |resume|) per resume.
+
+`EntityMatcher` compiles the distinct entity words of a dictionary into an
+Aho-Corasick automaton once. A single pass over the normalized resume yields
+every word that occurs in it; entities are then resolved by counting how many
+of their words were seen. Results are identical to the per-entity loop.
+"""
+
+from collections import deque
+
+from vacancies.ml.text import clean_text, normalize_token
+
+
+class EntityMatcher:
+    def __init__(self, entities):
+        word_ids = {}
+        self._entities = []           # entity id -> entity string
+        self._required = []           # entity id -> number of distinct words
+        self._always = set()          # entities with no words (vacuously present)
+        self._word_entities = []      # word id -> entity ids containing the word
+
+        for ent in entities:
+            words = set(clean_text(ent).split())
+            if not words:
+                self._always.add(ent)
+                continue
+
+            ent_id = len(self._entities)
+            self._entities.append(ent)
+            self._required.append(len(words))
+            for word in words:
+                word_id = word_ids.get(word)
+                if word_id is None:
+                    word_id = word_ids[word] = len(self._word_entities)
+                    self._word_entities.append([])
+                self._word_entities[word_id].append(ent_id)
+
+        self._build_automaton(word_ids)
+
+    def __len__(self):
+        return len(self._entities) + len(self._always)
+
+    def _build_automaton(self, word_ids: dict) -> None:
+        goto = [{}]
+        own_output = [[]]
+
+        for word, word_id in word_ids.items():
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    own_output.append([])
+                node = nxt
+            own_output[node].append(word_id)
+
+        # Breadth-first failure links; each node's output is the union of its
+        # own words and the outputs along its failure chain.
+        fail = [0] * len(goto)
+        output = [()] * len(goto)
+        output[0] = tuple(own_output[0])
+        queue = deque()
+        for child in goto[0].values():
+            output[child] = tuple(own_output[child])
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                output[child] = tuple(own_output[child]) + output[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def words_in(self, norm_text: str) -> set:
+        """Return the ids of dictionary words occurring in `norm_text`."""
+        goto = self._goto
+        fail = self._fail
+        visited = set()
+        node = 0
+
+        for ch in norm_text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            visited.add(node)
+
+        words = set()
+        output = self._output
+        for node in visited:
+            words.update(output[node])
+        return words
+
+    def find_normalized(self, norm_text: str) -> set:
+        """Like `find`, for text already passed through `normalize_token`."""
+        found = set(self._always)
+        if not self._entities:
+            return found
+
+        required = self._required
+        entities = self._entities
+        seen = {}
+        for word_id in self.words_in(norm_text):
+            for ent_id in self._word_entities[word_id]:
+                count = seen.get(ent_id, 0) + 1
+                seen[ent_id] = count
+                if count == required[ent_id]:
+                    found.add(entities[ent_id])
+        return found
+
+    def find(self, text: str) -> set:
+        return self.find_normalized(normalize_token(text))
@@ -0,0 +1,239 @@
+# backend/vacancies/ml/resume_cache.py
+"""
+Content-addressed cache of JD-independent resume features.
+
+A candidate's PDF is parsed once per distinct file content instead of once per
+application. Entries are keyed by the SHA-256 of the PDF bytes plus a
+fingerprint of everything the features depend on (scorer version, datasets).
+
+Two tiers, both LRU:
+    - in-process: bounded by entry count
+    - on disk (optional): bounded by total bytes, recency tracked via mtime
+
+Configured through the `RESUME_FEATURE_CACHE` Django setting when available:
+
+    RESUME_FEATURE_CACHE = {
+        'DIR': BASE_DIR / 'var' / 'resume_features',   # None = memory only
+        'MAX_ENTRIES': 256,
+        'MAX_BYTES': 256 * 1024 * 1024,
+    }
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResumeFeatures:
+    """Everything the scorer extracts from a resume before looking at a JD."""
+
+    def __init__(
+        self,
+        sha256,
+        raw_text,
+        cleaned_text,
+        experience_years,
+        skills,
+        degrees,
+        job_titles,
+        tfidf_vector,
+    ):
+        self.sha256 = sha256
+        self.raw_text = raw_text
+        self.cleaned_text = cleaned_text
+        self.experience_years = experience_years
+        # Entities found against the master dictionaries
+        self.skills = frozenset(skills)
+        self.degrees = frozenset(degrees)
+        self.job_titles = frozenset(job_titles)
+        # 1 x n_features sparse TF-IDF row (None if vectorizing failed)
+        self.tfidf_vector = tfidf_vector
+
+    @property
+    def norm_text(self) -> str:
+        # normalize_token(cleaned_text): cleaned text is already [a-z0-9 ]
+        return self.cleaned_text.replace(" ", "")
+
+
+class ResumeFeatureCache:
+    def __init__(self, directory=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # lazily measured
+
+    # ---------- memory tier ----------
+
+    def _memory_get(self, key):
+        with self._lock:
+            features = self._memory.get(key)
+            if features is not None:
+                self._memory.move_to_end(key)
+            return features
+
+    def _memory_put(self, key, features):
+        with self._lock:
+            self._memory[key] = features
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ---------- disk tier ----------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def _disk_get(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                features = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, corrupt or written by incompatible code: a miss, and
+            # out of the way so the next put can replace it
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            # Record the hit so eviction keeps recently used entries
+            os.utime(path)
+        except OSError:
+            pass
+        return features
+
+    def _disk_put(self, key, features):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(features, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            over_budget = self._disk_bytes is None or self._disk_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _disk_entries(self):
+        entries = []
+        for path in self.directory.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Delete least recently used disk entries until the cache is under
+        90% of `max_bytes`. Returns the number of files removed.
+        """
+        if self.directory is None or not self.directory.exists():
+            return 0
+
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._disk_bytes = total
+        return removed
+
+    # ---------- public API ----------
+
+    def get(self, key: str):
+        features = self._memory_get(key)
+        if features is None:
+            features = self._disk_get(key)
+            if features is not None:
+                self._memory_put(key, features)
+        return features
+
+    def put(self, key: str, features: ResumeFeatures) -> None:
+        self._memory_put(key, features)
+        self._disk_put(key, features)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = None
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob("*/*.pkl"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _configured_options() -> dict:
+    try:
+        from django.conf import settings
+
+        if not settings.configured:
+            return {}
+        options = getattr(settings, "RESUME_FEATURE_CACHE", {}) or {}
+    except ImportError:
+        return {}
+
+    return {
+        "directory": options.get("DIR"),
+        "max_entries": options.get("MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+        "max_bytes": options.get("MAX_BYTES", DEFAULT_MAX_BYTES),
+    }
+
+
+def get_resume_cache() -> ResumeFeatureCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResumeFeatureCache(**_configured_options())
+    return _cache
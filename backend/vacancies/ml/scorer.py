@@ -1,59 +1,30 @@
 # backend/vacancies/ml/scorer.py
 
+import hashlib
+import json
 import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from functools import lru_cache
 import os
-import json
-
-from dotenv import load_dotenv
-import pandas as pd
-import pdfplumber
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Try loading common .env locations (project root and ml_standalone)
-_HERE = Path(__file__).resolve()
-try:
-    project_root = _HERE.parents[3]
-except Exception:
-    project_root = _HERE.parent
-
-_env_loaded = False
-for candidate in (
-    project_root / ".env",
-    project_root / "ml_standalone" / ".env",
-    _HERE.parent / ".env",
-):
-    if candidate.exists():
-        try:
-            load_dotenv(candidate)
-            _env_loaded = True
-            print(f"[DEBUG] Loaded .env from: {candidate}")
-            break
-        except Exception as e:
-            print(f"[DEBUG] Failed to load .env from {candidate}: {e}")
-            pass
-
-if not _env_loaded:
-    print(f"[DEBUG] No .env file found. Searched: {project_root / '.env'}, {project_root / 'ml_standalone' / '.env'}, {_HERE.parent / '.env'}")
-
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
-print(f"[DEBUG] GROQ_API_KEY loaded: {'Yes' if GROQ_API_KEY else 'No'}")
 
-client = None
-if GROQ_API_KEY:
-    try:
-        from groq import Groq
-
-        client = Groq(api_key=GROQ_API_KEY)
-        print("[DEBUG] Groq client initialized successfully")
-    except Exception as e:
-        print(f"[DEBUG] Failed to initialize Groq client: {e}")
-        client = None
-else:
-    print("[DEBUG] GROQ_API_KEY not set, client will be None")
+# pandas, pdfplumber, scipy and scikit-learn are imported inside the functions
+# that use them: importing this module (which every Django process does via
+# vacancies.views) must stay cheap. scripts/bench_import_time.py guards this.
+from vacancies.ml.fit_summary import fallback_summary, get_fit_summary_service
+from vacancies.ml.matcher import EntityMatcher
+from vacancies.ml.resume_cache import ResumeFeatures, get_resume_cache
+from vacancies.ml.text import clean_text, normalize_token
+from vacancies.ml.tfidf_artifact import (
+    file_checksum,
+    load_artifact,
+    new_vectorizer,
+    save_artifact,
+)
+from vacancies.ml.timing import collecting, record, timed
 
 
 # ==================================================
@@ -62,76 +33,146 @@ else:
 
 BASE_DIR = Path(__file__).resolve().parent.parent   # vacancies/
 DATASETS_DIR = BASE_DIR / "Datasets"
+RESUME_DATASET_CSV = DATASETS_DIR / "UpdatedResumeDataSet.csv"
+SKILLS_XLSX = DATASETS_DIR / "Technology Skills.xlsx"
+PROGRAMS_XLSX = DATASETS_DIR / "ProgramsDataset.xlsx"
+
+# Bump when feature extraction changes so cached resume features are rebuilt
+RESUME_FEATURES_VERSION = 1
+
+# Pre-normalized master dictionaries, rebuilt when the spreadsheets change
+MASTER_DICTIONARIES_CACHE = BASE_DIR / "ml" / "artifacts" / "master_dictionaries.json"
+MASTER_DICTIONARIES_VERSION = 1
+
+# Weight of each component (all in percent) in final_score. A JD may override
+# any of them through its "score_weights"; the merged weights must sum to 1.
+DEFAULT_SCORE_WEIGHTS = {
+    "skills": 0.35,
+    "semantic": 0.15,
+    "education": 0.17,
+    "experience": 0.16,
+    "keywords": 0.12,
+    "title": 0.05,
+}
 
 
 # ==================================================
 # DATASET LOADERS (CACHED)
 # ==================================================
 
-@lru_cache(maxsize=1)
-def load_master_data():
-    resume_csv = DATASETS_DIR / "UpdatedResumeDataSet.csv"
+def load_resume_dataset():
+    """
+    The resume corpus as a DataFrame. Not cached: it is only needed to fit
+    the TF-IDF vectorizer (and by the benchmarks), so it is dropped again
+    instead of staying resident in every worker.
+    """
+    import pandas as pd
+
+    resume_csv = RESUME_DATASET_CSV
     try:
         df = pd.read_csv(resume_csv.as_posix(), encoding="utf-8")
     except UnicodeDecodeError:
         df = pd.read_csv(resume_csv.as_posix(), encoding="latin1")
 
     df["Resume"] = df["Resume"].astype(str)
+    return df
 
-    skills_master = set()
-    titles_master = set()
-    degrees_master = set()
 
+def _read_master_dictionaries() -> dict:
+    import pandas as pd
+
+    def column(df, name):
+        return sorted(set(df[name].dropna().astype(str).str.lower().str.strip()))
+
+    masters = {"skills": [], "titles": [], "degrees": []}
     try:
-        skills_df = pd.read_excel((DATASETS_DIR / "Technology Skills.xlsx").as_posix())
-        skills_master = set(
-            skills_df["Skills"].dropna().astype(str).str.lower().str.strip()
-        )
-
-        titles_master = set(
-            skills_df["Title"].dropna().astype(str).str.lower().str.strip()
-        )
+        skills_df = pd.read_excel(SKILLS_XLSX.as_posix())
+        masters["skills"] = column(skills_df, "Skills")
+        masters["titles"] = column(skills_df, "Title")
     except Exception:
         # missing optional skills file; continue with empty masters
         pass
 
     try:
-        degrees_df = pd.read_excel((DATASETS_DIR / "ProgramsDataset.xlsx").as_posix())
-        degrees_master = set(
-            degrees_df["Programme"].dropna().astype(str).str.lower().str.strip()
-        )
+        degrees_df = pd.read_excel(PROGRAMS_XLSX.as_posix())
+        masters["degrees"] = column(degrees_df, "Programme")
     except Exception:
         pass
 
-    return df, skills_master, titles_master, degrees_master
+    return masters
+
+
+def _master_dictionaries_key() -> str:
+    parts = [str(MASTER_DICTIONARIES_VERSION)]
+    for path in (SKILLS_XLSX, PROGRAMS_XLSX):
+        parts.append(file_checksum(path) if path.exists() else "-")
+    return ":".join(parts)
 
 
 @lru_cache(maxsize=1)
-def load_tfidf():
-    df, _, _, _ = load_master_data()
+def load_master_dictionaries() -> tuple:
+    """
+    (skills, titles, degrees): the master dictionaries as frozensets of
+    lowercased, stripped terms.
 
-    tfidf = TfidfVectorizer(
-        stop_words="english",
-        max_features=6000,
-        ngram_range=(1, 2),
-    )
-    tfidf.fit(df["Resume"])
-    return tfidf
+    Reading the spreadsheets needs pandas, so the result is cached as a small
+    JSON file next to the TF-IDF artifact; worker processes then load the
+    dictionaries without importing pandas at all.
+    """
+    key = _master_dictionaries_key()
+    masters = None
+    try:
+        with open(MASTER_DICTIONARIES_CACHE, encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if cached.get("key") == key:
+            masters = cached
+    except (OSError, ValueError):
+        pass
+
+    if masters is None:
+        masters = _read_master_dictionaries()
+        try:
+            MASTER_DICTIONARIES_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=MASTER_DICTIONARIES_CACHE.parent, prefix=".masters-")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"key": key, **masters}, fh, ensure_ascii=False)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, MASTER_DICTIONARIES_CACHE)
+        except OSError as e:
+            print(f"[DEBUG] Could not cache master dictionaries: {e}")
 
+    return frozenset(masters["skills"]), frozenset(masters["titles"]), frozenset(masters["degrees"])
 
-# ==================================================
-# TEXT HELPERS
-# ==================================================
 
-def clean_text(text: str) -> str:
-    text = text.encode("utf-8", "ignore").decode("utf-8", "ignore")
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+@lru_cache(maxsize=1)
+def dataset_checksum() -> str:
+    return file_checksum(RESUME_DATASET_CSV)
 
 
-def normalize_token(s: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", s.lower())
+def fit_tfidf():
+    tfidf = new_vectorizer()
+    tfidf.fit(load_resume_dataset()["Resume"])
+    return tfidf
+
+
+@lru_cache(maxsize=1)
+def load_tfidf():
+    """
+    Load the persisted TF-IDF artifact (see tfidf_artifact.py). Falls back to
+    fitting on the resume dataset when the artifact is missing or was built
+    from a different dataset, and persists the result for the next process.
+    """
+    checksum = dataset_checksum()
+    tfidf = load_artifact(checksum)
+    if tfidf is not None:
+        return tfidf
+
+    tfidf = fit_tfidf()
+    try:
+        save_artifact(tfidf, checksum)
+    except OSError as e:
+        print(f"[DEBUG] Could not persist TF-IDF artifact: {e}")
+    return tfidf
 
 
 # ==================================================
@@ -139,6 +180,8 @@ def normalize_token(s: str) -> str:
 # ==================================================
 
 def extract_text_from_pdf(path: str) -> str:
+    import pdfplumber
+
     text = ""
     with pdfplumber.open(path) as pdf:
         for page in pdf.pages:
@@ -152,46 +195,64 @@ def extract_text_from_pdf(path: str) -> str:
 # EXPERIENCE EXTRACTION (MATCHES modelv3)
 # ==================================================
 
-def extract_experience_years(text: str) -> float:
-    text = text.lower()
-    current_year = datetime.now().year
+_DATE_END = r"(?P<end>20\d{2}|present|current)"
 
-    match = re.search(
-        r"experience\s*\n(.*?)(?:\n\s*education|\n\s*skills|\n\s*projects|\Z)",
-        text,
-        re.IGNORECASE | re.DOTALL,
-    )
+# "experience" and a whitespace run holding a newline; the section starts
+# after the run's last newline
+_EXPERIENCE_HEADER = re.compile(r"experience(\s+)", re.I)
+# A heading line ending the section. Only the last newline of a whitespace
+# run is tried, so a long run of blank lines is scanned once
+_SECTION_END = re.compile(r"\n[^\S\n]*(?:education|skills|projects)", re.I)
 
-    if not match:
-        return 0.0
+_YEAR_RANGE = re.compile(r"(?P<start>20\d{2})\s*(?:-|to|–|—)\s*" + _DATE_END)
+# The tail is optional so that a month name that doesn't start a range still
+# consumes its letter run: the other month names in the run would fail the
+# same way, and retrying each of them is quadratic on long runs
+_MONTH_RANGE = re.compile(
+    r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*"
+    r"(?:\s+(?P<start>20\d{2}).{0,15}" + _DATE_END + ")?"
+)
 
-    section = match.group(1)
-    ranges = []
 
-    # Year-Year and Year-Present
-    year_ranges = re.findall(
-        r"(20\d{2})\s*(?:-|to|–|—)\s*(20\d{2}|present|current)",
-        section,
-    )
+def _experience_ranges(text: str) -> list:
+    """
+    (start, end) year pairs in the experience section of lowercased `text`:
+    from the first "experience" line up to the first line starting with
+    education / skills / projects. None when there is no such section.
+    """
+    section_start = None
+    for header in _EXPERIENCE_HEADER.finditer(text):
+        whitespace = header.group(1)
+        if "\n" in whitespace:
+            section_start = header.start(1) + whitespace.rindex("\n") + 1
+            break
+    if section_start is None:
+        return None
 
-    for start, end in year_ranges:
-        start = int(start)
-        end = current_year if end in {"present", "current"} else int(end)
-        if end > start:
-            ranges.append((start, end))
+    section_end = len(text)
+    heading = _SECTION_END.search(text, section_start)
+    if heading:
+        # The section ends at the first newline of the heading's whitespace run
+        before = text[section_start:heading.start()]
+        section_end = text.index("\n", section_start + len(before.rstrip()))
 
-    # Month-Year patterns
-    month_ranges = re.findall(
-        r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(20\d{2}).{0,15}(20\d{2}|present|current)",
-        section,
-    )
+    current_year = datetime.now().year
+    ranges = []
+    for pattern in (_YEAR_RANGE, _MONTH_RANGE):
+        for match in pattern.finditer(text, section_start, section_end):
+            if match.group("start") is None:
+                continue
+            start = int(match.group("start"))
+            end = match.group("end")
+            end = current_year if end in {"present", "current"} else int(end)
+            if end > start:
+                ranges.append((start, end))
+
+    return ranges
 
-    for _, start, end in month_ranges:
-        start = int(start)
-        end = current_year if end in {"present", "current"} else int(end)
-        if end > start:
-            ranges.append((start, end))
 
+def extract_experience_years(text: str) -> float:
+    ranges = _experience_ranges(text.lower())
     if not ranges:
         return 0.0
 
@@ -229,46 +290,94 @@ def experience_score(years: float, jd: dict) -> float:
 # ENTITY EXTRACTION
 # ==================================================
 
-def extract_entities(text: str, entities: set) -> set:
-    found = set()
-    norm_text = normalize_token(text)
+@lru_cache(maxsize=1)
+def load_master_matchers() -> dict:
+    """Entity matchers compiled once per process from the master dictionaries."""
+    skills_master, titles_master, degrees_master = load_master_dictionaries()
+    return {
+        "skills": EntityMatcher(skills_master),
+        "degrees": EntityMatcher(degrees_master),
+        "job_titles": EntityMatcher(titles_master),
+    }
 
-    for ent in entities:
-        words = clean_text(ent).split()
-        if all(normalize_token(w) in norm_text for w in words):
-            found.add(ent)
 
-    return found
+def extract_entities(text: str, entities: set) -> set:
+    return EntityMatcher(entities).find(text)
 
 
 def extract_job_titles(text: str, titles_master: set, jd_aliases: set) -> set:
-    found = set()
-    norm_text = normalize_token(text)
-
-    for title in titles_master | jd_aliases:
-        words = clean_text(title).split()
-        if all(normalize_token(w) in norm_text for w in words):
-            found.add(title)
+    return EntityMatcher(titles_master | jd_aliases).find(text)
 
-    return found
 
+def parse_resume(text: str, jd) -> dict:
+    jd = compile_jd(jd)
+    masters = load_master_matchers()
+    norm_text = normalize_token(text)
 
-def parse_resume(text: str, jd: dict) -> dict:
-    _, skills_master, titles_master, degrees_master = load_master_data()
+    # An entity's presence doesn't depend on the rest of the dictionary,
+    # so master and JD matches are computed separately and unioned.
     return {
-        "skills": extract_entities(text, set(map(str.lower, skills_master)) | set(map(str.lower, jd.get("required_skills", set())))),
-        "degrees": extract_entities(text, set(map(str.lower, degrees_master)) | set(map(str.lower, jd.get("education_required", set())))),
-        "job_titles": extract_job_titles(text, set(map(str.lower, titles_master)), set(map(str.lower, jd.get("job_title_aliases", set())))),
+        "skills": masters["skills"].find_normalized(norm_text) | jd.skills_matcher.find_normalized(norm_text),
+        "degrees": masters["degrees"].find_normalized(norm_text) | jd.degrees_matcher.find_normalized(norm_text),
+        "job_titles": masters["job_titles"].find_normalized(norm_text) | jd.titles_matcher.find_normalized(norm_text),
         "experience_years": 0.0,
-        "keywords": extract_entities(text, set(map(str.lower, jd.get("keywords", set())))),
+        "keywords": jd.keywords_matcher.find_normalized(norm_text),
     }
 
 
+# ==================================================
+# COMPILED JOB DESCRIPTION
+# ==================================================
+
+class CompiledJD:
+    """
+    Everything the scorer derives from a job description, computed once.
+
+    Scoring many resumes against the same vacancy re-uses the lowercased
+    requirement sets, the JD-specific entity matchers and the JD TF-IDF
+    vector instead of rebuilding them per resume.
+    """
+
+    def __init__(self, jd: dict):
+        self.jd = jd
+        self.description = jd.get("description", "")
+
+        self.required_skills = frozenset(map(str.lower, jd.get("required_skills", set())))
+        self.education_required = frozenset(map(str.lower, jd.get("education_required", set())))
+        self.keywords = frozenset(map(str.lower, jd.get("keywords", set())))
+        self.job_title_aliases = frozenset(map(str.lower, jd.get("job_title_aliases", set())))
+
+        self.skills_matcher = EntityMatcher(self.required_skills)
+        self.degrees_matcher = EntityMatcher(self.education_required)
+        self.keywords_matcher = EntityMatcher(self.keywords)
+        self.titles_matcher = EntityMatcher(self.job_title_aliases)
+
+        self.weights = {**DEFAULT_SCORE_WEIGHTS, **(jd.get("score_weights") or {})}
+
+        self._jd_vector = None
+
+    @property
+    def jd_vector(self):
+        """TF-IDF vector of the description (computed on first use)."""
+        if self._jd_vector is None:
+            self._jd_vector = load_tfidf().transform([self.description])
+        return self._jd_vector
+
+
+def compile_jd(jd) -> CompiledJD:
+    """Accept either a JD dict or an already compiled JD."""
+    if isinstance(jd, CompiledJD):
+        return jd
+    return CompiledJD(jd)
+
+
 # ==================================================
 # SEMANTIC SCORING
 # ==================================================
 
 def semantic_score(resume_text: str, jd_text: str) -> float:
+    from sklearn.metrics.pairwise import cosine_similarity
+
     tfidf = load_tfidf()
     vec = tfidf.transform([resume_text, jd_text])
     return round(cosine_similarity(vec[0], vec[1])[0][0] * 100, 2)
@@ -277,184 +386,457 @@ def semantic_score(resume_text: str, jd_text: str) -> float:
 def generate_ai_fit_summary(result: dict, jd: dict) -> dict:
     """
     Use Groq (if available) to generate recruiter-style summary.
-    Falls back to simple rule-based output when API not configured.
+    Falls back to simple rule-based output when the API is not configured,
+    failing, or rate limited (see vacancies/ml/fit_summary.py).
     """
-    def _recommendation_from_score(score: float) -> str:
-        try:
-            s = float(score)
-        except Exception:
-            return "Unknown"
-        if s >= 60:
-            return "Strongly Recommend Interview"
-        if s >= 50:
-            return "Consider"
-        if s >= 25:
-            return "Low Priority"
-        return "Not Recommended"
-
-    if client is None:
-        return {
-            "fit_summary": "AI summary unavailable (GROQ_API_KEY not configured).",
-            "recommendation": _recommendation_from_score(result.get("final_score", 0.0)),
-            "strengths": [],
-            "weaknesses": [],
-        }
-
-    prompt = f"""
-You are a senior technical recruiter.
-
-Evaluate this candidate for the role of {jd.get('job_title')}.
-
-Job Requirements:
-- Required Skills: {', '.join(jd.get('required_skills', []))}
-- Minimum Experience: {jd.get('min_experience_years')}
-
-Candidate Evaluation Data:
-- Final Score: {result.get('final_score')}%
-- Skill Match: {result.get('skill_match_pct')}%
-- Experience Years: {result.get('experience_years')}
-- Education Match: {result.get('education_match')}
-- Job Title Match: {result.get('job_title_match')}
-- Semantic Similarity: {result.get('semantic_similarity')}%
-- Matched Skills: {', '.join(result.get('matched_skills', []))}
-- Missing Skills: {', '.join(result.get('missing_skills', []))}
-- Missing Keywords: {', '.join(result.get('missing_keywords', []))}
-
-Respond STRICTLY in JSON format:
-
-{{
-  "fit_summary": "...5-7 sentence professional recruiter explanation...",
-  "recommendation": "Strongly Recommend Interview | Consider | Low Priority | Not Recommended",
-  "strengths": ["point1", "point2", "point3"],
-  "weaknesses": ["point1", "point2"]
-}}
-"""
+    return get_fit_summary_service().summarize(result, jd)
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are an expert HR recruiter."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=800,
-        )
-
-        content = response.choices[0].message.content
-
-        # extract JSON substring
-        if '```json' in content:
-            content = content.split('```json')[1].split('```')[0]
-        elif '{' in content and '}' in content:
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            content = content[start:end]
-
-        parsed = json.loads(content)
-        # Ensure recommendation present
-        if "recommendation" not in parsed:
-            parsed["recommendation"] = _recommendation_from_score(result.get("final_score", 0.0))
-        return parsed
-    except Exception as e:
-        return {
-            "fit_summary": f"AI summary failed: {str(e)}",
-            "recommendation": _recommendation_from_score(result.get("final_score", 0.0)),
-            "strengths": [],
-            "weaknesses": [],
-        }
+
+def pending_fit_summary(result: dict) -> dict:
+    """Rule-based placeholder attached until the AI summary stage has run."""
+    return fallback_summary(result, "AI summary pending.")
 
 
 # ==================================================
 # MATCHING & FINAL SCORE
 # ==================================================
 
-def match_resume_to_jd(resume: dict, jd: dict, semantic_sim: float) -> dict:
-    # Lowercase-normalized sets for safe matching
-    jd_required = set(map(str.lower, jd.get("required_skills", set())))
-    jd_education = set(map(str.lower, jd.get("education_required", set())))
-    jd_keywords = set(map(str.lower, jd.get("keywords", set())))
-    jd_aliases = set(map(str.lower, jd.get("job_title_aliases", set())))
+# Components of final_score, in weight order
+SCORE_COMPONENTS = tuple(DEFAULT_SCORE_WEIGHTS)
+
+# Result key holding each component's score (booleans count as 100 / 0)
+COMPONENT_SCORE_KEYS = {
+    "skills": "skill_match_pct",
+    "semantic": "semantic_similarity",
+    "education": "education_match",
+    "experience": "experience_score",
+    "keywords": "keyword_match_pct",
+    "title": "job_title_match",
+}
+
 
-    skill_match = set(map(str.lower, resume.get("skills", set()))) & jd_required
-    req_skills_count = len(jd_required)
+def _skills_component(resume: dict, jd: CompiledJD) -> tuple:
+    skill_match = set(map(str.lower, resume.get("skills", set()))) & jd.required_skills
+    req_skills_count = len(jd.required_skills)
     skill_score = (len(skill_match) / req_skills_count) * 100 if req_skills_count > 0 else 0.0
+    return skill_score, {
+        "skill_match_pct": round(skill_score, 2),
+        "matched_skills": sorted(skill_match),
+        "missing_skills": sorted(jd.required_skills - skill_match),
+    }
+
+
+def _education_component(resume: dict, jd: CompiledJD) -> tuple:
+    education_match = bool(set(map(str.lower, resume.get("degrees", set()))) & jd.education_required)
+    return (100 if education_match else 0), {"education_match": education_match}
 
-    education_match = bool(set(map(str.lower, resume.get("degrees", set()))) & jd_education)
-    education_score = 100 if education_match else 0
 
+def _title_component(resume: dict, jd: CompiledJD) -> tuple:
     # title matching with flexible rules
     extracted_titles = set(map(str.lower, resume.get("job_titles", set())))
     title_match = False
     matched_titles = set()
     for ext in extracted_titles:
         ext_words = set(ext.split())
-        for alias in jd_aliases:
+        for alias in jd.job_title_aliases:
             alias_words = set(alias.split())
             if ext_words & alias_words and len(ext_words & alias_words) >= max(1, len(alias_words) - 1):
                 title_match = True
                 matched_titles.add(ext)
                 break
 
-    title_score = 100 if title_match else 0
-
-    exp_score = experience_score(resume.get("experience_years", 0.0), jd)
-
-    keyword_match = set(map(str.lower, resume.get("keywords", set()))) & jd_keywords
-    kw_count = len(jd_keywords)
-    keyword_score = (len(keyword_match) / kw_count * 100) if kw_count > 0 else 0.0
-
-    final_score = (
-        0.35 * skill_score
-        + 0.15 * semantic_sim
-        + 0.17 * education_score
-        + 0.16 * exp_score
-        + 0.12 * keyword_score
-        + 0.05 * title_score
-    )
-
-    return {
-        "skill_match_pct": round(skill_score, 2),
-        "matched_skills": sorted(skill_match),
-        "missing_skills": sorted(jd_required - skill_match),
-        "education_match": education_match,
+    return (100 if title_match else 0), {
         "job_title_match": title_match,
         "extracted_job_titles": sorted(extracted_titles),
         "matched_job_titles": sorted(matched_titles),
+    }
+
+
+def _experience_component(resume: dict, jd: CompiledJD) -> tuple:
+    exp_score = experience_score(resume.get("experience_years", 0.0), jd.jd)
+    return exp_score, {
         "experience_years": resume.get("experience_years", 0.0),
         "experience_score": round(exp_score, 2),
+    }
+
+
+def _keywords_component(resume: dict, jd: CompiledJD) -> tuple:
+    keyword_match = set(map(str.lower, resume.get("keywords", set()))) & jd.keywords
+    kw_count = len(jd.keywords)
+    keyword_score = (len(keyword_match) / kw_count * 100) if kw_count > 0 else 0.0
+    return keyword_score, {
         "keyword_match_pct": round(keyword_score, 2),
         "matched_keywords": sorted(keyword_match),
-        "missing_keywords": sorted(jd_keywords - keyword_match),
-        "semantic_similarity": semantic_sim,
-        "final_score": round(final_score, 2),
+        "missing_keywords": sorted(jd.keywords - keyword_match),
     }
 
 
+# Everything but "semantic", in result key order
+COMPONENT_SCORERS = {
+    "skills": _skills_component,
+    "education": _education_component,
+    "title": _title_component,
+    "experience": _experience_component,
+    "keywords": _keywords_component,
+}
+
+
+def _weighted_score(scores: dict, weights: dict) -> float:
+    return (
+        weights["skills"] * scores["skills"]
+        + weights["semantic"] * scores["semantic"]
+        + weights["education"] * scores["education"]
+        + weights["experience"] * scores["experience"]
+        + weights["keywords"] * scores["keywords"]
+        + weights["title"] * scores["title"]
+    )
+
+
+def match_resume_to_jd(resume: dict, jd, semantic_sim: float) -> dict:
+    compiled = compile_jd(jd)
+
+    scores = {"semantic": semantic_sim}
+    result = {}
+    for name, component in COMPONENT_SCORERS.items():
+        scores[name], keys = component(resume, compiled)
+        result.update(keys)
+
+    result["semantic_similarity"] = semantic_sim
+    result["final_score"] = round(_weighted_score(scores, compiled.weights), 2)
+    return result
+
+
+def stored_component_score(result: dict, name: str) -> float:
+    """Score (in percent) of component `name` in a stored scorer result."""
+    value = result.get(COMPONENT_SCORE_KEYS[name]) or 0
+    if isinstance(value, bool):
+        return 100 if value else 0
+    return float(value)
+
+
 # ==================================================
 # PUBLIC API
 # ==================================================
 
-def score_resume(resume_pdf_path: str, jd: dict) -> dict:
-    resume_raw_text = extract_text_from_pdf(resume_pdf_path)
-    resume_text = clean_text(resume_raw_text)
-    parsed_resume = parse_resume(resume_text, jd)
-    parsed_resume["experience_years"] = extract_experience_years(resume_raw_text)
+@lru_cache(maxsize=1)
+def _datasets_fingerprint() -> str:
+    parts = [str(RESUME_FEATURES_VERSION), dataset_checksum()]
+    for path in (SKILLS_XLSX, PROGRAMS_XLSX):
+        parts.append(file_checksum(path) if path.exists() else "-")
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()[:16]
+
+
+def resume_features_key(content_sha256: str) -> str:
+    # Experience ending in "present" depends on the current year
+    return f"{content_sha256}-{_datasets_fingerprint()}-{datetime.now().year}"
+
+
+def _features_from_text(content_sha256: str, resume_raw_text: str, tfidf_vector) -> ResumeFeatures:
+    masters = load_master_matchers()
+
+    with timed("parse_resume"):
+        resume_text = clean_text(resume_raw_text)
+        norm_text = normalize_token(resume_text)
+        skills = masters["skills"].find_normalized(norm_text)
+        degrees = masters["degrees"].find_normalized(norm_text)
+        job_titles = masters["job_titles"].find_normalized(norm_text)
+
+    with timed("experience_years"):
+        experience_years = extract_experience_years(resume_raw_text)
+
+    return ResumeFeatures(
+        sha256=content_sha256,
+        raw_text=resume_raw_text,
+        cleaned_text=resume_text,
+        experience_years=experience_years,
+        skills=skills,
+        degrees=degrees,
+        job_titles=job_titles,
+        tfidf_vector=tfidf_vector,
+    )
 
-    semantic_sim = 0.0
-    try:
-        semantic_sim = semantic_score(resume_text, jd.get("description", ""))
-    except Exception:
-        semantic_sim = 0.0
 
-    result = match_resume_to_jd(parsed_resume, jd, semantic_sim)
+def extract_resume_features(resume_pdf_path: str, content_sha256: str = None) -> ResumeFeatures:
+    """Run the JD-independent part of the pipeline on a resume PDF."""
+    if content_sha256 is None:
+        content_sha256 = file_checksum(Path(resume_pdf_path))
+
+    with timed("extract_text"):
+        resume_raw_text = extract_text_from_pdf(resume_pdf_path)
 
-    # Attach AI summary when possible
+    tfidf_vector = None
     try:
-        ai = generate_ai_fit_summary(result, jd)
-        result.update(ai)
+        with timed("tfidf"):
+            tfidf_vector = load_tfidf().transform([clean_text(resume_raw_text)])
     except Exception:
-        # non-fatal
-        pass
+        tfidf_vector = None
+
+    return _features_from_text(content_sha256, resume_raw_text, tfidf_vector)
+
+
+def get_resume_features(resume_pdf_path: str) -> ResumeFeatures:
+    """
+    Resume features from the content-addressed cache, extracting them on a
+    miss. The same PDF applied to many vacancies is only parsed once.
+    """
+    with timed("resume_cache"):
+        content_sha256 = file_checksum(Path(resume_pdf_path))
+        key = resume_features_key(content_sha256)
+
+        cache = get_resume_cache()
+        features = cache.get(key)
+    if features is None:
+        features = extract_resume_features(resume_pdf_path, content_sha256)
+        cache.put(key, features)
+    return features
+
+
+def _parse_resume(features: ResumeFeatures, jd: CompiledJD, components=SCORE_COMPONENTS) -> dict:
+    """The resume entities `components` are matched on (JD-specific terms included)."""
+    norm_text = features.norm_text
+    parsed_resume = {"experience_years": features.experience_years}
+    if "skills" in components:
+        parsed_resume["skills"] = features.skills | jd.skills_matcher.find_normalized(norm_text)
+    if "education" in components:
+        parsed_resume["degrees"] = features.degrees | jd.degrees_matcher.find_normalized(norm_text)
+    if "title" in components:
+        parsed_resume["job_titles"] = features.job_titles | jd.titles_matcher.find_normalized(norm_text)
+    if "keywords" in components:
+        parsed_resume["keywords"] = jd.keywords_matcher.find_normalized(norm_text)
+    return parsed_resume
+
+
+def _semantic_similarity(features: ResumeFeatures, jd: CompiledJD) -> float:
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    with timed("semantic"):
+        try:
+            if features.tfidf_vector is not None:
+                return round(cosine_similarity(features.tfidf_vector, jd.jd_vector)[0][0] * 100, 2)
+        except Exception:
+            pass
+        return 0.0
+
+
+def score_resume_features(features: ResumeFeatures, jd, semantic_sim: float = None) -> dict:
+    """
+    JD-specific matching on top of cached resume features. `semantic_sim`
+    can be passed in when it was already computed for a whole batch.
+    """
+    jd = compile_jd(jd)
+
+    if semantic_sim is None:
+        semantic_sim = _semantic_similarity(features, jd)
+
+    with timed("match"):
+        return match_resume_to_jd(_parse_resume(features, jd), jd, semantic_sim)
+
+
+def rescore_resume_features(features: ResumeFeatures, jd, previous: dict, components) -> dict:
+    """
+    Update `previous` (a stored scorer result) after a JD edit that only
+    affects `components`: those are recomputed from the cached features, the
+    other component scores are taken from `previous`, and final_score is
+    re-weighted with the JD's current weights.
+    """
+    jd = compile_jd(jd)
+    components = set(components)
+
+    result = dict(previous)
+    scores = {name: stored_component_score(previous, name) for name in SCORE_COMPONENTS}
 
+    with timed("match"):
+        parsed_resume = _parse_resume(features, jd, components)
+        for name in components & COMPONENT_SCORERS.keys():
+            scores[name], keys = COMPONENT_SCORERS[name](parsed_resume, jd)
+            result.update(keys)
+
+    if "semantic" in components:
+        scores["semantic"] = result["semantic_similarity"] = _semantic_similarity(features, jd)
+
+    result["final_score"] = round(_weighted_score(scores, jd.weights), 2)
     return result
+
+
+def score_resume(resume_pdf_path: str, jd, with_summary: bool = False) -> dict:
+    """
+    Score a resume PDF against a job description. `jd` may be a plain JD dict
+    or a `CompiledJD` (preferred when scoring many resumes for one vacancy).
+
+    The AI fit summary is a separate, slower stage: unless `with_summary` is
+    set, only the rule-based recommendation is attached.
+
+    Time spent per stage (ms) is attached as `timings`.
+    """
+    jd = compile_jd(jd)
+
+    with collecting() as timings:
+        features = get_resume_features(resume_pdf_path)
+        result = score_resume_features(features, jd)
+
+        if with_summary:
+            result.update(generate_ai_fit_summary(result, jd.jd))
+        else:
+            result.update(pending_fit_summary(result))
+
+    result["timings"] = timings
+    return result
+
+
+# ==================================================
+# BATCH API
+# ==================================================
+
+def _timed_extract(path: str) -> tuple:
+    started = time.perf_counter()
+    text = extract_text_from_pdf(path)
+    return text, time.perf_counter() - started
+
+
+def _extract_texts(paths: list, max_workers: int) -> list:
+    """
+    Extract PDF texts, in worker processes when there is more than one.
+    Returns (text or Exception, seconds spent) per path.
+    """
+    def _safe_extract(path):
+        started = time.perf_counter()
+        try:
+            return _timed_extract(path)
+        except Exception as e:
+            return e, time.perf_counter() - started
+
+    if max_workers <= 1 or len(paths) <= 1:
+        return [_safe_extract(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        futures = [pool.submit(_timed_extract, path) for path in paths]
+        texts = []
+        for future in futures:
+            try:
+                texts.append(future.result())
+            except Exception as e:
+                texts.append((e, 0.0))
+        return texts
+
+
+def get_resume_features_batch(resume_paths: list, max_workers: int = None, timings: list = None) -> list:
+    """
+    Cached features for many resumes. Cache misses are extracted in parallel
+    and vectorized with a single TF-IDF transform. Entries are ResumeFeatures,
+    or the Exception raised while reading that resume.
+
+    `timings`, one dict per path, collects the stages spent on each resume;
+    batch-wide stages are split evenly between the resumes they served.
+    """
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+    if timings is None:
+        timings = [{} for _ in resume_paths]
+
+    cache = get_resume_cache()
+    features = [None] * len(resume_paths)
+    keys = [None] * len(resume_paths)
+
+    # Same content applied under several paths is extracted once
+    misses = {}
+    for i, path in enumerate(resume_paths):
+        with collecting(timings[i]), timed("resume_cache"):
+            try:
+                content_sha256 = file_checksum(Path(path))
+            except OSError as e:
+                features[i] = e
+                continue
+            keys[i] = resume_features_key(content_sha256)
+            cached = cache.get(keys[i])
+        if cached is not None:
+            features[i] = cached
+        else:
+            misses.setdefault(keys[i], (content_sha256, path, []))[2].append(i)
+
+    if misses:
+        pending = list(misses.values())
+        extracted_texts = _extract_texts([path for _, path, _ in pending], max_workers)
+        texts = []
+        for item, (text, seconds) in zip(pending, extracted_texts):
+            with collecting(timings[item[2][0]]):
+                record("extract_text", seconds)
+            texts.append(text)
+
+        extracted = [(item, text) for item, text in zip(pending, texts) if not isinstance(text, Exception)]
+        vectors = [None] * len(extracted)
+        if extracted:
+            started = time.perf_counter()
+            try:
+                matrix = load_tfidf().transform([clean_text(text) for _, text in extracted])
+                vectors = [matrix[row] for row in range(matrix.shape[0])]
+            except Exception:
+                pass
+            share = (time.perf_counter() - started) / len(extracted)
+            for item, _ in extracted:
+                with collecting(timings[item[2][0]]):
+                    record("tfidf", share)
+
+        for (item, text), vector in zip(extracted, vectors):
+            content_sha256, _, indexes = item
+            with collecting(timings[indexes[0]]):
+                entry = _features_from_text(content_sha256, text, vector)
+            cache.put(keys[indexes[0]], entry)
+            for i in indexes:
+                features[i] = entry
+
+        for item, text in zip(pending, texts):
+            if isinstance(text, Exception):
+                for i in item[2]:
+                    features[i] = text
+
+    return features
+
+
+def score_resumes_batch(resume_paths: list, jd, max_workers: int = None, with_summary: bool = False) -> list:
+    """
+    Score many resumes against one job description.
+
+    Returns one entry per path, in order: the same dict `score_resume` would
+    return, or the Exception raised while reading that resume. Semantic
+    similarity for the whole batch is one sparse matrix product against the
+    precomputed JD vector.
+    """
+    import scipy.sparse as sp
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    jd = compile_jd(jd)
+    timings = [{} for _ in resume_paths]
+    features = get_resume_features_batch(resume_paths, max_workers=max_workers, timings=timings)
+
+    # Semantic similarity for every vectorized resume at once
+    rows = [i for i, f in enumerate(features) if isinstance(f, ResumeFeatures) and f.tfidf_vector is not None]
+    similarities = {}
+    if rows:
+        started = time.perf_counter()
+        try:
+            matrix = sp.vstack([features[i].tfidf_vector for i in rows], format="csr")
+            sims = cosine_similarity(matrix, jd.jd_vector)[:, 0]
+            similarities = {i: round(sims[n] * 100, 2) for n, i in enumerate(rows)}
+        except Exception:
+            similarities = {}
+        share = (time.perf_counter() - started) / len(rows)
+        for i in rows:
+            with collecting(timings[i]):
+                record("semantic", share)
+
+    results = []
+    for i, entry in enumerate(features):
+        if not isinstance(entry, ResumeFeatures):
+            results.append(entry)
+            continue
+
+        with collecting(timings[i]):
+            result = score_resume_features(entry, jd, semantic_sim=similarities.get(i, 0.0))
+            if with_summary:
+                result.update(generate_ai_fit_summary(result, jd.jd))
+            else:
+                result.update(pending_fit_summary(result))
+        result["timings"] = timings[i]
+        results.append(result)
+
+    return results
@@ -0,0 +1,14 @@
+# backend/vacancies/ml/text.py
+
+import re
+
+
+def clean_text(text: str) -> str:
+    text = text.encode("utf-8", "ignore").decode("utf-8", "ignore")
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_token(s: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", s.lower())
@@ -0,0 +1,153 @@
+# backend/vacancies/ml/tfidf_artifact.py
+"""
+Persisted TF-IDF model.
+
+Fitting the vectorizer on UpdatedResumeDataSet.csv is the most expensive part
+of a cold scorer. Instead of refitting in every process, the fitted vocabulary
+and idf weights are written once (`manage.py build_tfidf_artifact`) and loaded
+with a memory map afterwards. The artifact records the SHA-256 of the dataset
+it was fitted on, so a changed dataset triggers a refit.
+
+Layout of the artifact directory:
+
+    meta.json        format version, vectorizer params, dataset checksum
+    vocabulary.txt   UTF-8 terms, one per line, ordered by feature index
+    idf.npy          float64 idf weights, ordered by feature index
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# numpy / scikit-learn are imported on first use; see the note in scorer.py
+
+
+ARTIFACT_FORMAT_VERSION = 1
+
+# Vectorizer configuration; changing any of these invalidates existing artifacts
+TFIDF_PARAMS = {
+    "stop_words": "english",
+    "max_features": 6000,
+    "ngram_range": (1, 2),
+}
+
+DEFAULT_ARTIFACT_DIR = Path(__file__).resolve().parent / "artifacts" / "tfidf"
+
+
+def file_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _params_for_meta() -> dict:
+    # JSON has no tuples; store the canonical list form
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in TFIDF_PARAMS.items()}
+
+
+def new_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(**TFIDF_PARAMS)
+
+
+def vectorizer_from_arrays(vocabulary, idf):
+    """Rebuild a fitted TfidfVectorizer from its vocabulary and idf arrays."""
+    tfidf = new_vectorizer()
+    tfidf.vocabulary_ = {term: i for i, term in enumerate(vocabulary)}
+    tfidf.idf_ = idf
+    return tfidf
+
+
+def save_artifact(tfidf, dataset_checksum: str, artifact_dir: Path = DEFAULT_ARTIFACT_DIR) -> Path:
+    """
+    Write `tfidf` to `artifact_dir`. The directory is replaced atomically so
+    concurrent readers never observe a half-written artifact.
+    """
+    import numpy as np
+
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.parent.mkdir(parents=True, exist_ok=True)
+
+    terms = sorted(tfidf.vocabulary_, key=tfidf.vocabulary_.get)
+    idf = np.asarray(tfidf.idf_, dtype=np.float64)
+
+    meta = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "params": _params_for_meta(),
+        "dataset_sha256": dataset_checksum,
+        "n_features": len(terms),
+    }
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".tfidf-", dir=artifact_dir.parent))
+    os.chmod(tmp_dir, 0o755)
+    try:
+        # Analyzer tokens never contain newlines, so one term per line is safe
+        with open(tmp_dir / "vocabulary.txt", "w", encoding="utf-8") as fh:
+            fh.write("\n".join(terms))
+        np.save(tmp_dir / "idf.npy", idf)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+
+        replace_directory(tmp_dir, artifact_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return artifact_dir
+
+
+def replace_directory(new_dir: Path, target_dir: Path) -> None:
+    """Swap `new_dir` into place as `target_dir`, removing the previous one."""
+    old_dir = None
+    if target_dir.exists():
+        old_dir = target_dir.with_name(f".{target_dir.name}-old-{os.getpid()}")
+        os.replace(target_dir, old_dir)
+    os.replace(new_dir, target_dir)
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_meta(artifact_dir: Path = DEFAULT_ARTIFACT_DIR):
+    try:
+        with open(Path(artifact_dir) / "meta.json", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def load_artifact(dataset_checksum: str, artifact_dir: Path = DEFAULT_ARTIFACT_DIR):
+    """
+    Return a fitted TfidfVectorizer from `artifact_dir`, or None when the
+    artifact is missing, stale (different dataset / params) or unreadable.
+    """
+    import numpy as np
+
+    artifact_dir = Path(artifact_dir)
+    meta = read_meta(artifact_dir)
+    if not meta:
+        return None
+
+    if (
+        meta.get("format_version") != ARTIFACT_FORMAT_VERSION
+        or meta.get("params") != _params_for_meta()
+        or meta.get("dataset_sha256") != dataset_checksum
+    ):
+        return None
+
+    try:
+        with open(artifact_dir / "vocabulary.txt", encoding="utf-8") as fh:
+            vocabulary = fh.read().split("\n")
+        idf = np.load(artifact_dir / "idf.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    if len(vocabulary) != meta.get("n_features") or len(idf) != len(vocabulary):
+        return None
+
+    return vectorizer_from_arrays(vocabulary, idf)
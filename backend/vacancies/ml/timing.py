@@ -0,0 +1,252 @@
+# backend/vacancies/ml/timing.py
+"""
+Lightweight stage timers for the scoring pipeline.
+
+Every timed stage is added to two places:
+    - the timings dict being collected on the current thread, if any (the
+      scorer attaches it to the result as `ml_result["timings"]`, in ms)
+    - a process-level histogram per stage
+
+Histograms use fixed log-scale buckets (8 per doubling, ~9% resolution), so
+recording is O(1) and snapshots from several processes can be merged by
+adding counts. Each process periodically writes its snapshot to
+`<DIR>/<host>-<pid>.json`; `manage.py stage_timings` merges them and prints
+p50/p95/p99 per stage.
+
+Configured through the `STAGE_TIMINGS` Django setting when available:
+
+    STAGE_TIMINGS = {
+        'DIR': BASE_DIR / 'var' / 'stage_timings',   # None = in-process only
+        'FLUSH_INTERVAL': 30,                        # seconds between snapshot writes
+    }
+"""
+
+import atexit
+import json
+import math
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+DEFAULT_FLUSH_INTERVAL = 30.0
+
+# Bucket i covers (MIN_MS * 2 ** (i / 8), MIN_MS * 2 ** ((i + 1) / 8)] milliseconds
+MIN_MS = 0.01
+BUCKETS_PER_DOUBLING = 8
+MAX_BUCKET = 8 * 30     # ~3 hours
+
+
+def bucket_of(ms: float) -> int:
+    if ms <= MIN_MS:
+        return 0
+    return min(MAX_BUCKET, int(math.log2(ms / MIN_MS) * BUCKETS_PER_DOUBLING))
+
+
+def bucket_upper_ms(bucket: int) -> float:
+    return MIN_MS * 2 ** ((bucket + 1) / BUCKETS_PER_DOUBLING)
+
+
+class StageHistogram:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = {}
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        bucket = bucket_of(ms)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: "StageHistogram") -> None:
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(bucket_upper_ms(bucket), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "buckets": {str(bucket): count for bucket, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StageHistogram":
+        histogram = cls()
+        histogram.count = int(data.get("count", 0))
+        histogram.total_ms = float(data.get("total_ms", 0.0))
+        histogram.max_ms = float(data.get("max_ms", 0.0))
+        histogram.buckets = {int(bucket): int(count) for bucket, count in data.get("buckets", {}).items()}
+        return histogram
+
+
+class StageTimings:
+    """Process-level histograms of every timed stage, flushed to disk periodically."""
+
+    def __init__(self, directory=None, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._dirty = False
+
+    @property
+    def snapshot_path(self):
+        if self.directory is None:
+            return None
+        return self.directory / f"{socket.gethostname()}-{os.getpid()}.json"
+
+    def observe(self, stage: str, ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = StageHistogram()
+            histogram.observe(ms)
+            self._dirty = True
+            due = self.directory is not None and time.monotonic() - self._last_flush >= self.flush_interval
+
+        if due:
+            self.flush()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far in this process."""
+        with self._lock:
+            self._histograms = {}
+            self._dirty = False
+
+    def histograms(self) -> dict:
+        with self._lock:
+            return {stage: StageHistogram.from_dict(h.to_dict()) for stage, h in self._histograms.items()}
+
+    def flush(self) -> None:
+        """Write this process's histograms to its snapshot file (best effort)."""
+        path = self.snapshot_path
+        if path is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {stage: h.to_dict() for stage, h in self._histograms.items()}
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"pid": os.getpid(), "written_at": time.time(), "stages": payload}, fh)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def load_snapshots(directory) -> dict:
+    """Merge the histograms in every snapshot file under `directory`."""
+    merged = {}
+    directory = Path(directory)
+    if not directory.is_dir():
+        return merged
+
+    for path in sorted(directory.glob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                stages = json.load(fh).get("stages", {})
+        except (OSError, ValueError):
+            continue
+        for stage, data in stages.items():
+            merged.setdefault(stage, StageHistogram()).merge(StageHistogram.from_dict(data))
+    return merged
+
+
+# ---------- process-wide instance ----------
+
+_timings = None
+_timings_lock = threading.Lock()
+_local = threading.local()
+
+
+def _configured_options() -> dict:
+    try:
+        from django.conf import settings
+
+        if not settings.configured:
+            return {}
+        options = getattr(settings, "STAGE_TIMINGS", {}) or {}
+    except ImportError:
+        return {}
+
+    return {
+        "directory": options.get("DIR"),
+        "flush_interval": options.get("FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL),
+    }
+
+
+def get_stage_timings() -> StageTimings:
+    global _timings
+    if _timings is None:
+        with _timings_lock:
+            if _timings is None:
+                _timings = StageTimings(**_configured_options())
+                atexit.register(_timings.flush)
+    return _timings
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add `seconds` spent in `stage` to the current collection and the histograms."""
+    ms = seconds * 1000
+    collected = getattr(_local, "timings", None)
+    if collected is not None:
+        collected[stage] = round(collected.get(stage, 0.0) + ms, 3)
+    get_stage_timings().observe(stage, ms)
+
+
+@contextmanager
+def timed(stage: str):
+    """Time the block as `stage`; it counts even when the block raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+@contextmanager
+def collecting(timings: dict = None):
+    """
+    Collect the stages timed on this thread inside the block into `timings`
+    ({stage: ms}, a new dict by default), which is yielded.
+    """
+    if timings is None:
+        timings = {}
+    previous = getattr(_local, "timings", None)
+    _local.timings = timings
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
@@ -0,0 +1,285 @@
+# backend/vacancies/ml/vacancy_index.py
+"""
+Reverse matching: rank many vacancies for one resume at once.
+
+`VacancyIndex` keeps every indexed vacancy's compiled requirements as rows of
+sparse matrices:
+
+    tfidf      vacancies x TF-IDF features (L2-normalized JD vectors)
+    skills     vacancies x required skills       (binary)
+    degrees    vacancies x education terms       (binary)
+    keywords   vacancies x keywords              (binary)
+    aliases    vacancies x job title aliases     (binary)
+
+plus dense arrays for experience bounds and score weights. Ranking a resume is
+one Aho-Corasick pass over its text (against the union of all vacancy terms)
+and a handful of sparse matrix-vector products; the resulting components and
+`final_score` are the ones `score_resume_features` would produce for each
+vacancy.
+
+The index is updated incrementally: `sync` only compiles vacancies that are
+new or whose version changed, and drops the ones no longer listed.
+"""
+
+import threading
+
+from vacancies.ml.matcher import EntityMatcher
+from vacancies.ml.scorer import DEFAULT_SCORE_WEIGHTS, load_tfidf
+
+
+# Column order of the weight matrix, matching the component order below
+WEIGHT_KEYS = ("skills", "semantic", "education", "experience", "keywords", "title")
+
+ENTITY_KINDS = ("skills", "degrees", "keywords", "aliases")
+
+
+class _VacancyRow:
+    __slots__ = ("version", "tfidf", "columns", "min_exp", "max_exp", "weights")
+
+    def __init__(self, version, tfidf, columns, min_exp, max_exp, weights):
+        self.version = version
+        self.tfidf = tfidf
+        self.columns = columns       # kind -> list of column ids
+        self.min_exp = min_exp
+        self.max_exp = max_exp
+        self.weights = weights
+
+
+class VacancyIndex:
+    def __init__(self):
+        self._rows = {}
+        # Append-only term -> column id maps, so existing rows stay valid
+        self._columns = {kind: {} for kind in ENTITY_KINDS}
+        self._alias_words = []       # alias column -> set of words
+        self._alias_by_word = {}     # word -> alias columns containing it
+
+        self._matcher = None
+        self._matrices = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---------- maintenance ----------
+
+    def _column(self, kind: str, term: str) -> int:
+        columns = self._columns[kind]
+        col = columns.get(term)
+        if col is None:
+            col = columns[term] = len(columns)
+            self._matcher = None
+            if kind == "aliases":
+                words = set(term.split())
+                self._alias_words.append(words)
+                for word in words:
+                    self._alias_by_word.setdefault(word, []).append(col)
+        return col
+
+    def sync(self, versions: dict, load_jds) -> tuple:
+        """
+        Bring the index in line with `versions` ({vacancy_id: version}).
+        `load_jds(ids)` must return {vacancy_id: jd dict} for the given ids;
+        it is only called for new or changed vacancies.
+        Returns (compiled, removed) counts.
+        """
+        with self._lock:
+            removed = [vid for vid in self._rows if vid not in versions]
+            for vid in removed:
+                del self._rows[vid]
+
+            stale = [vid for vid, version in versions.items()
+                     if vid not in self._rows or self._rows[vid].version != version]
+            if stale:
+                self._compile(stale, versions, load_jds(stale))
+
+            if removed or stale:
+                self._matrices = None
+            return len(stale), len(removed)
+
+    def _compile(self, ids, versions, jds):
+        ids = [vid for vid in ids if vid in jds]
+        if not ids:
+            return
+
+        vectors = load_tfidf().transform([jds[vid].get("description", "") for vid in ids])
+
+        for n, vid in enumerate(ids):
+            jd = jds[vid]
+            terms = {
+                "skills": jd.get("required_skills", set()),
+                "degrees": jd.get("education_required", set()),
+                "keywords": jd.get("keywords", set()),
+                "aliases": jd.get("job_title_aliases", set()),
+            }
+            columns = {
+                kind: sorted({self._column(kind, term) for term in map(str.lower, values)})
+                for kind, values in terms.items()
+            }
+            weights = {**DEFAULT_SCORE_WEIGHTS, **(jd.get("score_weights") or {})}
+
+            self._rows[vid] = _VacancyRow(
+                version=versions[vid],
+                tfidf=vectors[n],
+                columns=columns,
+                min_exp=jd.get("min_experience_years", 0) or 0,
+                max_exp=jd.get("max_experience_years"),
+                weights=[weights[key] for key in WEIGHT_KEYS],
+            )
+
+    def _materialize(self):
+        import numpy as np
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+
+        ids = list(self._rows)
+        rows = [self._rows[vid] for vid in ids]
+        n = len(rows)
+
+        def binary(kind):
+            indptr = [0]
+            indices = []
+            for row in rows:
+                indices.extend(row.columns[kind])
+                indptr.append(len(indices))
+            data = np.ones(len(indices), dtype=np.float64)
+            return sp.csr_matrix((data, indices, indptr), shape=(n, len(self._columns[kind])))
+
+        matrices = {kind: binary(kind) for kind in ENTITY_KINDS}
+        matrices["columns"] = {kind: dict(columns) for kind, columns in self._columns.items()}
+        matrices["ids"] = np.array(ids, dtype=np.int64)
+        matrices["tfidf"] = normalize(sp.vstack([row.tfidf for row in rows], format="csr"))
+        matrices["n_skills"] = np.array([len(row.columns["skills"]) for row in rows], dtype=np.float64)
+        matrices["n_keywords"] = np.array([len(row.columns["keywords"]) for row in rows], dtype=np.float64)
+        matrices["min_exp"] = np.array([row.min_exp for row in rows], dtype=np.float64)
+        # experience_score ignores a falsy max bound
+        matrices["max_exp"] = np.array([row.max_exp or np.nan for row in rows], dtype=np.float64)
+        matrices["weights"] = np.array([row.weights for row in rows], dtype=np.float64).reshape(n, len(WEIGHT_KEYS))
+        return matrices
+
+    def _snapshot(self):
+        with self._lock:
+            if self._matrices is None:
+                self._matrices = self._materialize() if self._rows else None
+            if self._matcher is None:
+                terms = set()
+                for columns in self._columns.values():
+                    terms.update(columns)
+                self._matcher = EntityMatcher(terms)
+            return self._matrices, self._matcher
+
+    # ---------- ranking ----------
+
+    @staticmethod
+    def _hits(columns, *term_sets):
+        """0/1 vector over `columns` marking every term present in `term_sets`."""
+        import numpy as np
+
+        hits = np.zeros(len(columns), dtype=np.float64)
+        for terms in term_sets:
+            for term in terms:
+                col = columns.get(term)
+                if col is not None:
+                    hits[col] = 1.0
+        return hits
+
+    def _alias_hits(self, columns, found, job_titles):
+        hits = self._hits(columns, found)
+        # A master job title matches an alias sharing enough words with it
+        # (same rule as match_resume_to_jd)
+        for title in job_titles:
+            title_words = set(title.split())
+            for word in title_words:
+                for col in self._alias_by_word.get(word, ()):
+                    if col >= len(hits) or hits[col]:
+                        continue
+                    alias_words = self._alias_words[col]
+                    overlap = len(title_words & alias_words)
+                    if overlap and overlap >= max(1, len(alias_words) - 1):
+                        hits[col] = 1.0
+        return hits
+
+    def score_all(self, features):
+        """
+        Components and final score of `features` (ResumeFeatures) against every
+        indexed vacancy. Returns (vacancy ids, {component: array}) or None when
+        the index is empty.
+        """
+        import numpy as np
+        from sklearn.preprocessing import normalize
+
+        matrices, matcher = self._snapshot()
+        if matrices is None:
+            return None
+        columns = matrices["columns"]
+
+        found = matcher.find_normalized(features.norm_text)
+        skills = self._hits(columns["skills"], found, features.skills)
+        degrees = self._hits(columns["degrees"], found, features.degrees)
+        keywords = self._hits(columns["keywords"], found)
+        aliases = self._alias_hits(columns["aliases"], found, set(map(str.lower, features.job_titles)))
+
+        n_skills = matrices["n_skills"]
+        n_keywords = matrices["n_keywords"]
+        skill_pct = np.divide(matrices["skills"] @ skills, n_skills,
+                              out=np.zeros_like(n_skills), where=n_skills > 0) * 100
+        keyword_pct = np.divide(matrices["keywords"] @ keywords, n_keywords,
+                                out=np.zeros_like(n_keywords), where=n_keywords > 0) * 100
+        education = (matrices["degrees"] @ degrees) > 0
+        title = (matrices["aliases"] @ aliases) > 0
+
+        if features.tfidf_vector is not None:
+            resume_vector = normalize(features.tfidf_vector)
+            semantic = np.round((matrices["tfidf"] @ resume_vector.T).toarray().ravel() * 100, 2)
+        else:
+            semantic = np.zeros(len(n_skills))
+
+        # Vectorized experience_score
+        years = float(features.experience_years)
+        min_exp, max_exp = matrices["min_exp"], matrices["max_exp"]
+        ratio = np.divide(years, min_exp, out=np.ones_like(min_exp), where=min_exp > 0)
+        experience = np.minimum(100.0, ratio * 100)
+        experience[years > max_exp] = 100.0     # NaN (no upper bound) compares False
+        experience[years < min_exp] = 0.0
+
+        weights = matrices["weights"]
+        final = (
+            weights[:, 0] * skill_pct
+            + weights[:, 1] * semantic
+            + weights[:, 2] * education * 100
+            + weights[:, 3] * experience
+            + weights[:, 4] * keyword_pct
+            + weights[:, 5] * title * 100
+        )
+
+        return matrices["ids"], {
+            "final_score": np.round(final, 2),
+            "skill_match_pct": np.round(skill_pct, 2),
+            "semantic_similarity": semantic,
+            "education_match": education,
+            "experience_score": np.round(experience, 2),
+            "keyword_match_pct": np.round(keyword_pct, 2),
+            "job_title_match": title,
+        }
+
+    def rank(self, features, limit: int = 20, exclude=()) -> list:
+        """Top `limit` vacancies for `features`, best first, as dicts of components."""
+        import numpy as np
+
+        scored = self.score_all(features)
+        if scored is None:
+            return []
+        ids, components = scored
+
+        final = components["final_score"].copy()
+        if exclude:
+            final[np.isin(ids, list(exclude))] = -np.inf
+
+        candidates = np.flatnonzero(np.isfinite(final))
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-final[candidates], limit - 1)[:limit]]
+        order = candidates[np.lexsort((ids[candidates], -final[candidates]))]
+
+        return [
+            {"vacancy_id": int(ids[i]), **{name: values[i].item() for name, values in components.items()}}
+            for i in order
+        ]
@@ -1,34 +1,161 @@
 # backend/vacancies/ml_scoring.py
 
 import os
-import shutil
+import threading
+from collections import OrderedDict
 from typing import Tuple
 from django.conf import settings
-import json
+from django.db.models import Case, CharField, F, FloatField, Func, JSONField, Q, Value, When
+from django.db.models.functions import Round
+from django.db.models.lookups import GreaterThanOrEqual
 
 from vacancies.models import Vacancy, Application
 from accounts.models import Candidate
 
 # ✅ USE REAL ML SCORER
-from vacancies.ml.scorer import score_resume
+from vacancies.ml.scorer import (
+    DEFAULT_SCORE_WEIGHTS,
+    SCORE_COMPONENTS,
+    CompiledJD,
+    get_resume_features_batch,
+    pending_fit_summary,
+    rescore_resume_features,
+    score_resume,
+    score_resumes_batch,
+)
+from vacancies.ml.fit_summary import FALLBACK_PREFIX, NOT_RECOMMENDED, SCORE_RECOMMENDATIONS
+from vacancies.ml.timing import collecting, timed
+from vacancies.resume_store import file_sorted_resume, refile_vacancy
+from vacancies.score_audit import record_score
 
 
-def categorize_score(score: float) -> str:
-    if score >= 60:
-        return "highly_preferred"
-    if score >= 50:
-        return "mid_preference"
-    if score >= 25:
-        return "low_preference"
+# Compiled JDs kept per process, keyed on (vacancy id, updated_at) so any
+# saved edit to the vacancy produces a fresh entry.
+COMPILED_JD_CACHE_SIZE = 128
+_compiled_jd_cache = OrderedDict()
+_compiled_jd_lock = threading.Lock()
+
+
+# Scorer result keys stored as Application columns, with their column types
+SCORE_COMPONENT_FIELDS = {
+    "skill_match_pct": float,
+    "semantic_similarity": float,
+    "education_match": bool,
+    "experience_years": float,
+    "experience_score": float,
+    "keyword_match_pct": float,
+    "job_title_match": bool,
+}
+
+
+# Vacancy fields each score component is computed from. Editing only some of
+# them re-scores just those components of existing applications.
+COMPONENT_SOURCE_FIELDS = {
+    "skills": ("required_skills",),
+    "semantic": ("description",),
+    "education": ("education_required",),
+    "experience": ("min_experience_years", "max_experience_years"),
+    "keywords": ("keywords",),
+    "title": ("job_title_aliases",),
+}
+
+
+# Minimum final_score of each category, best first; anything lower is "no_visit".
+# A vacancy may override them through `category_thresholds`.
+DEFAULT_CATEGORY_THRESHOLDS = {
+    "highly_preferred": 60.0,
+    "mid_preference": 50.0,
+    "low_preference": 25.0,
+}
+
+# Application column (in percent) behind each score weight
+WEIGHTED_COMPONENTS = {
+    "skills": F("skill_match_pct"),
+    "semantic": F("semantic_similarity"),
+    "education": Case(When(education_match=True, then=Value(100.0)), default=Value(0.0)),
+    "experience": F("experience_score"),
+    "keywords": F("keyword_match_pct"),
+    "title": Case(When(job_title_match=True, then=Value(100.0)), default=Value(0.0)),
+}
+
+
+def score_weights(vacancy: Vacancy) -> dict:
+    return {**DEFAULT_SCORE_WEIGHTS, **(getattr(vacancy, "score_weights", None) or {})}
+
+
+def category_thresholds(vacancy: Vacancy) -> dict:
+    return {**DEFAULT_CATEGORY_THRESHOLDS, **(getattr(vacancy, "category_thresholds", None) or {})}
+
+
+def categorize_score(score: float, thresholds: dict = None) -> str:
+    thresholds = thresholds or DEFAULT_CATEGORY_THRESHOLDS
+    for category in ("highly_preferred", "mid_preference", "low_preference"):
+        if score >= thresholds[category]:
+            return category
     return "no_visit"
 
 
-def score_application_and_store_resume(
-    candidate: Candidate,
-    vacancy: Vacancy,
-    application: Application,
-) -> Tuple[float, str]:
+def affected_components(changed_fields) -> set:
+    """Score components that depend on any of the `changed_fields` of a vacancy."""
+    changed_fields = set(changed_fields)
+    return {
+        component for component, fields in COMPONENT_SOURCE_FIELDS.items()
+        if changed_fields.intersection(fields)
+    }
+
 
+def build_jd(vacancy: Vacancy) -> dict:
+    return {
+        "job_title": getattr(vacancy, "title", None) or "",
+        "description": vacancy.description or "",
+        # Coerce fields to python sets of strings (vacancy fields may be lists/QuerySets)
+        "required_skills": set(map(str, getattr(vacancy, "required_skills", []) or [])),
+        "education_required": set(map(str, getattr(vacancy, "education_required", []) or [])),
+        "job_title_aliases": set(map(str, getattr(vacancy, "job_title_aliases", []) or [])),
+        "keywords": set(map(str, getattr(vacancy, "keywords", []) or [])),
+        "min_experience_years": getattr(vacancy, "min_experience_years", 0) or 0,
+        "max_experience_years": getattr(vacancy, "max_experience_years", None),
+        "score_weights": dict(getattr(vacancy, "score_weights", None) or {}),
+    }
+
+
+def score_components(result: dict) -> dict:
+    """Column values for the score breakdown in a scorer result."""
+    components = {}
+    for field, kind in SCORE_COMPONENT_FIELDS.items():
+        value = result.get(field)
+        try:
+            components[field] = kind(value) if value is not None else kind()
+        except (TypeError, ValueError):
+            components[field] = kind()
+    return components
+
+
+def get_compiled_jd(vacancy: Vacancy) -> CompiledJD:
+    """Return the process-wide CompiledJD for `vacancy`, building it on a miss."""
+    key = (vacancy.id, vacancy.updated_at)
+
+    with _compiled_jd_lock:
+        compiled = _compiled_jd_cache.get(key)
+        if compiled is not None:
+            _compiled_jd_cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledJD(build_jd(vacancy))
+    # Compute the TF-IDF vector outside the lock; it is the expensive part
+    compiled.jd_vector
+
+    with _compiled_jd_lock:
+        _compiled_jd_cache[key] = compiled
+        _compiled_jd_cache.move_to_end(key)
+        while len(_compiled_jd_cache) > COMPILED_JD_CACHE_SIZE:
+            _compiled_jd_cache.popitem(last=False)
+
+    return compiled
+
+
+def resolve_resume_path(candidate: Candidate):
+    """Absolute path of the candidate's resume, or None if there is no file."""
     # Support both FileField `resume` (current) and legacy `resume_path` attribute
     resume_field = getattr(candidate, "resume", None)
     resume_name = None
@@ -39,51 +166,164 @@ def score_application_and_store_resume(
         resume_name = getattr(candidate, "resume_path", None)
 
     if not resume_name:
-        return 0.0, "no_visit"
+        return None
 
-    media_root = settings.MEDIA_ROOT
-    resume_path = os.path.join(media_root, resume_name)
+    resume_path = os.path.join(settings.MEDIA_ROOT, resume_name)
 
     if not os.path.exists(resume_path):
+        return None
+
+    return resume_path
+
+
+def score_application_and_store_resume(
+    candidate: Candidate,
+    vacancy: Vacancy,
+    application: Application,
+    with_summary: bool = False,
+) -> Tuple[float, str]:
+
+    resume_path = resolve_resume_path(candidate)
+    if resume_path is None:
         return 0.0, "no_visit"
 
-    # 🔑 BUILD JD DICT (THIS WAS MISSING)
-    jd = {
-        "job_title": getattr(vacancy, "title", None) or "",
-        "description": vacancy.description or "",
-        # Coerce fields to python sets of strings (vacancy fields may be lists/QuerySets)
-        "required_skills": set(map(str, getattr(vacancy, "required_skills", []) or [])),
-        "education_required": set(map(str, getattr(vacancy, "education_required", []) or [])),
-        "job_title_aliases": set(map(str, getattr(vacancy, "job_title_aliases", []) or [])),
-        "keywords": set(map(str, getattr(vacancy, "keywords", []) or [])),
-        "min_experience_years": getattr(vacancy, "min_experience_years", 0) or 0,
-        "max_experience_years": getattr(vacancy, "max_experience_years", None),
-    }
+    # 🔑 COMPILED JD (cached per vacancy version)
+    jd = get_compiled_jd(vacancy)
 
     # 🔥 ACTUAL ML CALL
-    result = score_resume(resume_path, jd)
+    result = score_resume(resume_path, jd, with_summary=with_summary)
 
-    # --- write debug output so we can inspect scorer internals
-    try:
-        logs_dir = os.path.join(media_root, "logs")
-        os.makedirs(logs_dir, exist_ok=True)
-        debug_path = os.path.join(logs_dir, f"application_{application.id}_score.json")
-        debug_obj = {
-            "candidate_id": candidate.id,
-            "vacancy_id": vacancy.id,
-            "application_id": application.id,
-            "resume_path": resume_path,
-            "scorer_result": result,
-        }
-        with open(debug_path, "w", encoding="utf-8") as fh:
-            json.dump(debug_obj, fh, ensure_ascii=False, indent=2)
-    except Exception:
-        # don't break scoring if logging fails
-        pass
+    return store_score_result(candidate, vacancy, application, resume_path, result)
+
+
+def score_applications_batch(vacancy: Vacancy, applications: list) -> list:
+    """
+    Score many applications to one vacancy with `score_resumes_batch`.
+
+    Returns one outcome per application, in order: the `(final_score,
+    category)` tuple `score_application_and_store_resume` would return, or
+    the Exception raised while scoring that application.
+    """
+    outcomes = [(0.0, "no_visit")] * len(applications)
+
+    scorable = []
+    for i, application in enumerate(applications):
+        resume_path = resolve_resume_path(application.candidate)
+        if resume_path is not None:
+            scorable.append((i, application, resume_path))
+
+    if not scorable:
+        return outcomes
+
+    jd = get_compiled_jd(vacancy)
+    results = score_resumes_batch([path for _, _, path in scorable], jd)
+
+    for (i, application, resume_path), result in zip(scorable, results):
+        if isinstance(result, Exception):
+            outcomes[i] = result
+            continue
+        try:
+            outcomes[i] = store_score_result(application.candidate, vacancy, application, resume_path, result)
+        except Exception as e:
+            outcomes[i] = e
+
+    return outcomes
+
+
+def _has_stored_components(result) -> bool:
+    return isinstance(result, dict) and "final_score" in result and all(
+        field in result for field in SCORE_COMPONENT_FIELDS
+    )
+
+
+def rescore_applications_batch(vacancy: Vacancy, applications: list, components) -> list:
+    """
+    Re-score applications after a vacancy edit that only affects `components`
+    (see COMPONENT_SOURCE_FIELDS): only those are recomputed, from cached
+    resume features, on top of each application's stored result.
+    Applications without a stored result are scored in full.
+
+    Returns one outcome per application, like `score_applications_batch`.
+    """
+    components = set(components)
+    if not components or not components <= set(SCORE_COMPONENTS):
+        return score_applications_batch(vacancy, applications)
+
+    outcomes = [(0.0, "no_visit")] * len(applications)
+
+    full, partial = [], []
+    for i, application in enumerate(applications):
+        resume_path = resolve_resume_path(application.candidate)
+        if resume_path is None:
+            continue
+        if _has_stored_components(application.ml_result):
+            partial.append((i, application, resume_path))
+        else:
+            full.append(i)
+
+    if full:
+        for i, outcome in zip(full, score_applications_batch(vacancy, [applications[i] for i in full])):
+            outcomes[i] = outcome
+
+    if not partial:
+        return outcomes
+
+    jd = get_compiled_jd(vacancy)
+    timings = [{} for _ in partial]
+    features = get_resume_features_batch([path for _, _, path in partial], timings=timings)
+
+    for (i, application, resume_path), entry, entry_timings in zip(partial, features, timings):
+        if isinstance(entry, Exception):
+            outcomes[i] = entry
+            continue
+        try:
+            with collecting(entry_timings):
+                result = rescore_resume_features(entry, jd, application.ml_result, components)
+            # The previous AI summary describes the old score
+            result.update(pending_fit_summary(result))
+            result["timings"] = entry_timings
+            outcomes[i] = store_score_result(application.candidate, vacancy, application, resume_path, result)
+        except Exception as e:
+            outcomes[i] = e
+
+    return outcomes
+
+
+def store_score_result(
+    candidate: Candidate,
+    vacancy: Vacancy,
+    application: Application,
+    resume_path: str,
+    result: dict,
+) -> Tuple[float, str]:
+    """
+    Persist a scorer result on the application and file the resume by category.
+    The stages run here before the DB save are added to the result's `timings`.
+    """
+    with collecting(dict(result.get("timings") or {})) as timings:
+        return _store_score_result(candidate, vacancy, application, resume_path, result, timings)
+
+
+def _store_score_result(candidate, vacancy, application, resume_path, result, timings):
+    # --- audit trail of scorer internals, written by a background flusher
+    with timed("audit"):
+        record_score(candidate, vacancy, application, resume_path, result)
 
     final_score = float(result.get("final_score", 0.0))
 
-    category = categorize_score(final_score)
+    category = categorize_score(final_score, category_thresholds(vacancy))
+
+    # 📁 FILE RESUME by category (before saving, so its time is part of the stored timings)
+    with timed("file_resume"):
+        try:
+            file_sorted_resume(
+                vacancy.organization_id, vacancy.id, application.id, candidate.id, resume_path, category,
+            )
+        except Exception:
+            # non-fatal if filing fails
+            pass
+
+    result = dict(result, timings=timings)
 
     # Ensure ml_result is JSON serializable
     try:
@@ -124,25 +364,97 @@ def score_application_and_store_resume(
 
     application.final_score = final_score
     application.category = category
-    application.save(update_fields=["final_score", "category", "ml_result"])
-
-    # 📁 COPY RESUME
-    dest_dir = os.path.join(
-        media_root,
-        "sorted_resumes",
-        f"organization_{vacancy.organization_id}",
-        f"vacancy_{vacancy.id}",
-        category,
+    for field, value in score_components(result).items():
+        setattr(application, field, value)
+    with timed("save"):
+        application.save(update_fields=["final_score", "category", "ml_result", *SCORE_COMPONENT_FIELDS])
+
+    return final_score, category
+
+
+def store_fit_summary(application: Application, summary: dict) -> None:
+    """Merge an AI fit summary into the application's stored scorer result."""
+    ml_result = dict(application.ml_result or {})
+    ml_result.update({
+        key: summary.get(key)
+        for key in ("fit_summary", "recommendation", "recommendation_source", "strengths", "weaknesses")
+        if key in summary
+    })
+    if summary.get("timings"):
+        ml_result["timings"] = {**(ml_result.get("timings") or {}), **summary["timings"]}
+    application.ml_result = ml_result
+    application.save(update_fields=["ml_result"])
+
+
+class JSONSet(Func):
+    """SQLite's json_set(document, path, value, ...)."""
+    function = "JSON_SET"
+    output_field = JSONField()
+
+
+# Stored results whose recommendation follows from the score. Results stored
+# before the source was recorded only had one with a fallback summary.
+RULE_BASED_RECOMMENDATION = Q(ml_result__recommendation_source="score") | Q(
+    ml_result__recommendation_source__isnull=True,
+    ml_result__fit_summary__startswith=FALLBACK_PREFIX,
+)
+
+
+def rerank_vacancy(vacancy: Vacancy) -> int:
+    """
+    Recompute `final_score` and `category` of every scored application of
+    `vacancy` from the stored score components, using the vacancy's weights
+    and thresholds, then move its sorted resumes to their new category
+    folders. One UPDATE statement, which also rewrites the score stored in
+    `ml_result` and, unless the AI summary gave one, its recommendation; no
+    resume is re-parsed.
+    Returns the number of applications updated.
+    """
+    weights = score_weights(vacancy)
+    thresholds = category_thresholds(vacancy)
+
+    weighted = [Value(float(weights[key])) * column for key, column in WEIGHTED_COMPONENTS.items()]
+    total = weighted[0]
+    for term in weighted[1:]:
+        total = total + term
+    final_score = Round(total, 2, output_field=FloatField())
+
+    # Category is derived from the same expression: inside one UPDATE the
+    # final_score column still holds the old value
+    category = Case(
+        *[
+            When(GreaterThanOrEqual(final_score, Value(float(thresholds[name]))), then=Value(name))
+            for name in ("highly_preferred", "mid_preference", "low_preference")
+        ],
+        default=Value("no_visit"),
     )
-    os.makedirs(dest_dir, exist_ok=True)
 
-    filename = os.path.basename(resume_path)
-    dest_file = f"application_{application.id}_candidate_{candidate.id}_{filename}"
+    recommendation = Case(
+        *[
+            When(GreaterThanOrEqual(final_score, Value(float(minimum))), then=Value(name))
+            for minimum, name in SCORE_RECOMMENDATIONS
+        ],
+        default=Value(NOT_RECOMMENDED),
+    )
+    score_path = Value("$.final_score", output_field=CharField())
+    recommendation_path = Value("$.recommendation", output_field=CharField())
 
-    try:
-        shutil.copy2(resume_path, os.path.join(dest_dir, dest_file))
-    except Exception:
-        # non-fatal if copy fails
-        pass
+    scored = Application.objects.filter(vacancy=vacancy, ml_result__isnull=False)
+    updated = scored.update(
+        final_score=final_score,
+        category=category,
+        ml_result=Case(
+            When(
+                RULE_BASED_RECOMMENDATION,
+                then=JSONSet(F("ml_result"), score_path, final_score, recommendation_path, recommendation),
+            ),
+            default=JSONSet(F("ml_result"), score_path, final_score),
+        ),
+    )
 
-    return final_score, category
+    refile_vacancy(
+        vacancy.organization_id,
+        vacancy.id,
+        scored.values_list("id", "candidate_id", "category", "candidate__resume").iterator(),
+    )
+    return updated
@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from accounts.models import Organization, Candidate
+from .facets import parse_salary_range, sync_vacancy_skills
 
 
 class Vacancy(models.Model):
@@ -21,9 +23,18 @@ class Vacancy(models.Model):
     min_experience_years = models.FloatField(default=0)
     max_experience_years = models.FloatField(null=True, blank=True)
 
+    # --- Ranking profile: overrides of the default score weights and
+    # category thresholds (see ml_scoring.rerank_vacancy)
+    score_weights = models.JSONField(default=dict, blank=True)
+    category_thresholds = models.JSONField(default=dict, blank=True)
+
     # --- General vacancy fields
     location = models.CharField(max_length=255, blank=True, null=True)
     salary_range = models.CharField(max_length=255, blank=True, null=True)
+    # Bounds parsed from salary_range on save, for salary filters and facets
+    # (see facets.parse_salary_range)
+    salary_min = models.FloatField(null=True, blank=True, editable=False)
+    salary_max = models.FloatField(null=True, blank=True, editable=False)
     benefits = models.TextField(blank=True, null=True)
     experience_level = models.CharField(max_length=100, blank=True, null=True)
 
@@ -40,9 +51,54 @@ class Vacancy(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'is_public', 'location']),
+            models.Index(fields=['status', 'is_public', 'experience_level']),
+            models.Index(fields=['salary_min', 'salary_max']),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'salary_range' in update_fields:
+            self.salary_min, self.salary_max = parse_salary_range(self.salary_range)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'salary_min', 'salary_max'}
+
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if update_fields is None or 'required_skills' in update_fields:
+                sync_vacancy_skills(self)
+
+
+class VacancySkill(models.Model):
+    """
+    One row per (vacancy, skill) of Vacancy.required_skills, rewritten on
+    every vacancy save, so skill filters and counts are indexed queries
+    instead of scans of the JSON column (see facets.py).
+    """
+    vacancy = models.ForeignKey(
+        Vacancy,
+        on_delete=models.CASCADE,
+        related_name='skill_entries'
+    )
+    skill = models.CharField(max_length=100)  # normalized: case- and accent-folded
+    name = models.CharField(max_length=100)   # as first written in required_skills
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['vacancy', 'skill'], name='unique_skill_per_vacancy'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'vacancy']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - vacancy {self.vacancy_id}"
+
 
 class Application(models.Model):
     STATUS_CHOICES = (
@@ -60,6 +116,13 @@ class Application(models.Model):
         ('no_visit', "Don't Need to Visit (0-25)"),
     )
 
+    SCORING_STATE_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
     vacancy = models.ForeignKey(
         Vacancy,
         on_delete=models.CASCADE,
@@ -86,7 +149,24 @@ class Application(models.Model):
     )
     
     ml_result = models.JSONField(null=True, blank=True)
-    
+
+    # Score breakdown copied out of ml_result so ranking / filtering by
+    # component happens in the database (see ml_scoring.score_components)
+    skill_match_pct = models.FloatField(default=0.0)
+    semantic_similarity = models.FloatField(default=0.0)
+    education_match = models.BooleanField(default=False)
+    experience_years = models.FloatField(default=0.0)
+    experience_score = models.FloatField(default=0.0)
+    keyword_match_pct = models.FloatField(default=0.0)
+    job_title_match = models.BooleanField(default=False)
+
+    # Background scoring lifecycle (see vacancies/scoring_queue.py)
+    scoring_state = models.CharField(
+        max_length=16,
+        choices=SCORING_STATE_CHOICES,
+        default='pending'
+    )
+
     # Self-test field
     is_self_test = models.BooleanField(default=False)
     self_test_number = models.IntegerField(null=True, blank=True)
@@ -104,8 +184,92 @@ class Application(models.Model):
                 name='unique_application_per_candidate'
             )
         ]
+        indexes = [
+            models.Index(fields=['vacancy', 'final_score']),
+            models.Index(fields=['vacancy', 'category']),
+            models.Index(fields=['vacancy', 'skill_match_pct']),
+        ]
 
     def __str__(self):
         if self.is_self_test:
             return f"Self Test #{self.self_test_number} - {self.vacancy.title}"
         return f"{self.candidate.name} - {self.vacancy.title}"
+
+
+class ScoringJob(models.Model):
+    """
+    DB-backed queue entry for scoring an application in the background.
+    Jobs are claimed and executed by `manage.py run_scoring_worker`.
+    """
+    STATE_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    KIND_CHOICES = (
+        ('score', 'Score'),
+        ('fit_summary', 'AI fit summary'),
+    )
+
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name='scoring_jobs'
+    )
+
+    kind = models.CharField(
+        max_length=16,
+        choices=KIND_CHOICES,
+        default='score'
+    )
+    # 'score' jobs only: score components to recompute from the stored result
+    # after a vacancy edit (see ml_scoring.COMPONENT_SOURCE_FIELDS); empty = full score
+    components = models.JSONField(default=list, blank=True)
+
+    state = models.CharField(
+        max_length=16,
+        choices=STATE_CHOICES,
+        default='queued'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['state', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"ScoringJob #{self.id} {self.kind} ({self.state}) - application {self.application_id}"
+
+
+class ScoreAuditRecord(models.Model):
+    """
+    Scorer result of one scoring run, written by the 'db' score audit sink
+    (see vacancies/score_audit.py). Ids are plain integers so the trail
+    outlives deleted applications.
+    """
+    application_id = models.IntegerField(db_index=True)
+    vacancy_id = models.IntegerField(db_index=True)
+    candidate_id = models.IntegerField()
+    resume_path = models.CharField(max_length=1024, blank=True)
+    final_score = models.FloatField()
+    scorer_result = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Score audit #{self.id} - application {self.application_id} ({self.final_score})"
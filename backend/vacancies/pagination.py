@@ -0,0 +1,133 @@
+# backend/vacancies/pagination.py
+"""
+Keyset ("cursor") pagination for the vacancy and application lists.
+
+A page is read as `WHERE (column, id) after <last row of the previous page>
+ORDER BY column, id LIMIT n`, so the 500th page costs what the first does
+and rows added meanwhile don't shift later pages. Unlike DRF's
+CursorPagination, ties on the ordering column are resolved by id rather
+than an OFFSET, which DRF caps at 1000 rows: lists ordered by score have
+thousands of unscored applications tied at 0.
+
+Pagination is opt-in while clients move over: requests without ?cursor=
+or ?page_size= still get the whole list as a plain array. With either,
+responses look like {"next": <url or null>, "results": [...]}, where the
+cursor is an opaque token of the ordering and the last row's (column
+value, id).
+"""
+
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Views set the order with a `cursor_ordering()` method returning
+    (column,) or (column, 'id' / '-id'); the last entry must be unique.
+    Newest first (-id) otherwise.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request) -> bool:
+        """Lists stay plain arrays unless the client asks for pages."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_ordering(self, view):
+        if hasattr(view, 'cursor_ordering'):
+            return tuple(view.cursor_ordering())
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(1, size), self.max_page_size)
+
+    def encode_cursor(self, ordering, values) -> str:
+        text = json.dumps({'ordering': list(ordering), 'values': values}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token, ordering, model) -> list:
+        """
+        Row values of a cursor made for `ordering`, converted to the model
+        fields' Python types. Tampered cursors, and cursors from a request
+        with another ordering, are NotFound.
+        """
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if cursor['ordering'] != list(ordering) or len(cursor['values']) != len(ordering):
+                raise ValueError(cursor)
+            values = []
+            for field, value in zip(ordering, cursor['values']):
+                if value is None:
+                    raise ValueError(field)
+                values.append(model._meta.get_field(field.lstrip('-')).to_python(value))
+            return values
+        except (TypeError, ValueError, KeyError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, ordering, values) -> Q:
+        """Rows after `values` in `ordering`, earlier columns first."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        self.request = request
+        self.ordering = ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*ordering)
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            queryset = queryset.filter(self._after(ordering, self.decode_cursor(token, ordering, queryset.model)))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        values = [getattr(self.last, field.lstrip('-')) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.ordering, values))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
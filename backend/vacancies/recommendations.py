@@ -0,0 +1,210 @@
+# backend/vacancies/recommendations.py
+"""
+"Recommended jobs" for candidates: the candidate's cached resume features
+ranked against every open vacancy through one in-memory `VacancyIndex`.
+
+The index lives per process and is synced on every request against the open
+vacancies' `updated_at`, so created, edited and closed vacancies are picked up
+without rebuilding the rows that did not change.
+
+The other direction, "matching candidates" for an organization's vacancy,
+ranks the whole candidate pool through the memory-mapped
+`CandidateFeatureStore` built by `manage.py build_candidate_store`. Run
+from cron with `--if-stale`, the command only rebuilds when there is no
+store, when it was built from other master dictionaries or TF-IDF
+artifact (its fingerprint), or when candidates saved a new resume since a
+build at least `MIN_REBUILD_AGE` seconds old. A build re-reads every resume, so it never
+runs in a request or the scoring worker:
+
+    CANDIDATE_FEATURE_STORE = {
+        'DIR': BASE_DIR / 'var' / 'candidate_features',
+        'MIN_REBUILD_AGE': 3600,   # seconds
+    }
+"""
+
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import Candidate
+from vacancies.models import Vacancy
+from vacancies.ml.candidate_store import CandidateFeatureStore, CandidateStoreBuilder
+from vacancies.ml.scorer import (
+    _datasets_fingerprint,
+    get_resume_features,
+    get_resume_features_batch,
+    load_master_dictionaries,
+)
+from vacancies.ml.vacancy_index import VacancyIndex
+from vacancies.ml_scoring import build_jd, get_compiled_jd, resolve_resume_path
+
+
+_index = VacancyIndex()
+_sync_lock = threading.Lock()
+
+
+def _load_jds(ids: list) -> dict:
+    return {vacancy.id: build_jd(vacancy) for vacancy in Vacancy.objects.filter(id__in=ids)}
+
+
+def get_vacancy_index() -> VacancyIndex:
+    """The process-wide index of open vacancies, brought up to date."""
+    versions = dict(Vacancy.objects.filter(status='open').values_list('id', 'updated_at'))
+    with _sync_lock:
+        _index.sync(versions, _load_jds)
+    return _index
+
+
+def recommend_vacancies(candidate, limit: int = 20) -> list:
+    """
+    Best matching open vacancies for `candidate`, best first, skipping the
+    ones already applied to. Each entry holds `vacancy_id`, `final_score`
+    and the score components. Empty when the candidate has no resume.
+    """
+    resume_path = resolve_resume_path(candidate)
+    if resume_path is None:
+        return []
+
+    features = get_resume_features(resume_path)
+    applied = set(candidate.applications.values_list('vacancy_id', flat=True))
+    return get_vacancy_index().rank(features, limit=limit, exclude=applied)
+
+
+# ---------- matching candidates ----------
+
+DEFAULT_MIN_REBUILD_AGE = 3600
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _store_options() -> dict:
+    return getattr(settings, "CANDIDATE_FEATURE_STORE", {}) or {}
+
+
+def candidate_store_dir() -> Path:
+    return Path(_store_options().get("DIR") or Path(settings.BASE_DIR) / "var" / "candidate_features")
+
+
+def candidate_store_min_age() -> timedelta:
+    """How long a store is kept before `--if-stale` rebuilds it for new resumes."""
+    return timedelta(seconds=_store_options().get("MIN_REBUILD_AGE", DEFAULT_MIN_REBUILD_AGE))
+
+
+def _candidates_with_resume():
+    return Candidate.objects.exclude(resume='').exclude(resume__isnull=True)
+
+
+def _store_vocabulary() -> set:
+    """Every term a vacancy can be scored on: the master dictionaries plus all vacancy terms."""
+    skills, titles, degrees = load_master_dictionaries()
+    terms = set(skills) | set(titles) | set(degrees)
+    for vacancy in Vacancy.objects.all().iterator():
+        jd = build_jd(vacancy)
+        for field in ('required_skills', 'education_required', 'keywords', 'job_title_aliases'):
+            terms.update(map(str.lower, jd.get(field, ())))
+    terms.discard('')
+    return terms
+
+
+def build_candidate_store(output=None, batch_size: int = 200, progress=None) -> tuple:
+    """
+    Write the store of every candidate with a resume to `output` (the
+    configured DIR by default), loading resumes `batch_size` at a time;
+    `progress(done, total)` is called after each batch.
+    Returns (candidates written, [(candidate id, error) of skipped ones]).
+    """
+    # Candidates saved from here on are reported as unindexed
+    built_at = timezone.now()
+    builder = CandidateStoreBuilder(_store_vocabulary())
+
+    candidates = []
+    for candidate in _candidates_with_resume().iterator():
+        path = resolve_resume_path(candidate)
+        if path is not None:
+            candidates.append((candidate.id, path))
+
+    skipped = []
+    for start in range(0, len(candidates), batch_size):
+        chunk = candidates[start:start + batch_size]
+        features = get_resume_features_batch([path for _, path in chunk])
+        for (candidate_id, path), entry in zip(chunk, features):
+            if isinstance(entry, Exception):
+                skipped.append((candidate_id, entry))
+                continue
+            builder.add(candidate_id, entry)
+        if progress is not None:
+            progress(min(start + batch_size, len(candidates)), len(candidates))
+
+    builder.write(output or candidate_store_dir(), _datasets_fingerprint(), built_at=built_at.isoformat())
+    return len(builder), skipped
+
+
+def _outdated(store) -> bool:
+    # Built against other dictionaries: its term columns don't match CompiledJD's
+    return store.fingerprint != _datasets_fingerprint()
+
+
+def get_candidate_store():
+    """
+    The process-wide CandidateFeatureStore, reopened when it was rebuilt.
+    None when no store has been built yet, or only an outdated one.
+    """
+    global _store
+
+    meta_path = candidate_store_dir() / "meta.json"
+    try:
+        version = meta_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    with _store_lock:
+        if _store is None or _store[0] != version:
+            _store = (version, CandidateFeatureStore(meta_path.parent))
+        store = _store[1]
+    return None if _outdated(store) else store
+
+
+def unindexed_candidates(built_at) -> int:
+    """Candidates who saved a new resume after a store build started at `built_at`."""
+    return _candidates_with_resume().filter(resume_updated_at__gt=built_at).count()
+
+
+def rebuild_stale_candidate_store(min_age: timedelta, output=None, **options):
+    """
+    Rebuild the store in `output` (the configured DIR by default) when there
+    is none, when it is outdated, or when it is at least `min_age` old and
+    candidates saved a new resume since. Returns what `build_candidate_store` does, or None when
+    the store was left as it is.
+    """
+    directory = Path(output or candidate_store_dir())
+    if (directory / "meta.json").exists():
+        store = CandidateFeatureStore(directory)
+        built_at = parse_datetime(store.built_at)
+        if not _outdated(store) and (timezone.now() - built_at < min_age or not unindexed_candidates(built_at)):
+            return None
+    return build_candidate_store(directory, **options)
+
+
+def find_matching_candidates(vacancy, limit: int = 20):
+    """
+    Best matching candidates for `vacancy` across every candidate with a
+    resume, best first, skipping the ones who already applied. Each entry
+    holds `candidate_id`, `final_score` and the score components.
+    Returns (matches, terms the store has not indexed yet, when the store
+    was built, new resumes since), or None when no store was built for the
+    current dictionaries.
+    """
+    store = get_candidate_store()
+    if store is None:
+        return None
+
+    jd = get_compiled_jd(vacancy)
+    applied = set(vacancy.applications.values_list('candidate_id', flat=True))
+    matches = store.top_k(jd, k=limit, exclude=applied, master_titles=load_master_dictionaries()[1])
+    built_at = parse_datetime(store.built_at)
+    return matches, store.missing_terms(jd), built_at, unindexed_candidates(built_at)
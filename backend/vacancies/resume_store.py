@@ -0,0 +1,254 @@
+# backend/vacancies/resume_store.py
+"""
+Content-addressed storage behind the `sorted_resumes/` view.
+
+Each distinct resume file is stored once, as `resume_blobs/<aa>/<sha256>.pdf`
+under MEDIA_ROOT. The files organizations browse,
+
+    sorted_resumes/organization_<org>/vacancy_<vacancy>/<category>/
+        application_<application>_candidate_<candidate>_<filename>
+
+are hardlinks to those blobs (plain copies where the filesystem can't link),
+so a candidate applying to 30 vacancies costs one copy of their PDF.
+
+Every sorted path is derived from the application, so the expected tree can
+be recomputed from the database: a re-rank moves its vacancy's entries to
+their new categories (`refile_vacancy`), and `manage.py
+reconcile_sorted_resumes` fixes the whole tree, removing orphans and turning
+old full copies into links.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+
+from vacancies.ml.tfidf_artifact import file_checksum
+
+
+SORTED_DIR = "sorted_resumes"
+BLOB_DIR = "resume_blobs"
+CATEGORIES = ("highly_preferred", "mid_preference", "low_preference", "no_visit")
+
+# Content hashes per (path, size, mtime), so re-scoring doesn't re-read the PDF
+CHECKSUM_CACHE_SIZE = 1024
+_checksums = OrderedDict()
+_checksums_lock = threading.Lock()
+
+
+def media_path(*parts) -> Path:
+    return Path(settings.MEDIA_ROOT).joinpath(*parts)
+
+
+def resume_checksum(path) -> str:
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _checksums_lock:
+        checksum = _checksums.get(key)
+        if checksum is not None:
+            _checksums.move_to_end(key)
+            return checksum
+
+    checksum = file_checksum(Path(path))
+
+    with _checksums_lock:
+        _checksums[key] = checksum
+        while len(_checksums) > CHECKSUM_CACHE_SIZE:
+            _checksums.popitem(last=False)
+    return checksum
+
+
+def blob_path(checksum: str) -> Path:
+    return media_path(BLOB_DIR, checksum[:2], f"{checksum}.pdf")
+
+
+def store_blob(resume_path) -> Path:
+    """Blob holding the content of `resume_path`, copied in on first sight."""
+    blob = blob_path(resume_checksum(resume_path))
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copy2(resume_path, tmp_path)
+            os.replace(tmp_path, blob)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return blob
+
+
+def sorted_dir(organization_id, vacancy_id, category) -> Path:
+    return media_path(SORTED_DIR, f"organization_{organization_id}", f"vacancy_{vacancy_id}", category)
+
+
+def sorted_filename(application_id, candidate_id, resume_path) -> str:
+    return f"application_{application_id}_candidate_{candidate_id}_{os.path.basename(resume_path)}"
+
+
+def link_blob(blob: Path, dest: Path) -> None:
+    """Make `dest` a hardlink to `blob` (a copy if linking fails), replacing it atomically."""
+    if dest.exists() and os.path.samefile(blob, dest):
+        return
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f".tmp-{os.getpid()}-{threading.get_ident()}-{dest.name}")
+    try:
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            # Cross-device media dirs or filesystems without hardlinks
+            shutil.copy2(blob, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def file_sorted_resume(organization_id, vacancy_id, application_id, candidate_id, resume_path, category) -> Path:
+    """
+    Link the resume into its category folder of the vacancy and drop the
+    application's entry from the other categories.
+    """
+    filename = sorted_filename(application_id, candidate_id, resume_path)
+    dest = sorted_dir(organization_id, vacancy_id, category) / filename
+    link_blob(store_blob(resume_path), dest)
+
+    for other in CATEGORIES:
+        if other != category:
+            (sorted_dir(organization_id, vacancy_id, other) / filename).unlink(missing_ok=True)
+    return dest
+
+
+# ---------- reconciliation ----------
+
+def _application_id(filename: str):
+    # application_<id>_candidate_<id>_<name>
+    parts = filename.split("_", 2)
+    if len(parts) < 3 or parts[0] != "application" or not parts[1].isdigit():
+        return None
+    return int(parts[1])
+
+
+def expected_entries(applications) -> dict:
+    """{sorted path: resume path} for scored applications whose resume file exists."""
+    expected = {}
+    for application in applications:
+        resume = application.candidate.resume
+        if not resume:
+            continue
+        resume_path = media_path(resume.name)
+        if not resume_path.is_file():
+            continue
+        dest = sorted_dir(application.vacancy.organization_id, application.vacancy_id, application.category) \
+            / sorted_filename(application.id, application.candidate_id, resume_path)
+        expected[dest] = resume_path
+    return expected
+
+
+def reconcile(applications, dry_run: bool = False) -> dict:
+    """
+    Bring `sorted_resumes/` and the blob store in line with `applications`
+    (every scored application). Returns counts of what was (or, with
+    `dry_run`, would be) changed.
+    """
+    counts = {"linked": 0, "relinked": 0, "removed": 0, "blobs_removed": 0}
+    expected = expected_entries(applications)
+
+    # --- entries that shouldn't be there: orphans and old categories
+    sorted_root = media_path(SORTED_DIR)
+    if sorted_root.is_dir():
+        for root, _, files in os.walk(sorted_root):
+            for name in files:
+                path = Path(root) / name
+                if path in expected:
+                    continue
+                if _application_id(name) is None:
+                    # Not an entry (e.g. a link being written right now)
+                    continue
+                counts["removed"] += 1
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+
+    # --- missing entries and full copies that should be links
+    used_blobs = set()
+    for dest, resume_path in expected.items():
+        blob = blob_path(resume_checksum(resume_path))
+        used_blobs.add(blob)
+        if dest.exists():
+            if blob.exists() and os.path.samefile(blob, dest):
+                continue
+            counts["relinked"] += 1
+        else:
+            counts["linked"] += 1
+        if not dry_run:
+            link_blob(store_blob(resume_path), dest)
+
+    # --- blobs no entry points to any more
+    blob_root = media_path(BLOB_DIR)
+    if blob_root.is_dir():
+        for blob in blob_root.glob("*/*.pdf"):
+            if blob in used_blobs:
+                continue
+            counts["blobs_removed"] += 1
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+
+    if not dry_run and sorted_root.is_dir():
+        # Category / vacancy folders left empty
+        for root, _, _ in os.walk(sorted_root, topdown=False):
+            if root != str(sorted_root) and not os.listdir(root):
+                os.rmdir(root)
+
+    return counts
+
+
+def refile_vacancy(organization_id, vacancy_id, entries) -> int:
+    """
+    Move the sorted entries of one vacancy into the category folders of
+    `entries`, (application id, candidate id, category, resume name) of its
+    scored applications, as a re-rank leaves them. Entries are renamed, so
+    no resume is read; missing entries, orphans and full copies are left to
+    `reconcile`. Returns the number of entries moved.
+    """
+    vacancy_root = media_path(SORTED_DIR, f"organization_{organization_id}", f"vacancy_{vacancy_id}")
+    if not vacancy_root.is_dir():
+        return 0
+
+    filed = {}  # filename -> entries of it in any category folder
+    for category in CATEGORIES:
+        folder = vacancy_root / category
+        if folder.is_dir():
+            for name in os.listdir(folder):
+                if _application_id(name) is not None:
+                    filed.setdefault(name, []).append(folder / name)
+
+    moved = 0
+    for application_id, candidate_id, category, resume_name in entries:
+        if not resume_name or category not in CATEGORIES:
+            continue
+        paths = filed.pop(sorted_filename(application_id, candidate_id, resume_name), None)
+        if not paths:
+            continue
+        dest = vacancy_root / category / paths[0].name
+        try:
+            if dest not in paths:
+                dest.parent.mkdir(exist_ok=True)
+                os.replace(paths[0], dest)
+                moved += 1
+            for path in paths:
+                if path != dest and path.exists():
+                    path.unlink()
+        except OSError:
+            # Left for `reconcile`, like failed filing while scoring
+            continue
+
+    for category in CATEGORIES:
+        folder = vacancy_root / category
+        if folder.is_dir() and not os.listdir(folder):
+            folder.rmdir()
+    return moved
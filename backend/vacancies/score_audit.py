@@ -0,0 +1,245 @@
+# backend/vacancies/score_audit.py
+"""
+Audit trail of scorer results, written off the request path.
+
+`record_score` only puts the record on an in-memory queue; a background
+flusher thread writes queued records in batches to the configured sink:
+
+    - 'jsonl': an append-only JSON-lines file, rotated by size
+    - 'db':    ScoreAuditRecord rows, bulk-inserted
+    - None:    auditing off
+
+Configured through the `SCORE_AUDIT` Django setting:
+
+    SCORE_AUDIT = {
+        'BACKEND': 'jsonl',                                    # 'jsonl', 'db' or None
+        'PATH': BASE_DIR / 'var' / 'score_audit' / 'scores.jsonl',
+        'MAX_BYTES': 64 * 1024 * 1024,                         # rotate past this size
+        'BACKUP_COUNT': 5,                                     # rotated files kept
+        'BATCH_SIZE': 200,                                     # records per write
+        'FLUSH_INTERVAL': 2.0,                                 # max seconds a record waits
+        'MAX_QUEUE': 10000,                                    # records dropped beyond this
+    }
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_QUEUE = 10000
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    return str(obj)
+
+
+class JsonLinesSink:
+    """Appends records to `path`, one JSON object per line, rotating like RotatingFileHandler."""
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def _rotate(self) -> None:
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+    def write(self, records: list) -> None:
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, default=_json_default) + "\n" for record in records
+        ).encode("utf-8")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and self.max_bytes and size + len(data) > self.max_bytes:
+            self._rotate()
+
+        with open(self.path, "ab") as fh:
+            fh.write(data)
+
+
+class DatabaseSink:
+    """Bulk-inserts records as ScoreAuditRecord rows."""
+
+    def write(self, records: list) -> None:
+        from django.db import close_old_connections
+        from vacancies.models import ScoreAuditRecord
+
+        # Round-trip through JSON so sets and other scorer types are storable
+        rows = [
+            ScoreAuditRecord(
+                application_id=record["application_id"],
+                vacancy_id=record["vacancy_id"],
+                candidate_id=record["candidate_id"],
+                resume_path=record["resume_path"],
+                final_score=record["final_score"],
+                scorer_result=json.loads(json.dumps(record["scorer_result"], default=_json_default)),
+                created_at=record["created_at"],
+            )
+            for record in records
+        ]
+        try:
+            ScoreAuditRecord.objects.bulk_create(rows)
+        finally:
+            # This runs on the flusher thread, which owns its own connection
+            close_old_connections()
+
+
+class ScoreAuditLog:
+    """
+    Queue of audit records drained to `sink` by a background thread, every
+    `flush_interval` seconds or as soon as `batch_size` records are waiting.
+    """
+
+    def __init__(
+        self,
+        sink,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="score-audit-flusher", daemon=True)
+                self._thread.start()
+
+    def record(self, record: dict) -> None:
+        """Queue `record`; never blocks. Records are dropped (and counted) when the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self._ensure_thread()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued so far, in batches, from the calling thread."""
+        # Holding the lock while draining means a flush at exit also waits
+        # for a batch the background thread is still writing
+        with self._write_lock:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    self.sink.write(batch)
+                except Exception:
+                    # Auditing must never take scoring down with it
+                    logger.exception("Failed to write %d score audit record(s)", len(batch))
+
+
+# ---------- process-wide instance ----------
+
+_audit_log = None
+_audit_lock = threading.Lock()
+
+
+def _build_audit_log():
+    options = getattr(settings, "SCORE_AUDIT", {}) or {}
+    backend = options.get("BACKEND")
+
+    if backend == "jsonl":
+        path = options.get("PATH") or Path(settings.BASE_DIR) / "var" / "score_audit" / "scores.jsonl"
+        sink = JsonLinesSink(
+            path,
+            max_bytes=options.get("MAX_BYTES", DEFAULT_MAX_BYTES),
+            backup_count=options.get("BACKUP_COUNT", DEFAULT_BACKUP_COUNT),
+        )
+    elif backend == "db":
+        sink = DatabaseSink()
+    elif not backend:
+        return None
+    else:
+        raise ValueError(f"Unknown SCORE_AUDIT backend: {backend!r}")
+
+    return ScoreAuditLog(
+        sink,
+        batch_size=options.get("BATCH_SIZE", DEFAULT_BATCH_SIZE),
+        flush_interval=options.get("FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL),
+        max_queue=options.get("MAX_QUEUE", DEFAULT_MAX_QUEUE),
+    )
+
+
+def get_score_audit_log():
+    """The configured ScoreAuditLog, or None when auditing is off."""
+    global _audit_log
+    if _audit_log is None:
+        with _audit_lock:
+            if _audit_log is None:
+                _audit_log = _build_audit_log() or False
+                if _audit_log:
+                    atexit.register(_audit_log.flush)
+    return _audit_log or None
+
+
+def record_score(candidate, vacancy, application, resume_path, result: dict) -> None:
+    """Queue the scorer result of `application` for the audit sink."""
+    audit_log = get_score_audit_log()
+    if audit_log is None:
+        return
+
+    audit_log.record({
+        "created_at": timezone.now(),
+        "application_id": application.id,
+        "vacancy_id": vacancy.id,
+        "candidate_id": candidate.id,
+        "resume_path": resume_path,
+        "final_score": float(result.get("final_score", 0.0)),
+        # Shallow copy: the caller may keep building on its result dict
+        "scorer_result": dict(result),
+    })
@@ -0,0 +1,271 @@
+# backend/vacancies/scoring_queue.py
+"""
+DB-backed background queue for ML scoring.
+
+The request path only records a `ScoringJob`; the heavy pipeline runs in
+`manage.py run_scoring_worker`. Jobs come in two kinds:
+
+    - 'score':       PDF parsing, matching and TF-IDF; stores the score. After
+                     a vacancy edit the job lists the score `components` to
+                     recompute from cached resume features instead
+    - 'fit_summary': the LLM recruiter summary, queued once a score is stored
+                     so LLM latency never holds up scoring
+"""
+
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from vacancies.models import Application, ScoringJob, Vacancy
+from vacancies.ml.fit_summary import get_fit_summary_service
+from vacancies.ml_scoring import (
+    build_jd,
+    rescore_applications_batch,
+    score_applications_batch,
+    store_fit_summary,
+)
+
+
+# Seconds to wait before retrying a failed job: RETRY_BACKOFF * 2 ** (attempt - 1)
+RETRY_BACKOFF = 10
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_scoring(application: Application) -> ScoringJob:
+    """
+    Queue `application` for scoring. Re-uses an already queued job so
+    repeated requests don't pile up duplicate work.
+    """
+    with transaction.atomic():
+        job = ScoringJob.objects.filter(application=application, kind='score', state='queued').first()
+        if job is None:
+            job = ScoringJob.objects.create(application=application)
+        elif job.components:
+            # A partial re-score is superseded by a full one
+            job.components = []
+            job.save(update_fields=['components', 'updated_at'])
+
+        if application.scoring_state != 'pending':
+            application.scoring_state = 'pending'
+            application.save(update_fields=['scoring_state'])
+
+    return job
+
+
+def enqueue_vacancy_rescore(vacancy: Vacancy, components=None) -> int:
+    """
+    Queue every (non self-test) application of `vacancy` for re-scoring.
+    With `components`, only those score components are recomputed (see
+    ml_scoring.rescore_applications_batch); None means a full re-score.
+    The worker scores jobs of the same vacancy together in one batch.
+    """
+    components = sorted(components) if components else []
+
+    with transaction.atomic():
+        applications = Application.objects.filter(vacancy=vacancy, is_self_test=False)
+        queued = {
+            job.application_id: job
+            for job in ScoringJob.objects.filter(application__vacancy=vacancy, kind='score', state='queued')
+        }
+
+        # Widen jobs that are still waiting instead of queueing duplicates
+        widened = []
+        for job in queued.values():
+            if not job.components:
+                continue
+            merged = sorted(set(job.components) | set(components)) if components else []
+            if merged != job.components:
+                job.components = merged
+                widened.append(job)
+        ScoringJob.objects.bulk_update(widened, ['components'])
+
+        app_ids = [pk for pk in applications.values_list('id', flat=True) if pk not in queued]
+        ScoringJob.objects.bulk_create([ScoringJob(application_id=pk, components=components) for pk in app_ids])
+        applications.update(scoring_state='pending')
+
+    return len(app_ids)
+
+
+def enqueue_fit_summaries(application_ids: list) -> int:
+    """Queue AI fit summaries for freshly scored applications."""
+    already_queued = set(
+        ScoringJob.objects.filter(application_id__in=application_ids, kind='fit_summary', state='queued')
+        .values_list('application_id', flat=True)
+    )
+    jobs = [
+        ScoringJob(application_id=pk, kind='fit_summary')
+        for pk in dict.fromkeys(application_ids)
+        if pk not in already_queued
+    ]
+    ScoringJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def requeue_stale_jobs(stale_after: timedelta) -> int:
+    """Return jobs whose worker died mid-run back to the queue."""
+    cutoff = timezone.now() - stale_after
+    return ScoringJob.objects.filter(
+        state='running',
+        locked_at__lt=cutoff,
+    ).update(state='queued', locked_by='', locked_at=None)
+
+
+def claim_jobs(worker_id: str, limit: int = 1) -> list:
+    """
+    Claim up to `limit` runnable jobs for `worker_id`.
+
+    Each job is claimed with a conditional UPDATE, so two workers racing for
+    the same row can never both win it (works on SQLite and PostgreSQL).
+    """
+    now = timezone.now()
+    candidate_ids = list(
+        ScoringJob.objects.filter(state='queued', run_after__lte=now)
+        .order_by('id')
+        .values_list('id', flat=True)[:limit]
+    )
+
+    claimed = []
+    for job_id in candidate_ids:
+        won = ScoringJob.objects.filter(pk=job_id, state='queued').update(
+            state='running',
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if won:
+            claimed.append(job_id)
+
+    return list(
+        ScoringJob.objects.filter(id__in=claimed)
+        .select_related('application__candidate', 'application__vacancy')
+        .order_by('id')
+    )
+
+
+def run_jobs(jobs: list) -> tuple:
+    """
+    Run claimed `jobs`: score jobs are batched per vacancy, summary jobs run
+    concurrently through the fit summary service. Returns (succeeded, failed).
+    """
+    score_jobs = [job for job in jobs if job.kind == 'score']
+    summary_jobs = [job for job in jobs if job.kind == 'fit_summary']
+
+    succeeded, failed = _run_score_jobs(score_jobs)
+    summarized = _run_summary_jobs(summary_jobs)
+    return succeeded + summarized, failed + len(summary_jobs) - summarized
+
+
+def _run_score_jobs(jobs: list) -> tuple:
+    # One batch per vacancy and set of components to recompute
+    by_vacancy = {}
+    for job in jobs:
+        key = (job.application.vacancy_id, tuple(sorted(job.components or ())))
+        by_vacancy.setdefault(key, []).append(job)
+
+    succeeded = failed = 0
+    scored_ids = []
+    for (_, components), vacancy_jobs in by_vacancy.items():
+        applications = [job.application for job in vacancy_jobs]
+        Application.objects.filter(id__in=[a.id for a in applications]).update(scoring_state='running')
+
+        try:
+            if components:
+                outcomes = rescore_applications_batch(applications[0].vacancy, applications, components)
+            else:
+                outcomes = score_applications_batch(applications[0].vacancy, applications)
+        except Exception as e:
+            outcomes = [e] * len(applications)
+
+        for job, application, outcome in zip(vacancy_jobs, applications, outcomes):
+            if isinstance(outcome, Exception):
+                _fail_job(job, application, outcome)
+                failed += 1
+                continue
+
+            final_score, category = outcome
+            application.final_score = final_score
+            application.category = category
+            application.scoring_state = 'done'
+            application.save(update_fields=['final_score', 'category', 'scoring_state'])
+
+            job.state = 'done'
+            job.last_error = ''
+            job.save(update_fields=['state', 'last_error', 'updated_at'])
+            succeeded += 1
+            if application.ml_result:
+                scored_ids.append(application.id)
+
+    if scored_ids:
+        enqueue_fit_summaries(scored_ids)
+
+    return succeeded, failed
+
+
+def _run_summary_jobs(jobs: list) -> int:
+    """
+    Generate AI fit summaries concurrently. The service never raises (it
+    falls back to the rule-based recommendation), so these jobs always
+    complete; DB writes stay on this thread.
+    """
+    service = get_fit_summary_service()
+
+    futures = []
+    for job in jobs:
+        application = job.application
+        # A score job in the same batch may just have replaced the result
+        application.refresh_from_db(fields=['ml_result'])
+        result = application.ml_result
+        if isinstance(result, dict) and 'final_score' in result:
+            futures.append((job, service.submit(result, build_jd(application.vacancy))))
+        else:
+            # Nothing scored to summarize
+            futures.append((job, None))
+
+    succeeded = 0
+    for job, future in futures:
+        try:
+            if future is not None:
+                store_fit_summary(job.application, future.result())
+        except Exception as e:
+            _fail_job(job, job.application, e)
+            continue
+
+        job.state = 'done'
+        job.last_error = ''
+        job.save(update_fields=['state', 'last_error', 'updated_at'])
+        succeeded += 1
+
+    return succeeded
+
+
+def _fail_job(job: ScoringJob, application: Application, error: Exception) -> None:
+    job.last_error = ''.join(traceback.format_exception(type(error), error, error.__traceback__))[-4000:]
+    job.locked_by = ''
+    job.locked_at = None
+
+    if job.attempts < job.max_attempts:
+        # Retry later with exponential backoff
+        job.state = 'queued'
+        job.run_after = timezone.now() + timedelta(seconds=RETRY_BACKOFF * 2 ** (job.attempts - 1))
+        application.scoring_state = 'pending'
+    else:
+        job.state = 'failed'
+        application.scoring_state = 'failed'
+
+    job.save(update_fields=['state', 'run_after', 'last_error', 'locked_by', 'locked_at', 'updated_at'])
+    if job.kind == 'score':
+        # A missing summary leaves the score itself valid
+        application.save(update_fields=['scoring_state'])
+
+
+def process_available_jobs(worker_id: str, limit: int = 10) -> tuple:
+    """Claim and run one batch of jobs. Returns (succeeded, failed)."""
+    return run_jobs(claim_jobs(worker_id, limit=limit))
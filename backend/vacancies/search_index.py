@@ -0,0 +1,308 @@
+# backend/vacancies/search_index.py
+"""
+Full-text index behind the global search (`/api/search/`).
+
+One SQLite FTS5 table per searchable model, keyed by the model's id
+(the FTS rowid):
+
+    search_vacancy       title, skills, keywords, experience_level, location, description
+    search_candidate     name, skills, job_preferences, availability, address, email
+    search_organization  name, location, description, contact_email
+
+JSON lists (required_skills, keywords, skills, job_preferences) are indexed
+as the text of their items. Rows are rewritten on post_save / post_delete of
+the model (see `connect_signals`); `manage.py rebuild_search_index` rebuilds
+everything from the tables.
+
+Queries match every word as a prefix ("pyth lond" finds "Python" in
+"London") and are ranked with BM25, weighting the columns as listed in
+`INDEXES`. Where FTS5 isn't available (another database, or an SQLite build
+without it) `search` returns None and callers fall back to LIKE filters.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    table: str
+    model: str                                   # app_label.ModelName
+    columns: tuple                               # ((field, bm25 weight), ...), best column first
+    visible: dict = field(default_factory=dict)  # field -> value rows must have to be returned
+
+
+INDEXES = {
+    'vacancies': SearchIndex(
+        table='search_vacancy',
+        model='vacancies.Vacancy',
+        columns=(
+            ('title', 10.0),
+            ('required_skills', 5.0),
+            ('keywords', 3.0),
+            ('experience_level', 2.0),
+            ('location', 2.0),
+            ('description', 1.0),
+        ),
+        visible={'is_public': True, 'status': 'open'},
+    ),
+    'candidates': SearchIndex(
+        table='search_candidate',
+        model='accounts.Candidate',
+        columns=(
+            ('name', 10.0),
+            ('skills', 5.0),
+            ('job_preferences', 3.0),
+            ('availability', 1.0),
+            ('address', 1.0),
+            ('email', 1.0),
+        ),
+    ),
+    'organizations': SearchIndex(
+        table='search_organization',
+        model='accounts.Organization',
+        columns=(
+            ('name', 10.0),
+            ('location', 2.0),
+            ('description', 1.0),
+            ('contact_email', 1.0),
+        ),
+    ),
+}
+
+
+def _index_for(model):
+    label = model._meta.label
+    for index in INDEXES.values():
+        if index.model == label:
+            return index
+    return None
+
+
+# ---------- documents ----------
+
+def _flatten(value):
+    """Text of a field value; JSON lists/dicts contribute the text of their items."""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [text for item in value.values() for text in _flatten(item)]
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in _flatten(item)]
+    return [str(value)]
+
+
+def document(index: SearchIndex, instance) -> list:
+    """Column values of `instance` in `index`, in column order."""
+    return [" ".join(_flatten(getattr(instance, name))) for name, _ in index.columns]
+
+
+# ---------- schema ----------
+
+_available = {}     # connection alias -> FTS5 compiled in
+_tables_ready = {}  # connection alias -> index tables created
+
+
+def fts5_available(connection) -> bool:
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            compiled = bool(cursor.fetchone()[0])
+        if not compiled:
+            # Loadable builds don't always report it; try the module itself
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+                    cursor.execute("DROP TABLE temp._fts5_probe")
+                compiled = True
+            except Exception:
+                compiled = False
+        _available[connection.alias] = compiled
+    return _available[connection.alias]
+
+
+def create_tables(connection) -> None:
+    with connection.cursor() as cursor:
+        for index in INDEXES.values():
+            columns = ", ".join(name for name, _ in index.columns)
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.table} USING fts5("
+                f"{columns}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+    _tables_ready[connection.alias] = True
+
+
+def drop_tables(connection) -> None:
+    with connection.cursor() as cursor:
+        for index in INDEXES.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {index.table}")
+    _tables_ready[connection.alias] = False
+
+
+def _tables_exist(connection) -> bool:
+    # Looked up once per process: the tables only come and go with the
+    # migration, which updates this through create_tables / drop_tables
+    if connection.alias not in _tables_ready:
+        if not fts5_available(connection):
+            _tables_ready[connection.alias] = False
+        else:
+            existing = set(connection.introspection.table_names())
+            _tables_ready[connection.alias] = all(index.table in existing for index in INDEXES.values())
+    return _tables_ready[connection.alias]
+
+
+# ---------- writes ----------
+
+def _insert_sql(index: SearchIndex) -> str:
+    columns = ", ".join(name for name, _ in index.columns)
+    placeholders = ", ".join(["%s"] * (len(index.columns) + 1))
+    return f"INSERT INTO {index.table} (rowid, {columns}) VALUES ({placeholders})"
+
+
+def index_instance(instance, using: str = DEFAULT_DB_ALIAS) -> None:
+    index = _index_for(type(instance))
+    connection = connections[using]
+    if index is None or not _tables_exist(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {index.table} WHERE rowid = %s", [instance.pk])
+        cursor.execute(_insert_sql(index), [instance.pk, *document(index, instance)])
+
+
+def remove_instance(instance, using: str = DEFAULT_DB_ALIAS) -> None:
+    index = _index_for(type(instance))
+    connection = connections[using]
+    if index is None or not _tables_exist(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {index.table} WHERE rowid = %s", [instance.pk])
+
+
+def rebuild(connection, app_registry=apps, batch_size: int = 1000) -> dict:
+    """
+    Refill every index from its model's table, in one transaction.
+    `app_registry` lets migrations pass their historical models.
+    Returns {kind: rows indexed}.
+    """
+    counts = {}
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for kind, index in INDEXES.items():
+            model = app_registry.get_model(index.model)
+            fields = ["pk", *(name for name, _ in index.columns)]
+            cursor.execute(f"DELETE FROM {index.table}")
+            count, batch = 0, []
+            rows = model._base_manager.using(connection.alias).values_list(*fields).iterator(chunk_size=batch_size)
+            for pk, *values in rows:
+                batch.append([pk, *(" ".join(_flatten(value)) for value in values)])
+                if len(batch) >= batch_size:
+                    cursor.executemany(_insert_sql(index), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(_insert_sql(index), batch)
+                count += len(batch)
+            counts[kind] = count
+    return counts
+
+
+# ---------- signals ----------
+
+def _on_save(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance, using=using)
+
+
+def _on_delete(sender, instance, using, **kwargs):
+    remove_instance(instance, using=using)
+
+
+def connect_signals() -> None:
+    from django.db.models.signals import post_delete, post_save
+
+    for index in INDEXES.values():
+        model = apps.get_model(index.model)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'search_index_save_{index.table}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'search_index_delete_{index.table}')
+
+
+# ---------- queries ----------
+
+def match_expression(query: str, expansions: dict = None):
+    """
+    FTS5 MATCH expression requiring every word of `query` as a prefix, or
+    None. Single characters ("c" of "c++") must match a whole token instead,
+    or they would match nearly every row. `expansions` maps lowercased query
+    words to alternatives that may match in their place (see fuzzy_terms).
+    """
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    expansions = expansions or {}
+    terms = []
+    for word in words:
+        # Words only contain \w characters, so quoting them is enough escaping
+        term = f'"{word}"*' if len(word) > 1 else f'"{word}"'
+        alternatives = expansions.get(word.lower())
+        if alternatives:
+            term = "(" + " OR ".join([term, *(f'"{alt}"' for alt in alternatives)]) + ")"
+        terms.append(term)
+    return " AND ".join(terms)
+
+
+def search(kind: str, query: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+           using: str = DEFAULT_DB_ALIAS, expansions: dict = None):
+    """
+    ([instances ranked best first], total matches) of `kind` ('vacancies',
+    'candidates' or 'organizations') for `query`, restricted to the index's
+    visibility filter. None when the index isn't available.
+    """
+    connection = connections[using]
+    if not _tables_exist(connection):
+        return None
+
+    index = INDEXES[kind]
+    expression = match_expression(query, expansions)
+    if expression is None:
+        return [], 0
+
+    model = apps.get_model(index.model)
+    base_table = connection.ops.quote_name(model._meta.db_table)
+    # Visibility filters need the model's table; otherwise the index alone answers
+    conditions = [f"{index.table} MATCH %s"]
+    params = [expression]
+    for name, value in index.visible.items():
+        column = connection.ops.quote_name(model._meta.get_field(name).column)
+        conditions.append(f"t.{column} = %s")
+        params.append(value)
+    where = " AND ".join(conditions)
+    if index.visible:
+        join = f"FROM {index.table} JOIN {base_table} t ON t.id = {index.table}.rowid WHERE {where}"
+    else:
+        join = f"FROM {index.table} WHERE {where}"
+    weights = ", ".join(str(weight) for _, weight in index.columns)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) {join}", params)
+        total = cursor.fetchone()[0]
+        if not total or offset >= total:
+            return [], total
+        cursor.execute(
+            f"SELECT {index.table}.rowid {join} "
+            f"ORDER BY bm25({index.table}, {weights}), {index.table}.rowid LIMIT %s OFFSET %s",
+            [*params, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    by_id = model._default_manager.using(using).in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id], total
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Vacancy, Application
+from .ml_scoring import DEFAULT_CATEGORY_THRESHOLDS, DEFAULT_SCORE_WEIGHTS
 from accounts.serializers import CandidateSerializer
 
 
@@ -21,11 +22,16 @@ class VacancySerializer(serializers.ModelSerializer):
     """
     Serializer used by organizations to create/update vacancies.
     Fully aligned with ML v3 JD structure.
+
+    The ranking profile is only shown to the organization owning the
+    vacancy, i.e. when the context's request user is that organization.
     """
 
     organization = serializers.SerializerMethodField()
     passcode = serializers.CharField(read_only=True)  # Only readable, auto-generated
 
+    OWNER_ONLY_FIELDS = ('score_weights', 'category_thresholds')
+
     class Meta:
         model = Vacancy
         fields = (
@@ -44,6 +50,10 @@ class VacancySerializer(serializers.ModelSerializer):
             'min_experience_years',
             'max_experience_years',
 
+            # Ranking profile (overrides of the default weights / thresholds)
+            'score_weights',
+            'category_thresholds',
+
             # Optional metadata
             'location',
             'salary_range',
@@ -67,6 +77,19 @@ class VacancySerializer(serializers.ModelSerializer):
             'updated_at',
         )
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        is_owner = (
+            user is not None and user.is_authenticated
+            and instance.organization is not None and instance.organization.user_id == user.id
+        )
+        if not is_owner:
+            for field in self.OWNER_ONLY_FIELDS:
+                data.pop(field, None)
+        return data
+
     def get_organization(self, obj):
         """Return organization id and name"""
         if obj.organization:
@@ -86,6 +109,76 @@ class VacancySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("education_required must be a list")
         return value
 
+    def _validate_overrides(self, name, value, defaults, minimum, maximum):
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise serializers.ValidationError(f"{name} must be an object")
+
+        unknown = set(value) - set(defaults)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown {name} key(s): {', '.join(sorted(unknown))}. "
+                f"Allowed: {', '.join(defaults)}"
+            )
+
+        cleaned = {}
+        for key, number in value.items():
+            if isinstance(number, bool) or not isinstance(number, (int, float)):
+                raise serializers.ValidationError(f"{name}.{key} must be a number")
+            if not minimum <= number <= maximum:
+                raise serializers.ValidationError(f"{name}.{key} must be between {minimum} and {maximum}")
+            cleaned[key] = float(number)
+        return cleaned
+
+    def validate_score_weights(self, value):
+        value = self._validate_overrides('score_weights', value, DEFAULT_SCORE_WEIGHTS, 0, 1)
+        total = sum({**DEFAULT_SCORE_WEIGHTS, **value}.values())
+        if abs(total - 1) > 0.001:
+            raise serializers.ValidationError(
+                f"score_weights (merged with the defaults) must sum to 1, got {total:.3f}"
+            )
+        return value
+
+    def validate_category_thresholds(self, value):
+        value = self._validate_overrides('category_thresholds', value, DEFAULT_CATEGORY_THRESHOLDS, 0, 100)
+        merged = {**DEFAULT_CATEGORY_THRESHOLDS, **value}
+        if not merged['highly_preferred'] >= merged['mid_preference'] >= merged['low_preference']:
+            raise serializers.ValidationError(
+                "category_thresholds must satisfy highly_preferred >= mid_preference >= low_preference"
+            )
+        return value
+
+
+class VacancyListSerializer(serializers.ModelSerializer):
+    """
+    Compact vacancy for list pages: no description, ML structuring fields,
+    ranking profile, passcode or allowed candidates. The detail endpoint
+    returns the full VacancySerializer.
+    """
+
+    organization = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Vacancy
+        fields = (
+            'id',
+            'organization',
+            'title',
+            'required_skills',
+            'location',
+            'salary_range',
+            'experience_level',
+            'is_public',
+            'status',
+            'created_at',
+            'updated_at',
+        )
+        read_only_fields = fields
+
+    def get_organization(self, obj):
+        return {'id': obj.organization_id, 'name': obj.organization.name}
+
 
 # ==================================================
 # APPLICATION SERIALIZER (ML OUTPUT SAFE)
@@ -121,7 +214,15 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'status',
             'final_score',
             'category',
+            'skill_match_pct',
+            'semantic_similarity',
+            'education_match',
+            'experience_years',
+            'experience_score',
+            'keyword_match_pct',
+            'job_title_match',
             'ml_result',
+            'scoring_state',
             'applied_at',
             'updated_at',
             'candidate_details',
@@ -137,7 +238,15 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'candidate',
             'final_score',
             'category',
+            'skill_match_pct',
+            'semantic_similarity',
+            'education_match',
+            'experience_years',
+            'experience_score',
+            'keyword_match_pct',
+            'job_title_match',
             'ml_result',
+            'scoring_state',
             'applied_at',
             'updated_at',
             'is_self_test',
@@ -161,3 +270,49 @@ class ApplicationSerializer(serializers.ModelSerializer):
             data['name'] = f"Self Test #{obj.self_test_number}"
         
         return data
+
+
+class ApplicationListSerializer(serializers.ModelSerializer):
+    """
+    Compact application for list pages: the stored score components but no
+    ml_result or nested candidate profile. The detail and analysis
+    endpoints return those.
+    """
+
+    candidate_name = serializers.SerializerMethodField()
+    vacancy_title = serializers.CharField(source='vacancy.title', read_only=True)
+    organization_name = serializers.CharField(source='vacancy.organization.name', read_only=True)
+    organization_id = serializers.IntegerField(source='vacancy.organization_id', read_only=True)
+
+    class Meta:
+        model = Application
+        fields = (
+            'id',
+            'vacancy',
+            'candidate',
+            'candidate_name',
+            'status',
+            'final_score',
+            'category',
+            'skill_match_pct',
+            'semantic_similarity',
+            'education_match',
+            'experience_years',
+            'experience_score',
+            'keyword_match_pct',
+            'job_title_match',
+            'scoring_state',
+            'applied_at',
+            'updated_at',
+            'vacancy_title',
+            'organization_name',
+            'organization_id',
+            'is_self_test',
+            'self_test_number',
+        )
+        read_only_fields = fields
+
+    def get_candidate_name(self, obj):
+        if obj.is_self_test:
+            return f"Self Test #{obj.self_test_number}"
+        return obj.candidate.name
@@ -0,0 +1,482 @@
+# backend/vacancies/suggestions.py
+"""
+Autocomplete behind `/api/search/suggestions/`.
+
+Each process keeps one `SuggestionIndex`: a completion trie per suggestion
+type (open vacancy titles, organization names, candidate names, skills and
+locations of open vacancies), each entry weighted by popularity:
+
+    vacancy       1 + applications
+    organization  1 + open public vacancies
+    candidate     1 + applications
+    skill         open public vacancies requiring it
+    location      open public vacancies there
+
+Every word of an entry starts an indexed string ("machine learning" is found
+by "mach" and by "learn"). Vacancies are also found by the words of their
+location, like the title-or-location search this replaced. Each trie node caches the best keys of its
+subtree, so a lookup walks the prefix and returns that cache.
+
+The index is built on first use (or at startup, see `warm_up`), then kept
+current by the model signals connected in `connect_signals`, applied when
+the transaction commits. Writes made by other processes are picked up by a
+background rebuild every `REFRESH_INTERVAL` seconds:
+
+    SEARCH_SUGGESTIONS = {
+        'WARM_ON_STARTUP': True,   # build in a background thread when the app loads
+        'REFRESH_INTERVAL': 600,   # seconds between rebuilds (None = signals only)
+    }
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+# Indexed strings are cut at this many characters; longer prefixes are
+# checked against the full strings of the entries under the cut
+MAX_DEPTH = 24
+# Words of an entry that start an indexed string
+MAX_WORDS = 6
+
+DEFAULT_REFRESH_INTERVAL = 600
+
+
+def normalize(text) -> str:
+    """Case- and accent-insensitive form of `text`, whitespace collapsed."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+def word_suffixes(text: str) -> set:
+    words = text.split()
+    return {" ".join(words[i:]) for i in range(min(len(words), MAX_WORDS))}
+
+
+class PrefixIndex:
+    """
+    Completion trie returning the `limit` best entries whose strings start
+    with a prefix. Nodes are kept in parallel lists (like EntityMatcher's
+    automaton) rather than objects, to keep large indexes compact.
+
+    Entries are ordered by rank, (-weight, normalized text, key). Each node
+    keeps the ranks of the strings ending there sorted, so a node with
+    thousands of entries (every "john smith") costs `limit` items to merge.
+
+    Every write refreshes the nodes it touched, so lookups never recompute.
+    With `deferred`, writes only mark nodes stale until `warm()`, which is
+    what bulk loads want.
+    """
+
+    def __init__(self, limit: int, max_depth: int = MAX_DEPTH, deferred: bool = False):
+        self.limit = limit
+        self.max_depth = max_depth
+        self.deferred = deferred
+        self._children = [{}]    # node -> {char: node}
+        self._parent = [-1]
+        self._ends = [[]]        # node -> sorted ranks of strings ending (or cut) there
+        self._top = [None]       # node -> best ranks of the subtree; None when stale
+        self._entries = {}       # key -> (rank, payload, strings)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _invalidate(self, node: int) -> None:
+        # A stale node's ancestors are stale too, so the walk can stop there
+        while node >= 0 and self._top[node] is not None:
+            self._top[node] = None
+            node = self._parent[node]
+
+    def _end_node(self, string: str, create: bool):
+        node = 0
+        for ch in string[:self.max_depth]:
+            child = self._children[node].get(ch)
+            if child is None:
+                if not create:
+                    return None
+                # New nodes start stale; so must every node above them
+                self._invalidate(node)
+                child = len(self._children)
+                self._children[node][ch] = child
+                self._children.append({})
+                self._parent.append(node)
+                self._ends.append([])
+                self._top.append(None)
+            node = child
+        return node
+
+    def _link(self, rank, strings) -> None:
+        # Suffixes sharing their first max_depth characters end at one node,
+        # which must hold the rank once
+        for node in {self._end_node(string, create=True) for string in strings}:
+            bisect.insort(self._ends[node], rank)
+            self._invalidate(node)
+
+    def _unlink(self, rank, strings) -> None:
+        for node in {self._end_node(string, create=False) for string in strings}:
+            ends = self._ends[node]
+            i = bisect.bisect_left(ends, rank)
+            if i < len(ends) and ends[i] == rank:
+                del ends[i]
+            self._invalidate(node)
+
+    def _refresh(self) -> None:
+        # Only the nodes on the paths just written are stale
+        if not self.deferred:
+            self._best(0)
+
+    def add(self, key, text: str, weight: float, payload: dict, aliases=()) -> None:
+        """
+        Index `payload` under `key`, replacing what `key` held before. The
+        entry is found by the words of `text` and of each of `aliases`.
+        """
+        current = self._entries.pop(key, None)
+        if current is not None:
+            self._unlink(current[0], current[2])
+        strings = word_suffixes(normalize(text))
+        for alias in aliases:
+            strings |= word_suffixes(normalize(alias))
+        rank = (-weight, normalize(payload.get("text", text)), key)
+        self._entries[key] = (rank, payload, strings)
+        self._link(rank, strings)
+        self._refresh()
+
+    def set_weight(self, key, weight: float) -> None:
+        current = self._entries.get(key)
+        if current is None or current[0][0] == -weight:
+            return
+        rank, payload, strings = current
+        new_rank = (-weight, *rank[1:])
+        self._unlink(rank, strings)
+        self._entries[key] = (new_rank, payload, strings)
+        self._link(new_rank, strings)
+        self._refresh()
+
+    def remove(self, key) -> None:
+        # Emptied nodes are kept; they go away with the next rebuild
+        current = self._entries.pop(key, None)
+        if current is not None:
+            self._unlink(current[0], current[2])
+            self._refresh()
+
+    def _best(self, node: int) -> list:
+        top = self._top[node]
+        if top is None:
+            # The best ranks of a subtree are among the best of its own and
+            # the best of each child's: a rank outranked by `limit` others in
+            # one of them is outranked by those in the whole subtree
+            ends, children = self._ends[node], self._children[node]
+            if not ends and len(children) == 1:
+                # Inside a word: the node shares its only child's best
+                top = self._top[node] = self._best(next(iter(children.values())))
+                return top
+            ranks = set(ends[:self.limit])
+            for child in children.values():
+                ranks.update(self._best(child))
+            top = self._top[node] = heapq.nsmallest(self.limit, ranks)
+        return top
+
+    def search(self, prefix: str) -> list:
+        """Payloads of the best entries with a string starting with `prefix`, best first."""
+        prefix = normalize(prefix)
+        node = self._end_node(prefix, create=False)
+        if node is None:
+            return []
+        if len(prefix) <= self.max_depth:
+            ranks = self._best(node)
+        else:
+            ranks = []
+            for rank in self._ends[node]:
+                if rank not in ranks and any(s.startswith(prefix) for s in self._entries[rank[2]][2]):
+                    ranks.append(rank)
+                    if len(ranks) == self.limit:
+                        break
+        return [self._entries[rank[2]][1] for rank in ranks]
+
+    def warm(self) -> None:
+        """Compute every stale node and refresh on every write from now on."""
+        self.deferred = False
+        self._best(0)
+
+
+class SuggestionIndex:
+    # Suggestions per type, in the order they are returned
+    LIMITS = {
+        'vacancy': 5,
+        'organization': 3,
+        'candidate': 3,
+        'skill': 3,
+        'location': 2,
+    }
+
+    def __init__(self, deferred: bool = False):
+        self.indexes = {kind: PrefixIndex(limit, deferred=deferred) for kind, limit in self.LIMITS.items()}
+        self._vacancies = {}              # open public vacancy id -> (organization id, skills, location)
+        self._applications = Counter()    # ('vacancy' | 'candidate', id) -> applications
+        self._open_vacancies = Counter()  # organization id -> open public vacancies
+        self._skills = Counter()          # normalized skill -> open public vacancies
+        self._locations = Counter()       # normalized location -> open public vacancies
+
+    def suggest(self, query: str, limit: int = 10) -> list:
+        suggestions = []
+        for index in self.indexes.values():
+            suggestions.extend(index.search(query))
+        return suggestions[:limit]
+
+    # --- counted terms of open vacancies
+
+    def _count_term(self, kind: str, counts: Counter, key: str, text: str, delta: int, subtitle: str) -> None:
+        counts[key] += delta
+        index = self.indexes[kind]
+        if counts[key] <= 0:
+            del counts[key]
+            index.remove(key)
+        elif key in index:
+            index.set_weight(key, counts[key])
+        else:
+            index.add(key, text, counts[key], {'type': kind, 'text': text, 'subtitle': subtitle, 'id': None})
+
+    def _contribute(self, organization_id: int, skills: dict, location, delta: int) -> None:
+        for key, text in skills.items():
+            self._count_term('skill', self._skills, key, text, delta, 'Skill')
+        if location:
+            self._count_term('location', self._locations, location[0], location[1], delta, 'Location')
+        self._open_vacancies[organization_id] += delta
+        self.indexes['organization'].set_weight(organization_id, 1 + self._open_vacancies[organization_id])
+
+    # --- updates (also the signal handlers' events)
+
+    def update_vacancy(self, vacancy_id, organization_id, title, location, skills, visible) -> None:
+        previous = self._vacancies.pop(vacancy_id, None)
+        if previous is not None:
+            self._contribute(*previous, -1)
+
+        if not visible:
+            self.indexes['vacancy'].remove(vacancy_id)
+            return
+
+        skill_texts = {}
+        for skill in skills or []:
+            key = normalize(skill)
+            if key:
+                skill_texts.setdefault(key, str(skill).strip())
+        location_entry = (normalize(location), location.strip()) if location and normalize(location) else None
+        self._vacancies[vacancy_id] = (organization_id, skill_texts, location_entry)
+        self._contribute(organization_id, skill_texts, location_entry, 1)
+
+        self.indexes['vacancy'].add(
+            vacancy_id, title, 1 + self._applications[('vacancy', vacancy_id)],
+            {'type': 'vacancy', 'text': title, 'subtitle': location or 'Job', 'id': vacancy_id},
+            aliases=(location,) if location else (),
+        )
+
+    def remove_vacancy(self, vacancy_id) -> None:
+        self.update_vacancy(vacancy_id, None, '', None, (), visible=False)
+        self._applications.pop(('vacancy', vacancy_id), None)
+
+    def update_organization(self, organization_id, name) -> None:
+        self.indexes['organization'].add(
+            organization_id, name, 1 + self._open_vacancies[organization_id],
+            {'type': 'organization', 'text': name, 'subtitle': 'Organization', 'id': organization_id},
+        )
+
+    def remove_organization(self, organization_id) -> None:
+        self.indexes['organization'].remove(organization_id)
+
+    def update_candidate(self, candidate_id, name) -> None:
+        self.indexes['candidate'].add(
+            candidate_id, name, 1 + self._applications[('candidate', candidate_id)],
+            {'type': 'candidate', 'text': name, 'subtitle': 'Candidate', 'id': candidate_id},
+        )
+
+    def remove_candidate(self, candidate_id) -> None:
+        self.indexes['candidate'].remove(candidate_id)
+        self._applications.pop(('candidate', candidate_id), None)
+
+    def count_application(self, vacancy_id, candidate_id, delta: int) -> None:
+        for kind, key in (('vacancy', vacancy_id), ('candidate', candidate_id)):
+            count = self._applications[(kind, key)] = max(0, self._applications[(kind, key)] + delta)
+            self.indexes[kind].set_weight(key, 1 + count)
+
+    def warm(self) -> None:
+        for index in self.indexes.values():
+            index.warm()
+
+
+def build_suggestion_index() -> SuggestionIndex:
+    from django.db.models import Count
+
+    from accounts.models import Candidate, Organization
+    from vacancies.models import Application, Vacancy
+
+    index = SuggestionIndex(deferred=True)
+    applications = Application.objects.order_by()
+    for vacancy_id, count in applications.values_list('vacancy_id').annotate(n=Count('id')):
+        index._applications[('vacancy', vacancy_id)] = count
+    for candidate_id, count in applications.values_list('candidate_id').annotate(n=Count('id')):
+        index._applications[('candidate', candidate_id)] = count
+
+    for organization_id, name in Organization.objects.values_list('id', 'name').iterator():
+        index.update_organization(organization_id, name)
+    for candidate_id, name in Candidate.objects.values_list('id', 'name').iterator():
+        index.update_candidate(candidate_id, name)
+    vacancies = Vacancy.objects.filter(is_public=True, status='open').values_list(
+        'id', 'organization_id', 'title', 'location', 'required_skills',
+    )
+    for vacancy_id, organization_id, title, location, skills in vacancies.iterator():
+        index.update_vacancy(vacancy_id, organization_id, title, location, skills, visible=True)
+
+    index.warm()
+    return index
+
+
+# ---------- process-wide instance ----------
+
+_index = None
+_built_at = 0.0
+_pending = None                 # events seen while a build runs, replayed onto its result
+_lock = threading.RLock()       # guards _index, _pending and every read/update of the index
+_build_lock = threading.Lock()  # one build at a time
+
+
+def _options() -> dict:
+    return getattr(settings, 'SEARCH_SUGGESTIONS', {}) or {}
+
+
+def _build() -> None:
+    global _index, _built_at, _pending
+
+    with _lock:
+        _pending = []
+    try:
+        index = build_suggestion_index()
+    except Exception:
+        with _lock:
+            _pending = None
+        raise
+
+    with _lock:
+        # Events may already be in the rows just read; replaying them is
+        # idempotent except for application counts, which the next rebuild fixes
+        for name, args in _pending:
+            getattr(index, name)(*args)
+        _index, _built_at, _pending = index, time.monotonic(), None
+
+
+def _build_in_background() -> None:
+    from django.db import connection
+
+    try:
+        with _build_lock:
+            _build()
+    except Exception:
+        logger.exception("Failed to build the search suggestion index")
+    finally:
+        # This runs on its own thread, which owns its own connection
+        connection.close()
+
+
+def warm_up() -> None:
+    """Start building the index in a background thread, unless disabled or already built."""
+    if _index is None and _options().get('WARM_ON_STARTUP', True):
+        threading.Thread(target=_build_in_background, name='search-suggestions-warm-up', daemon=True).start()
+
+
+def suggest(query: str, limit: int = 10) -> list:
+    """Best suggestions for `query`, up to `limit`, grouped by type."""
+    if _index is None:
+        # First request of the process (or the warm-up is still running)
+        with _build_lock:
+            if _index is None:
+                _build()
+    else:
+        interval = _options().get('REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+        if interval and time.monotonic() - _built_at > interval and not _build_lock.locked():
+            threading.Thread(target=_build_in_background, name='search-suggestions-refresh', daemon=True).start()
+
+    with _lock:
+        return _index.suggest(query, limit)
+
+
+# ---------- signals ----------
+
+def _apply(name: str, *args) -> None:
+    def apply():
+        with _lock:
+            if _index is not None:
+                getattr(_index, name)(*args)
+            if _pending is not None:
+                _pending.append((name, args))
+
+    # Rolled-back writes never reach the index
+    transaction.on_commit(apply)
+
+
+def _on_vacancy_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _apply(
+            'update_vacancy', instance.id, instance.organization_id, instance.title, instance.location,
+            list(instance.required_skills or []), instance.is_public and instance.status == 'open',
+        )
+
+
+def _on_vacancy_delete(sender, instance, **kwargs):
+    _apply('remove_vacancy', instance.id)
+
+
+def _on_organization_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _apply('update_organization', instance.id, instance.name)
+
+
+def _on_organization_delete(sender, instance, **kwargs):
+    _apply('remove_organization', instance.id)
+
+
+def _on_candidate_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _apply('update_candidate', instance.id, instance.name)
+
+
+def _on_candidate_delete(sender, instance, **kwargs):
+    _apply('remove_candidate', instance.id)
+
+
+def _on_application_save(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        _apply('count_application', instance.vacancy_id, instance.candidate_id, 1)
+
+
+def _on_application_delete(sender, instance, **kwargs):
+    _apply('count_application', instance.vacancy_id, instance.candidate_id, -1)
+
+
+def connect_signals() -> None:
+    from django.db.models.signals import post_delete, post_save
+
+    from accounts.models import Candidate, Organization
+    from vacancies.models import Application, Vacancy
+
+    handlers = (
+        (Vacancy, _on_vacancy_save, _on_vacancy_delete),
+        (Organization, _on_organization_save, _on_organization_delete),
+        (Candidate, _on_candidate_save, _on_candidate_delete),
+        (Application, _on_application_save, _on_application_delete),
+    )
+    for model, on_save, on_delete in handlers:
+        label = model._meta.label_lower
+        post_save.connect(on_save, sender=model, dispatch_uid=f'suggestions_save_{label}')
+        post_delete.connect(on_delete, sender=model, dispatch_uid=f'suggestions_delete_{label}')
@@ -1,3 +1,879 @@
-from django.test import TestCase
+import json
+import random
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Candidate, Organization, User
+from . import facets, fuzzy_terms, search_index
+from .management.commands.reprocess_applications import Command as ReprocessCommand
+from .fuzzy_terms import TermIndex
+from .ml.fit_summary import _recommendation_from_score, fallback_summary
+from .ml.resume_cache import ResumeFeatureCache, ResumeFeatures
+from .ml.scorer import (
+    _features_from_text,
+    clean_text,
+    load_tfidf,
+    rescore_resume_features,
+    score_resume_features,
+)
+from .ml_scoring import (
+    affected_components,
+    build_jd,
+    categorize_score,
+    category_thresholds,
+    rerank_vacancy,
+)
+from .models import Application, ScoringJob, Vacancy
+from .pagination import KeysetPagination
+from .recommendations import get_candidate_store, rebuild_stale_candidate_store
+from .resume_store import CATEGORIES, file_sorted_resume, sorted_dir, sorted_filename
+from .scoring_queue import claim_jobs, enqueue_scoring, requeue_stale_jobs, run_jobs
+from .suggestions import PrefixIndex, SuggestionIndex, normalize, word_suffixes
+
+
+class ApplicationListPaginationTests(TestCase):
+    """Keyset pages of /api/applications/ (see pagination.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=cls.org_user, name='Org', contact_email='org@test.local')
+        vacancy = Vacancy.objects.create(organization=org, title='Engineer', description='Build things')
+        for i in range(23):
+            user = User.objects.create(email=f'c{i}@test.local', user_type='candidate')
+            candidate = Candidate.objects.create(user=user, name=f'Candidate {i}')
+            # Unscored applications tie at 0, the rest on a few scores
+            Application.objects.create(
+                vacancy=vacancy,
+                candidate=candidate,
+                final_score=0.0 if i % 2 else float(i % 3) * 10,
+                experience_years=float(i % 4),
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.org_user)
+
+    def walk(self, **params):
+        ids = []
+        response = self.client.get('/api/applications/', {'page_size': 4, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 4)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def expected(self, *ordering):
+        return list(Application.objects.order_by(*ordering).values_list('id', flat=True))
+
+    def test_default_order_is_newest_first(self):
+        self.assertEqual(self.walk(), self.expected('-id'))
+
+    def test_ties_on_a_descending_column_are_walked_by_ascending_id(self):
+        self.assertEqual(self.walk(ordering='-final_score'), self.expected('-final_score', 'id'))
+
+    def test_ascending_column(self):
+        self.assertEqual(self.walk(ordering='experience_years'), self.expected('experience_years', 'id'))
+        self.assertEqual(self.walk(ordering='applied_at'), self.expected('applied_at', 'id'))
+
+    def test_pages_leave_out_ml_result_and_the_candidate_profile(self):
+        row = self.client.get('/api/applications/', {'page_size': 1}).data['results'][0]
+        self.assertNotIn('ml_result', row)
+        self.assertNotIn('candidate_details', row)
+
+    def test_without_page_parameters_the_list_is_a_plain_array(self):
+        response = self.client.get('/api/applications/', {'ordering': '-final_score'})
+        self.assertEqual([row['id'] for row in response.data], self.expected('-final_score', 'id'))
+        self.assertIn('ml_result', response.data[0])
+
+    def test_bad_cursors_are_not_found(self):
+        paginator = KeysetPagination()
+        cursors = [
+            'not a cursor!',
+            paginator.encode_cursor(['-final_score', 'id'], ['abc', 1]),
+            paginator.encode_cursor(['applied_at', 'id'], ['yesterday', 1]),
+            paginator.encode_cursor(['-final_score', 'id'], [None, 1]),
+            paginator.encode_cursor(['-final_score', 'id'], [10.0]),
+        ]
+        for cursor in cursors:
+            response = self.client.get('/api/applications/', {'ordering': '-final_score', 'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+    def test_cursor_of_another_ordering_is_not_found(self):
+        next_link = self.client.get('/api/applications/', {'page_size': 4, 'ordering': '-final_score'}).data['next']
+        cursor = next_link.split('cursor=')[1].split('&')[0]
+        response = self.client.get('/api/applications/', {'ordering': 'experience_years', 'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/api/applications/', {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+
+class PrefixIndexTests(SimpleTestCase):
+    """PrefixIndex lookups against a scan of every entry (see suggestions.py)."""
+
+    def assertMatchesScan(self, index, entries, prefixes):
+        for prefix in prefixes:
+            query = normalize(prefix)
+            ranks = sorted(
+                (-weight, normalize(text), key)
+                for key, (text, weight) in entries.items()
+                if any(string.startswith(query) for string in word_suffixes(normalize(text)))
+            )
+            expected = [key for _, _, key in ranks[:index.limit]]
+            self.assertEqual([payload['id'] for payload in index.search(prefix)], expected, prefix)
+
+    def test_suffixes_cut_to_one_node_count_once(self):
+        index = PrefixIndex(limit=3, max_depth=4)
+        entries = {
+            1: ('abcd1 abcd2 abcd3', 9),
+            2: ('abcd4', 5),
+            3: ('abcd5', 4),
+            4: ('abcd6', 3),
+        }
+        for key, (text, weight) in entries.items():
+            index.add(key, text, weight, {'text': text, 'id': key})
+        self.assertMatchesScan(index, entries, ['a', 'abc', 'abcd', 'abcd5', 'abcd2 abcd3'])
+
+        index.set_weight(1, 1)
+        entries[1] = (entries[1][0], 1)
+        self.assertMatchesScan(index, entries, ['a', 'abcd', 'abcd1'])
+
+        index.remove(1)
+        del entries[1]
+        self.assertMatchesScan(index, entries, ['a', 'abcd', 'abcd1'])
+
+    def test_random_writes(self):
+        rng = random.Random(7)
+        words = ['ab', 'abc', 'abd', 'ba', 'bab', 'abcab', 'Ábc', 'c']
+        prefixes = ['', 'a', 'ab', 'abc', 'abca', 'b', 'ba', 'ab ab', 'abc ab', 'c', 'x']
+        for deferred in (False, True):
+            index = PrefixIndex(limit=4, max_depth=3, deferred=deferred)
+            entries = {}
+            for step in range(400):
+                key = rng.randrange(30)
+                action = rng.random()
+                if action < 0.5 or key not in entries:
+                    text = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+                    weight = rng.randint(1, 5)
+                    index.add(key, text, weight, {'text': text, 'id': key})
+                    entries[key] = (text, weight)
+                elif action < 0.8:
+                    weight = rng.randint(1, 5)
+                    index.set_weight(key, weight)
+                    entries[key] = (entries[key][0], weight)
+                else:
+                    index.remove(key)
+                    del entries[key]
+                if step % 20 == 0:
+                    index.warm()
+                    self.assertMatchesScan(index, entries, prefixes)
+            index.warm()
+            self.assertMatchesScan(index, entries, prefixes)
+
+    def test_vacancies_found_by_title_or_location_words(self):
+        index = SuggestionIndex()
+        index.update_vacancy(1, 10, 'Senior Data Engineer', 'New York', ['SQL'], visible=True)
+        index.update_vacancy(2, 10, 'Designer', 'Berlin', [], visible=True)
+
+        def found(query):
+            return [(s['type'], s['id'] or s['text']) for s in index.suggest(query)]
+
+        self.assertEqual(found('data'), [('vacancy', 1)])
+        self.assertEqual(found('eng'), [('vacancy', 1)])
+        self.assertEqual(found('york'), [('vacancy', 1), ('location', 'New York')])
+        self.assertEqual(found('ngineer'), [])
+
+        index.update_vacancy(1, 10, 'Senior Data Engineer', 'Remote', ['SQL'], visible=True)
+        self.assertEqual(found('york'), [])
+        self.assertEqual(found('rem'), [('vacancy', 1), ('location', 'Remote')])
+
+
+class RerankTests(TestCase):
+    """rerank_vacancy keeps ml_result and sorted_resumes/ in line with the new ranking."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp(prefix='rerank_media_')
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+        org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=org_user, name='Org', contact_email='org@test.local')
+        self.vacancy = Vacancy.objects.create(organization=org, title='Engineer', description='Build things')
+        # Rule-based recommendations, from before and after the source was
+        # recorded, and one given by the AI summary
+        summaries = [
+            fallback_summary({'final_score': 0.0}, 'AI summary pending.'),
+            {'fit_summary': 'AI summary pending.', 'recommendation': 'Not Recommended'},
+            {'fit_summary': 'Solid profile.', 'recommendation': 'Consider', 'recommendation_source': 'ai'},
+        ]
+        for i in range(8):
+            user = User.objects.create(email=f'c{i}@test.local', user_type='candidate')
+            resume = Path(media_root, 'resumes', f'cv_{i}.pdf')
+            resume.parent.mkdir(exist_ok=True)
+            resume.write_bytes(b'%PDF ' + bytes([i]))
+            candidate = Candidate.objects.create(user=user, name=f'Candidate {i}', resume=f'resumes/cv_{i}.pdf')
+            application = Application.objects.create(
+                vacancy=self.vacancy, candidate=candidate, category='no_visit',
+                ml_result={'final_score': 0.0, 'matched_skills': ['python'], **summaries[i % 3]},
+                skill_match_pct=i * 12.5, semantic_similarity=i * 12.5, experience_score=i * 12.5,
+                keyword_match_pct=i * 12.5, education_match=i % 2 == 0, job_title_match=i > 4,
+            )
+            file_sorted_resume(org.id, self.vacancy.id, application.id, candidate.id, resume, 'no_visit')
+
+    def test_scores_categories_and_sorted_resumes_follow_the_rerank(self):
+        self.assertEqual(rerank_vacancy(self.vacancy), 8)
+
+        thresholds = category_thresholds(self.vacancy)
+        applications = Application.objects.filter(vacancy=self.vacancy).select_related('candidate')
+        self.assertGreater(len({application.category for application in applications}), 1)
+        self.assertGreater(len({application.ml_result['recommendation'] for application in applications}), 2)
+        for application in applications:
+            self.assertEqual(application.ml_result['final_score'], application.final_score)
+            self.assertEqual(application.ml_result['matched_skills'], ['python'])
+            if application.ml_result['fit_summary'] == 'Solid profile.':
+                self.assertEqual(application.ml_result['recommendation'], 'Consider')
+            else:
+                self.assertEqual(
+                    application.ml_result['recommendation'], _recommendation_from_score(application.final_score),
+                )
+            self.assertEqual(application.category, categorize_score(application.final_score, thresholds))
+            filename = sorted_filename(application.id, application.candidate_id, application.candidate.resume.name)
+            filed = [
+                category for category in CATEGORIES
+                if (sorted_dir(self.vacancy.organization_id, self.vacancy.id, category) / filename).exists()
+            ]
+            self.assertEqual(filed, [application.category])
+
+
+class CandidateStoreStalenessTests(TestCase):
+    """The "matching candidates" store is rebuilt once candidates saved their resume since."""
+
+    def setUp(self):
+        store_dir = tempfile.mkdtemp(prefix='candidate_store_')
+        self.addCleanup(shutil.rmtree, store_dir, ignore_errors=True)
+        self.store_dir = Path(store_dir) / 'store'
+        self.enterContext(override_settings(CANDIDATE_FEATURE_STORE={'DIR': self.store_dir}))
+
+        self.org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=self.org_user, name='Org', contact_email='org@test.local')
+        self.vacancy = Vacancy.objects.create(organization=org, title='Engineer', description='Build things')
+
+    def matching(self):
+        client = APIClient()
+        client.force_authenticate(self.org_user)
+        response = client.get(f'/api/vacancies/{self.vacancy.id}/matching-candidates/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_rebuilt_when_missing_and_when_stale(self):
+        self.assertIsNone(get_candidate_store())
+        self.assertIsNotNone(rebuild_stale_candidate_store(timedelta(hours=1)))
+        self.assertEqual(self.matching()['unindexed_candidates'], 0)
+
+        user = User.objects.create(email='c@test.local', user_type='candidate')
+        Candidate.objects.create(user=user, name='Candidate', resume='resumes/cv.pdf')
+        data = self.matching()
+        self.assertEqual(data['unindexed_candidates'], 1)
+        built_at = data['store_built_at']
+
+        # Too recent to rebuild yet
+        self.assertIsNone(rebuild_stale_candidate_store(timedelta(hours=1)))
+        self.assertIsNotNone(rebuild_stale_candidate_store(timedelta(0)))
+        data = self.matching()
+        self.assertEqual(data['unindexed_candidates'], 0)
+        self.assertGreater(data['store_built_at'], built_at)
+        self.assertIsNone(rebuild_stale_candidate_store(timedelta(0)))
+
+    def test_profile_edits_are_not_new_resumes(self):
+        user = User.objects.create(email='c@test.local', user_type='candidate')
+        candidate = Candidate.objects.create(user=user, name='Candidate', resume='resumes/cv.pdf')
+        rebuild_stale_candidate_store(timedelta(0))
+
+        candidate = Candidate.objects.get(pk=candidate.pk)
+        candidate.summary = 'Edited'
+        candidate.save()
+        self.assertEqual(self.matching()['unindexed_candidates'], 0)
+        self.assertIsNone(rebuild_stale_candidate_store(timedelta(0)))
+
+        candidate.resume = 'resumes/cv_2.pdf'
+        candidate.save(update_fields=['resume'])
+        self.assertEqual(self.matching()['unindexed_candidates'], 1)
+
+    def test_store_of_other_dictionaries_is_rebuilt(self):
+        rebuild_stale_candidate_store(timedelta(hours=1))
+        meta_path = self.store_dir / 'meta.json'
+        meta = json.loads(meta_path.read_text())
+        meta_path.write_text(json.dumps({**meta, 'fingerprint': 'other'}))
+
+        self.assertIsNone(get_candidate_store())
+        self.assertIsNotNone(rebuild_stale_candidate_store(timedelta(hours=1)))
+        self.assertIsNotNone(get_candidate_store())
+
+
+class VacancyRankingProfileVisibilityTests(TestCase):
+    """Score weights and category thresholds are only shown to the owning organization."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=cls.org_user, name='Org', contact_email='org@test.local')
+        cls.vacancy = Vacancy.objects.create(
+            organization=org, title='Engineer', description='Build things',
+            score_weights={'skills': 0.5, 'semantic': 0.1}, category_thresholds={'highly_preferred': 70},
+        )
+        cls.candidate_user = User.objects.create(email='c@test.local', user_type='candidate')
+        Candidate.objects.create(user=cls.candidate_user, name='Candidate')
+
+    def get(self, user, url):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_owner_sees_the_ranking_profile(self):
+        data = self.get(self.org_user, f'/api/vacancies/{self.vacancy.id}/')
+        self.assertEqual(data['score_weights'], {'skills': 0.5, 'semantic': 0.1})
+        self.assertEqual(data['category_thresholds'], {'highly_preferred': 70})
+
+    def test_candidates_do_not(self):
+        for data in (
+            self.get(self.candidate_user, f'/api/vacancies/{self.vacancy.id}/'),
+            self.get(self.candidate_user, '/api/vacancies/')[0],
+        ):
+            self.assertEqual(data['id'], self.vacancy.id)
+            self.assertNotIn('score_weights', data)
+            self.assertNotIn('category_thresholds', data)
+
+
+class ScoringQueueTests(TestCase):
+    """Claiming, retries and stale-lock recovery of the scoring queue (see scoring_queue.py)."""
+
+    def setUp(self):
+        org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=org_user, name='Org', contact_email='org@test.local')
+        self.vacancy = Vacancy.objects.create(organization=org, title='Engineer', description='Build things')
+        self.applications = []
+        for i in range(3):
+            user = User.objects.create(email=f'c{i}@test.local', user_type='candidate')
+            candidate = Candidate.objects.create(user=user, name=f'Candidate {i}')
+            self.applications.append(Application.objects.create(vacancy=self.vacancy, candidate=candidate))
+
+    def test_two_workers_never_claim_the_same_job(self):
+        jobs = [enqueue_scoring(application) for application in self.applications]
+        first = claim_jobs('worker-a', limit=2)
+        second = claim_jobs('worker-b', limit=5)
+        self.assertEqual([job.id for job in first], [jobs[0].id, jobs[1].id])
+        self.assertEqual([job.id for job in second], [jobs[2].id])
+        self.assertEqual(claim_jobs('worker-c', limit=5), [])
+
+    def test_a_claim_lost_between_select_and_update_is_skipped(self):
+        jobs = [enqueue_scoring(application) for application in self.applications]
+        claim_jobs('worker-a', limit=1)
+
+        # worker-b read the queue before worker-a's claim landed
+        real_filter = ScoringJob.objects.filter
+
+        def stale_read(*args, **kwargs):
+            if 'run_after__lte' in kwargs:
+                return real_filter(id__in=[job.id for job in jobs])
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(ScoringJob.objects, 'filter', side_effect=stale_read):
+            claimed = claim_jobs('worker-b', limit=3)
+        self.assertEqual([job.id for job in claimed], [jobs[1].id, jobs[2].id])
+        self.assertEqual(ScoringJob.objects.get(pk=jobs[0].id).locked_by, 'worker-a')
+        self.assertEqual(ScoringJob.objects.get(pk=jobs[0].id).attempts, 1)
+
+    def test_failures_are_retried_until_max_attempts(self):
+        application = self.applications[0]
+        job = enqueue_scoring(application)
+        ScoringJob.objects.filter(pk=job.pk).update(max_attempts=2)
+
+        with mock.patch('vacancies.scoring_queue.score_applications_batch', side_effect=RuntimeError('no PDF')):
+            self.assertEqual(run_jobs(claim_jobs('worker')), (0, 1))
+            job.refresh_from_db()
+            application.refresh_from_db()
+            self.assertEqual((job.state, job.attempts), ('queued', 1))
+            self.assertGreater(job.run_after, timezone.now())
+            self.assertIn('no PDF', job.last_error)
+            self.assertEqual(application.scoring_state, 'pending')
+
+            # Backing off: not runnable yet
+            self.assertEqual(claim_jobs('worker'), [])
+            ScoringJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            self.assertEqual(run_jobs(claim_jobs('worker')), (0, 1))
+
+        job.refresh_from_db()
+        application.refresh_from_db()
+        self.assertEqual((job.state, job.attempts, job.locked_by), ('failed', 2, ''))
+        self.assertEqual(application.scoring_state, 'failed')
+        self.assertEqual(claim_jobs('worker'), [])
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale, fresh = (enqueue_scoring(application) for application in self.applications[:2])
+        claim_jobs('dead-worker', limit=2)
+        ScoringJob.objects.filter(pk=stale.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=10)), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.state, stale.locked_by, stale.locked_at), ('queued', '', None))
+        self.assertEqual(fresh.state, 'running')
+        self.assertEqual([job.id for job in claim_jobs('worker', limit=5)], [stale.id])
+
+    def test_scoring_state_follows_the_job(self):
+        application = self.applications[0]
+        Application.objects.filter(pk=application.pk).update(scoring_state='done')
+        application.refresh_from_db()
+        enqueue_scoring(application)
+        application.refresh_from_db()
+        self.assertEqual(application.scoring_state, 'pending')
+
+        states_while_scoring = []
+
+        def score(vacancy, applications):
+            states_while_scoring.extend(
+                Application.objects.filter(pk__in=[a.pk for a in applications]).values_list('scoring_state', flat=True)
+            )
+            return [(72.5, 'highly_preferred')]
+
+        with mock.patch('vacancies.scoring_queue.score_applications_batch', side_effect=score):
+            self.assertEqual(run_jobs(claim_jobs('worker')), (1, 0))
+
+        application.refresh_from_db()
+        self.assertEqual(states_while_scoring, ['running'])
+        self.assertEqual(
+            (application.scoring_state, application.final_score, application.category),
+            ('done', 72.5, 'highly_preferred'),
+        )
+        self.assertEqual(ScoringJob.objects.get(application=application, kind='score').state, 'done')
+
+
+class PartialRescoreTests(SimpleTestCase):
+    """Re-scoring only the components an edit affects matches scoring in full."""
+
+    RESUME = (
+        "Senior Python developer and software engineer with 6 years of experience in Django, React, "
+        "SQL and Docker. Bachelor of Computer Science. Built data pipelines and REST APIs, led a team "
+        "of four. Software Engineer, Acme, 2018 - 2024."
+    )
+    VACANCY = dict(
+        title='Backend Engineer',
+        description='We need a backend engineer to build Django REST APIs and data pipelines.',
+        required_skills=['Python', 'Django', 'Kubernetes'],
+        education_required=['Bachelor'],
+        job_title_aliases=['Backend Engineer'],
+        keywords=['api', 'pipelines'],
+        min_experience_years=3,
+        max_experience_years=10,
+    )
+    # One edit per group of fields that score components are computed from
+    EDITS = {
+        'required_skills': ['Python', 'React', 'SQL', 'Go'],
+        'description': 'Frontend role: React, TypeScript and design systems.',
+        'education_required': ['Master'],
+        'min_experience_years': 8,
+        'max_experience_years': 4,
+        'keywords': ['team', 'docker'],
+        'job_title_aliases': ['Software Engineer'],
+        'title': 'Lead Platform Engineer',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.features = _features_from_text('test', cls.RESUME, load_tfidf().transform([clean_text(cls.RESUME)]))
+
+    def test_partial_rescore_matches_full_score(self):
+        previous = score_resume_features(self.features, build_jd(Vacancy(**self.VACANCY)))
+        for field, value in self.EDITS.items():
+            with self.subTest(field=field):
+                jd = build_jd(Vacancy(**{**self.VACANCY, field: value}))
+                full = score_resume_features(self.features, jd)
+                partial = rescore_resume_features(self.features, jd, previous, affected_components({field}))
+                self.assertEqual(partial, full)
+
+
+class VacancyEditRescoringTests(TestCase):
+    """Which vacancy edits queue re-scoring jobs and which only re-rank."""
+
+    def setUp(self):
+        self.org_user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=self.org_user, name='Org', contact_email='org@test.local')
+        self.vacancy = Vacancy.objects.create(
+            organization=org, title='Engineer', description='Build things', required_skills=['Python'],
+        )
+        user = User.objects.create(email='c@test.local', user_type='candidate')
+        candidate = Candidate.objects.create(user=user, name='Candidate')
+        Application.objects.create(
+            vacancy=self.vacancy, candidate=candidate, final_score=10.0, ml_result={'final_score': 10.0}, skill_match_pct=80.0,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.org_user)
+
+    def patch(self, **data):
+        with mock.patch('vacancies.views.rerank_vacancy', wraps=rerank_vacancy) as rerank:
+            response = self.client.patch(f'/api/vacancies/{self.vacancy.id}/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return rerank
+
+    def test_ranking_profile_edits_only_rerank(self):
+        rerank = self.patch(score_weights={'skills': 0.5, 'semantic': 0.0}, category_thresholds={'low_preference': 30})
+        rerank.assert_called_once()
+        self.assertFalse(ScoringJob.objects.exists())
+        self.assertEqual(Application.objects.get().final_score, 0.5 * 80.0)
+
+    def test_scored_field_edits_queue_partial_rescoring(self):
+        rerank = self.patch(required_skills=['Python', 'Go'], score_weights={'skills': 0.5, 'semantic': 0.0})
+        rerank.assert_not_called()
+        self.assertEqual(list(ScoringJob.objects.values_list('kind', 'components')), [('score', ['skills'])])
+
+    def test_other_edits_do_neither(self):
+        rerank = self.patch(title='Senior Engineer', location='Remote')
+        rerank.assert_not_called()
+        self.assertFalse(ScoringJob.objects.exists())
+
+
+class SearchIndexSyncTests(TestCase):
+    """The FTS index follows saves and deletes (see search_index.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='org@test.local', user_type='organization')
+        cls.org = Organization.objects.create(user=user, name='Acme Analytics', contact_email='org@test.local')
+
+    def setUp(self):
+        if not search_index._tables_exist(connection):
+            self.skipTest('SQLite without FTS5')
+
+    def ids(self, kind, query):
+        instances, total = search_index.search(kind, query)
+        self.assertEqual(total, len(instances))
+        return [instance.id for instance in instances]
+
+    def test_words_match_as_prefixes(self):
+        vacancy = Vacancy.objects.create(
+            organization=self.org, title='Python Developer', location='London', description='APIs',
+        )
+        self.assertEqual(self.ids('vacancies', 'pyth lond'), [vacancy.id])
+        self.assertEqual(self.ids('vacancies', 'DEVEL'), [vacancy.id])
+        # Unlike icontains, the middle of a word doesn't match
+        self.assertEqual(self.ids('vacancies', 'ython'), [])
+        self.assertEqual(self.ids('vacancies', 'python paris'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        vacancy = Vacancy.objects.create(organization=self.org, title='Python Developer', description='APIs')
+        vacancy.title = 'Rust Engineer'
+        vacancy.save()
+        self.assertEqual(self.ids('vacancies', 'python'), [])
+        self.assertEqual(self.ids('vacancies', 'rust'), [vacancy.id])
+
+        vacancy.is_public = False
+        vacancy.save()
+        self.assertEqual(self.ids('vacancies', 'rust'), [])
+        vacancy.is_public = True
+        vacancy.save()
+        self.assertEqual(self.ids('vacancies', 'rust'), [vacancy.id])
+
+        self.assertEqual(self.ids('organizations', 'analyt'), [self.org.id])
+        user = User.objects.create(email='c@test.local', user_type='candidate')
+        candidate = Candidate.objects.create(user=user, name='Ada Lovelace', skills=['Rust'])
+        self.assertEqual(self.ids('candidates', 'lovel rust'), [candidate.id])
+
+        candidate.delete()
+        self.org.delete()
+        for kind, query in (('candidates', 'lovelace'), ('organizations', 'acme'), ('vacancies', 'rust')):
+            self.assertEqual(self.ids(kind, query), [], kind)
+        with connection.cursor() as cursor:
+            for index in search_index.INDEXES.values():
+                cursor.execute(f"SELECT count(*) FROM {index.table}")
+                self.assertEqual(cursor.fetchone()[0], 0, index.table)
+
+    def test_missing_tables_are_remembered_until_created(self):
+        alias = connection.alias
+        self.addCleanup(search_index._tables_ready.__setitem__, alias, True)
+        del search_index._tables_ready[alias]
+        with mock.patch.object(connection.introspection, 'table_names', return_value=[]) as table_names:
+            self.assertIsNone(search_index.search('vacancies', 'python'))
+            self.assertIsNone(search_index.search('vacancies', 'python'))
+            self.assertEqual(table_names.call_count, 1)
+
+            search_index.create_tables(connection)
+            self.assertEqual(search_index.search('vacancies', 'python'), ([], 0))
+            self.assertEqual(table_names.call_count, 1)
+
+
+class ResumeFeatureCacheDiskTests(SimpleTestCase):
+    """Failed reads and writes of the disk tier leave nothing behind (see ml/resume_cache.py)."""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp(prefix='resume_cache_test_'))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def features(self, tfidf_vector=None):
+        return ResumeFeatures('ab12', 'text', 'text', 2.0, {'python'}, (), (), tfidf_vector)
+
+    def test_unreadable_entries_are_misses_and_deleted(self):
+        ResumeFeatureCache(self.directory).put('ab12', self.features())
+        path = self.directory / 'ab' / 'ab12.pkl'
+        for content in (b'', b'not a pickle', path.read_bytes()[:20]):
+            path.write_bytes(content)
+            self.assertIsNone(ResumeFeatureCache(self.directory).get('ab12'))
+            self.assertFalse(path.exists())
+
+    def test_unpicklable_features_leave_no_files(self):
+        cache = ResumeFeatureCache(self.directory)
+        cache.put('ab12', self.features(tfidf_vector=lambda: None))
+        self.assertIsNotNone(cache.get('ab12'))  # still served from memory
+        self.assertEqual(list(self.directory.rglob('*.*')), [])
+
+
+class ReprocessCheckpointTests(SimpleTestCase):
+    """The append-only checkpoint of reprocess_applications."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix='reprocess_checkpoint_test_')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = Path(directory) / 'var' / 'checkpoint.jsonl'
+        self.command = ReprocessCommand(stdout=StringIO())
+        self.signature = {'all': True, 'vacancy': None, 'organization': None}
+
+    def test_chunks_are_appended_and_compacted(self):
+        self.command._write_checkpoint(self.path, self.signature, {3, 1})
+        self.command._append_checkpoint(self.path, [7, 5])
+        self.command._append_checkpoint(self.path, [])
+        self.command._append_checkpoint(self.path, [9])
+        self.assertEqual(len(self.path.read_text().splitlines()), 3)
+        self.assertEqual(self.command._load_checkpoint(self.path, self.signature), {1, 3, 5, 7, 9})
+
+        self.command._write_checkpoint(self.path, self.signature, {1, 3, 5, 7, 9})
+        self.assertEqual(len(self.path.read_text().splitlines()), 1)
+        self.assertEqual(self.command._load_checkpoint(self.path, self.signature), {1, 3, 5, 7, 9})
+
+    def test_a_torn_last_chunk_runs_again(self):
+        self.command._write_checkpoint(self.path, self.signature, {1})
+        self.command._append_checkpoint(self.path, [2])
+        with open(self.path, 'a') as fh:
+            fh.write('[3, 4')
+        self.assertEqual(self.command._load_checkpoint(self.path, self.signature), {1, 2})
+
+    def test_checkpoint_of_another_run_is_ignored(self):
+        self.command._write_checkpoint(self.path, self.signature, {1})
+        self.command._append_checkpoint(self.path, [2])
+        self.assertEqual(self.command._load_checkpoint(self.path, {**self.signature, 'vacancy': 4}), set())
+
+
+class SalaryRangeParserTests(SimpleTestCase):
+    def test_parse_salary_range(self):
+        cases = {
+            '$100k - $120k': (100000, 120000),
+            'NPR 50,000': (50000, 50000),
+            '50,000 - 80,000': (50000, 80000),
+            '50-80k': (50000, 80000),
+            '$50k-80': (50000, 80000),
+            '1M - 1.5m': (1000000, 1500000),
+            '800-1.2k': (800, 1200),
+            '80k-50k': (50000, 80000),
+            '90,000 - 60,000': (60000, 90000),
+            'Rs. 40000 to 60000 per month': (40000, 60000),
+            'Negotiable': (None, None),
+            '': (None, None),
+            None: (None, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(facets.parse_salary_range(text), expected)
+
+
+class VacancyFacetCountTests(TestCase):
+    """Facet counts from VacancySkill against a scan of the vacancies (see facets.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='org@test.local', user_type='organization')
+        cls.org = Organization.objects.create(user=user, name='Org', contact_email='org@test.local')
+        rng = random.Random(3)
+        skills = ['Python', ' python', 'Django', 'React', 'SQL', 'Go']
+        for i in range(40):
+            Vacancy.objects.create(
+                organization=cls.org, title=f'Vacancy {i}', description='Work',
+                required_skills=rng.sample(skills, rng.randint(0, 4)),
+                location=rng.choice(['Kathmandu', 'Pokhara', '']),
+                experience_level=rng.choice(['Entry Level', 'Senior Level']),
+                salary_range=rng.choice(['$20k-30k', '$50k-80', '90,000 - 120,000', 'Negotiable']),
+                is_public=rng.random() < 0.8,
+                status=rng.choice(['open', 'open', 'closed']),
+            )
+
+    def expected_skill_counts(self, filters):
+        counts = {}
+        for vacancy in Vacancy.objects.filter(is_public=True, status='open'):
+            if filters.get('locations') and vacancy.location not in filters['locations']:
+                continue
+            if filters.get('salary_min') is not None and not (vacancy.salary_max or 0) >= filters['salary_min']:
+                continue
+            for key in facets.vacancy_skills(vacancy.required_skills):
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def skill_counts(self, filters):
+        counts = facets.facet_counts(facets._conditions(filters))['skills']
+        return {row['value']: row['count'] for row in counts}
+
+    def test_skill_counts_match_a_scan(self):
+        for filters in (
+            {},
+            {'skills': ['Python']},  # the skill facet's own filter doesn't narrow its counts
+            {'locations': ['Kathmandu']},
+            {'locations': ['Pokhara'], 'salary_min': 60000},
+        ):
+            with self.subTest(filters=filters):
+                self.assertEqual(self.skill_counts(filters), self.expected_skill_counts(filters))
+
+    def test_counts_follow_edits_and_deletes(self):
+        before = self.skill_counts({})
+        vacancy = Vacancy.objects.create(
+            organization=self.org, title='New', description='Work', required_skills=['Rust', 'PYTHON'],
+        )
+        self.assertEqual(self.skill_counts({}), {**before, 'rust': 1, 'python': before.get('python', 0) + 1})
+
+        vacancy.required_skills = ['Python']
+        vacancy.save()
+        self.assertEqual(self.skill_counts({}), {**before, 'python': before.get('python', 0) + 1})
+
+        vacancy.delete()
+        self.assertEqual(self.skill_counts({}), before)
+        self.assertEqual(self.skill_counts({}), self.expected_skill_counts({}))
+
+
+def osa_distance(a, b):
+    """Plain optimal-string-alignment distance over the full table."""
+    table = [[i + j if not i * j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            table[i][j] = min(
+                table[i - 1][j] + 1,
+                table[i][j - 1] + 1,
+                table[i - 1][j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+class TermIndexTests(SimpleTestCase):
+    """Banded distance and trigram lookups against brute force (see fuzzy_terms.py)."""
+
+    def typo(self, rng, word, edits):
+        for _ in range(edits):
+            i = rng.randrange(len(word) + 1)
+            action = rng.randrange(4) if i < len(word) else 1
+            if action == 0:
+                word = word[:i] + word[i + 1:]
+            elif action == 1:
+                word = word[:i] + rng.choice('abcdeg') + word[i:]
+            elif action == 2:
+                word = word[:i] + rng.choice('abcdeg') + word[i + 1:]
+            elif i + 1 < len(word):
+                word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        return word
+
+    def test_banded_distance_matches_the_full_table(self):
+        rng = random.Random(11)
+        for _ in range(3000):
+            a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+            b = self.typo(rng, a, rng.randint(0, 3)) if a and rng.random() < 0.7 else \
+                ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+            expected = osa_distance(a, b)
+            for limit in range(4):
+                self.assertEqual(fuzzy_terms.edit_distance(a, b, limit), min(expected, limit + 1), (a, b, limit))
+
+    def test_nearest_matches_a_scan(self):
+        rng = random.Random(5)
+        uses = {}
+        while len(uses) < 150:
+            uses[''.join(rng.choice('abcdeg') for _ in range(rng.randint(3, 11)))] = rng.randint(0, 5)
+        index = TermIndex()
+        for word, count in uses.items():
+            index.add(word, count)
+        words = list(uses)
+        for _ in range(200):
+            query = self.typo(rng, rng.choice(words), rng.randint(0, 3))
+            k = fuzzy_terms.max_edits(query)
+            distances = {word: osa_distance(query, word) for word in words} if k else {}
+            expected = sorted(
+                (distance, -uses[word], word) for word, distance in distances.items() if distance <= k
+            )
+            self.assertEqual(
+                index.nearest(query, limit=len(words), max_postings=10 ** 9, max_candidates=10 ** 9),
+                [word for _, _, word in expected],
+                query,
+            )
+            self.assertEqual(index.is_known(query), any(word.startswith(query) for word in words), query)
+
+
+class FuzzySearchTests(TestCase):
+    """Global search with typo expansions against plain search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='org@test.local', user_type='organization')
+        org = Organization.objects.create(user=user, name='Org', contact_email='org@test.local')
+        cls.vacancies = {
+            skill: Vacancy.objects.create(
+                organization=org, title=f'{skill} role', description='Work', required_skills=[skill, 'SQL'],
+            ).id
+            for skill in ('Kubernetes', 'Django', 'Terraform')
+        }
+
+    def setUp(self):
+        if not search_index._tables_exist(connection):
+            self.skipTest('SQLite without FTS5')
+        # A fresh index of this test's database, built on first use
+        self.enterContext(mock.patch.object(fuzzy_terms, '_index', None))
+
+    def ids(self, query, expansions=None):
+        instances, _ = search_index.search('vacancies', query, expansions=expansions)
+        return sorted(instance.id for instance in instances)
+
+    def test_exact_terms_find_what_plain_search_finds(self):
+        for query in ('kubernetes', 'Django sql', 'terra', 'role', 'terraform role'):
+            with self.subTest(query=query):
+                expansions = fuzzy_terms.expand_query(query)
+                # Skill words and their prefixes are never expanded
+                self.assertFalse(expansions.keys() & {'kubernetes', 'django', 'sql', 'terra', 'terraform'})
+                self.assertEqual(self.ids(query, expansions), self.ids(query))
+                self.assertTrue(self.ids(query))
+
+    def test_typos_within_the_cutoff_are_expanded(self):
+        for query, word, skill in (
+            ('kuberentes', 'kubernetes', 'Kubernetes'),  # transposition
+            ('djnago', 'django', 'Django'),
+            ('kubrnetis', 'kubernetes', 'Kubernetes'),   # 2 edits, allowed from 8 letters
+            ('terrafrom sql', 'terraform', 'Terraform'),
+        ):
+            with self.subTest(query=query):
+                expansions = fuzzy_terms.expand_query(query)
+                self.assertIn(word, expansions[query.split()[0]])
+                self.assertEqual(self.ids(query), [])
+                self.assertEqual(self.ids(query, expansions), [self.vacancies[skill]])
+
+    def test_typos_beyond_the_cutoff_are_not(self):
+        for query in ('djnaog', 'kubxrnxtxs'):  # 2 edits in 6 letters, 3 in 10
+            with self.subTest(query=query):
+                expansions = fuzzy_terms.expand_query(query)
+                self.assertNotIn('django', expansions.get(query, []))
+                self.assertNotIn('kubernetes', expansions.get(query, []))
+                self.assertEqual(self.ids(query, expansions), [])
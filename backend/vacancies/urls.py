@@ -5,11 +5,14 @@ from .views import (
     VacancyDetailView,
     VacancyNotifyView,
     VacancyPasscodeVerifyView,
+    RecommendedVacanciesView,
+    VacancyMatchingCandidatesView,
     ApplicationListCreateView,
     ApplicationDetailView,
     OrganizationDashboardAnalyticsView,
     GlobalSearchView,
     SearchSuggestionsView,
+    VacancyFacetSearchView,
     DownloadVacancyResumesView,
     BrowseOrganizationResumesView,
     SelfTestVacancyView,
@@ -30,11 +33,33 @@ urlpatterns = [
         name='vacancy-list-create',
     ),
 
+    # Candidate: open vacancies filtered by skill, location, level and salary,
+    # with counts per facet value
+    path(
+        'vacancies/search/',
+        VacancyFacetSearchView.as_view(),
+        name='vacancy-facet-search',
+    ),
+
     path(
         'vacancies/<int:pk>/',
         VacancyDetailView.as_view(),
         name='vacancy-detail',
     ),
+
+    # Candidate: open vacancies ranked for their resume
+    path(
+        'vacancies/recommended/',
+        RecommendedVacanciesView.as_view(),
+        name='vacancy-recommended',
+    ),
+
+    # Organization: candidates from the whole pool ranked for a vacancy
+    path(
+        'vacancies/<int:pk>/matching-candidates/',
+        VacancyMatchingCandidatesView.as_view(),
+        name='vacancy-matching-candidates',
+    ),
     
     path(
         'vacancies/<int:pk>/notify/',
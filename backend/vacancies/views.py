@@ -9,10 +9,21 @@ import shutil
 from pathlib import Path
 
 from .models import Vacancy, Application
-from .serializers import VacancySerializer, ApplicationSerializer
+from .serializers import (
+    ApplicationListSerializer,
+    ApplicationSerializer,
+    VacancyListSerializer,
+    VacancySerializer,
+)
 from accounts.models import Organization, Candidate
 from accounts.serializers import CandidateSerializer, OrganizationSerializer
-from .ml_scoring import score_application_and_store_resume
+from .scoring_queue import enqueue_scoring, enqueue_vacancy_rescore
+from .ml_scoring import affected_components, rerank_vacancy
+from .pagination import KeysetPagination
+from .recommendations import find_matching_candidates, recommend_vacancies
+from . import facets, search_index
+from .fuzzy_terms import expand_query
+from .suggestions import suggest
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count
 from rest_framework.views import APIView
@@ -29,10 +40,24 @@ from notifications.utils import (
 # ======================================================
 
 class VacancyListCreateView(generics.ListCreateAPIView):
+    """
+    With ?cursor= or ?page_size=, lists are cursor-paginated in the compact
+    VacancyListSerializer form (the detail endpoint has the full vacancy);
+    without, they are a plain array of full vacancies.
+    """
     serializer_class = VacancySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.paginator.is_requested(self.request):
+            return VacancyListSerializer
+        return VacancySerializer
 
     def get_queryset(self):
+        return self._visible_vacancies().select_related('organization')
+
+    def _visible_vacancies(self):
         user = self.request.user
         org_id = self.request.query_params.get('organization')
 
@@ -117,6 +142,11 @@ class VacancyDetailView(generics.RetrieveUpdateDestroyAPIView):
         vacancy = self.get_object()
         if vacancy.organization.user != self.request.user:
             raise permissions.PermissionDenied("You cannot edit this vacancy")
+
+        changed = {
+            field for field, value in serializer.validated_data.items()
+            if getattr(vacancy, field) != value
+        }
         
         # If changing from public to private, generate passcode
         import random
@@ -125,12 +155,21 @@ class VacancyDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         if not is_public and not vacancy.passcode:
             passcode = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            serializer.save(passcode=passcode)
+            vacancy = serializer.save(passcode=passcode)
         elif is_public:
             # If changing to public, clear passcode
-            serializer.save(passcode=None)
+            vacancy = serializer.save(passcode=None)
         else:
-            serializer.save()
+            vacancy = serializer.save()
+
+        components = affected_components(changed)
+        if components:
+            # Re-score only the affected components of existing applications
+            # (batched by the worker; the new weights apply there too)
+            enqueue_vacancy_rescore(vacancy, components)
+        elif changed & {'score_weights', 'category_thresholds'}:
+            # Only the ranking profile changed: recompute from stored components
+            rerank_vacancy(vacancy)
 
     def perform_destroy(self, instance):
         if instance.organization.user != self.request.user:
@@ -260,15 +299,224 @@ class VacancyPasscodeVerifyView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class RecommendedVacanciesView(APIView):
+    """
+    Open vacancies ranked for the logged-in candidate's resume
+    (?limit=20, max 100). Vacancies already applied to are skipped.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+
+        if user.user_type != 'candidate':
+            return Response(
+                {"detail": "Only candidates get vacancy recommendations"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            candidate = user.candidate_profile
+        except Candidate.DoesNotExist:
+            return Response(
+                {"detail": "Candidate profile not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {"detail": "limit must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            matches = recommend_vacancies(candidate, limit=limit)
+        except Exception as e:
+            print(f"Vacancy recommendation failed for candidate {candidate.id}: {e}")
+            return Response(
+                {"detail": "Could not read your resume"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        vacancies = Vacancy.objects.select_related('organization').in_bulk(
+            [match["vacancy_id"] for match in matches]
+        )
+        results = []
+        for match in matches:
+            vacancy = vacancies.get(match.pop("vacancy_id"))
+            if vacancy is None or vacancy.status != 'open':
+                continue
+            results.append({
+                "vacancy": VacancySerializer(vacancy).data,
+                "match": match,
+            })
+
+        return Response({
+            "has_resume": bool(candidate.resume),
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+class VacancyMatchingCandidatesView(APIView):
+    """
+    Candidates from the whole pool ranked for one of the organization's
+    vacancies (?limit=20, max 100). Candidates who already applied are skipped.
+    The response says when the candidate store was built and how many
+    candidates saved their resume since, who may be missing or out of date.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        user = request.user
+
+        if user.user_type != 'organization':
+            return Response(
+                {"detail": "Only organizations can search for matching candidates"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            vacancy = Vacancy.objects.select_related('organization__user').get(pk=pk)
+        except Vacancy.DoesNotExist:
+            return Response(
+                {"detail": "Vacancy not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if vacancy.organization.user != user:
+            return Response(
+                {"detail": "You do not have permission to search candidates for this vacancy"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {"detail": "limit must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        found = find_matching_candidates(vacancy, limit=limit)
+        if found is None:
+            return Response(
+                {"detail": "Candidate matching is not available yet"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        matches, not_indexed, built_at, unindexed = found
+
+        candidates = Candidate.objects.in_bulk([match["candidate_id"] for match in matches])
+        results = []
+        for match in matches:
+            candidate = candidates.get(match.pop("candidate_id"))
+            if candidate is None:
+                continue
+            results.append({
+                "candidate": CandidateSerializer(candidate, context={'request': request}).data,
+                "match": match,
+            })
+
+        return Response({
+            "not_indexed_terms": not_indexed,
+            "store_built_at": built_at,
+            "unindexed_candidates": unindexed,
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
 # ======================================================
 # APPLICATIONS
 # ======================================================
 
 class ApplicationListCreateView(generics.ListCreateAPIView):
+    """
+    Applications visible to the user. Lists can be filtered and ranked by the
+    stored score components, e.g.
+    ?vacancy=3&min_skill_match=70&education_match=true&ordering=-final_score
+
+    With ?cursor= or ?page_size=, lists are cursor-paginated in the compact
+    ApplicationListSerializer form, without ml_result or the candidate
+    profile (the detail and analysis endpoints have those); without, they
+    are a plain array of full applications.
+    """
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    # query param -> column compared with >=
+    MIN_SCORE_FILTERS = {
+        'min_score': 'final_score',
+        'min_skill_match': 'skill_match_pct',
+        'min_semantic': 'semantic_similarity',
+        'min_keyword_match': 'keyword_match_pct',
+        'min_experience_years': 'experience_years',
+    }
+    BOOLEAN_FILTERS = ('education_match', 'job_title_match')
+    ORDERING_FIELDS = (
+        'final_score',
+        'skill_match_pct',
+        'semantic_similarity',
+        'experience_years',
+        'keyword_match_pct',
+        'applied_at',
+    )
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.paginator.is_requested(self.request):
+            return ApplicationListSerializer
+        return ApplicationSerializer
 
     def get_queryset(self):
+        queryset = self._filter_by_score(self._visible_applications())
+        if self.request.query_params.get('ordering'):
+            # Unpaginated lists; pages are ordered by the paginator
+            queryset = queryset.order_by(*self.cursor_ordering())
+        return queryset.select_related('vacancy__organization', 'candidate')
+
+    def cursor_ordering(self):
+        ordering = self.request.query_params.get('ordering')
+        if not ordering:
+            return ('-id',)
+        if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+            raise serializers.ValidationError({'ordering': f"Must be one of {', '.join(self.ORDERING_FIELDS)}"})
+        # Ties on the ordering column are broken by id
+        return (ordering, 'id')
+
+    def _filter_by_score(self, queryset):
+        params = self.request.query_params
+
+        vacancy_id = params.get('vacancy')
+        if vacancy_id:
+            if not vacancy_id.isdigit():
+                raise serializers.ValidationError({'vacancy': "Must be a vacancy ID"})
+            queryset = queryset.filter(vacancy_id=int(vacancy_id))
+
+        category = params.get('category')
+        if category:
+            queryset = queryset.filter(category__in=category.split(','))
+
+        for param, field in self.MIN_SCORE_FILTERS.items():
+            value = params.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                queryset = queryset.filter(**{f'{field}__gte': float(value)})
+            except ValueError:
+                raise serializers.ValidationError({param: "Must be a number"})
+
+        for field in self.BOOLEAN_FILTERS:
+            value = params.get(field)
+            if value in (None, ''):
+                continue
+            if value.lower() not in ('true', 'false', '1', '0'):
+                raise serializers.ValidationError({field: "Must be true or false"})
+            queryset = queryset.filter(**{field: value.lower() in ('true', '1')})
+
+        return queryset
+
+    def _visible_applications(self):
         user = self.request.user
 
         if user.is_superuser:
@@ -324,38 +572,27 @@ class ApplicationListCreateView(generics.ListCreateAPIView):
             if vacancy.passcode != passcode:
                 raise serializers.ValidationError("Invalid passcode")
 
-        # --- TRANSACTION SAFE APPLICATION + ML ---
+        # --- TRANSACTION SAFE APPLICATION + SCORING JOB ---
+        # ML scoring runs in the background worker (manage.py run_scoring_worker)
+        # so the request never holds a write transaction during PDF parsing/LLM calls.
         with transaction.atomic():
             application = serializer.save(
                 candidate=candidate,
                 vacancy=vacancy,
                 status="applied",
+                scoring_state="pending",
             )
+            enqueue_scoring(application)
 
-            try:
-                final_score, category = score_application_and_store_resume(
-                    candidate=candidate,
-                    vacancy=vacancy,
-                    application=application,
-                )
-            except Exception:
-                # ML failure should not break DB consistency
-                final_score = 0.0
-                category = "no_visit"
-
-            application.final_score = final_score
-            application.category = category
-            application.save(update_fields=["final_score", "category"])
-            
-            # Send notifications
-            try:
-                # Notify candidate that application was submitted
-                notify_application_submitted(application)
-                # Notify organization about new application
-                notify_new_application(application)
-            except Exception as e:
-                # Don't fail application if notification fails
-                print(f"Failed to send notifications: {e}")
+        # Send notifications
+        try:
+            # Notify candidate that application was submitted
+            notify_application_submitted(application)
+            # Notify organization about new application
+            notify_new_application(application)
+        except Exception as e:
+            # Don't fail application if notification fails
+            print(f"Failed to send notifications: {e}")
 
 
 class ApplicationDetailView(generics.RetrieveUpdateAPIView):
@@ -481,22 +718,9 @@ class ApplicationAnalysisView(APIView):
                 status=403,
             )
 
-        # If analysis not present, attempt to run scorer synchronously for the owner
-        if not application.ml_result:
-            try:
-                # score_application_and_store_resume will write ml_result, final_score and logs
-                score_application_and_store_resume(
-                    candidate=application.candidate,
-                    vacancy=application.vacancy,
-                    application=application,
-                )
-                # refresh from DB
-                application.refresh_from_db()
-            except Exception:
-                return Response(
-                    {"detail": "No ML analysis available"},
-                    status=404,
-                )
+        # If analysis not present, queue scoring instead of blocking the request
+        if not application.ml_result and application.scoring_state not in ("pending", "running"):
+            enqueue_scoring(application)
 
         return Response({
             "application_id": application.id,
@@ -505,107 +729,115 @@ class ApplicationAnalysisView(APIView):
             "status": application.status,
             "final_score": application.final_score,
             "category": application.category,
+            "scoring_state": application.scoring_state,
             "analysis": application.ml_result,
         })
 
 
+def _page_params(request):
+    """(page, page_size) from ?page= and ?page_size=, clamped to search_index.MAX_PAGE_SIZE."""
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        page_size = int(request.query_params.get('page_size', search_index.DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = search_index.DEFAULT_PAGE_SIZE
+    page_size = min(max(1, page_size), search_index.MAX_PAGE_SIZE)
+    return page, page_size
+
+
 class GlobalSearchView(APIView):
     """
     Global search endpoint that searches across:
-    - Vacancies (title, description, location, required_skills, keywords)
-    - Candidates (name, email, skills, job_preferences)
-    - Organizations (name, description, location)
+    - Vacancies (title, description, location, experience_level, required_skills, keywords)
+    - Candidates (name, email, address, availability, skills, job_preferences)
+    - Organizations (name, description, location, contact_email)
+
+    Results come from the full-text index (see search_index.py), best BM25
+    match first. Every word of the query must start a word of the row
+    ("pyth" finds "Python", "ython" doesn't). Misspelled skills are widened to their nearest known
+    spellings (see fuzzy_terms.py), reported in `expanded_terms`. Each
+    section is paginated with ?page= and ?page_size=.
     """
     permission_classes = [IsAuthenticated]
 
+    # LIKE fallback where the full-text index isn't available
+    FALLBACK_FIELDS = {
+        'vacancies': ('title', 'description', 'location', 'experience_level', 'required_skills', 'keywords'),
+        'candidates': ('name', 'email', 'address', 'availability', 'skills', 'job_preferences'),
+        'organizations': ('name', 'description', 'location', 'contact_email'),
+    }
+
+    def _fallback_search(self, kind, query, offset, limit):
+        model = {'vacancies': Vacancy, 'candidates': Candidate, 'organizations': Organization}[kind]
+        condition = Q()
+        for name in self.FALLBACK_FIELDS[kind]:
+            # JSON lists are stored as text, so icontains also matches their items
+            condition |= Q(**{f'{name}__icontains': query})
+        queryset = model.objects.filter(condition)
+        if kind == 'vacancies':
+            queryset = queryset.filter(is_public=True, status='open')
+        queryset = queryset.order_by('-id')
+        return list(queryset[offset:offset + limit]), queryset.count()
+
     def get(self, request):
         query = request.query_params.get('q', '').strip()
-        
+        page, page_size = _page_params(request)
+
         if not query:
             return Response({
                 'vacancies': [],
                 'candidates': [],
                 'organizations': [],
                 'total_results': 0,
+                'counts': {'vacancies': 0, 'candidates': 0, 'organizations': 0},
+                'expanded_terms': {},
+                'page': page,
+                'page_size': page_size,
             })
 
-        user = request.user
-        
-        # Search Vacancies
-        vacancy_query = Q(title__icontains=query) | \
-                       Q(description__icontains=query) | \
-                       Q(location__icontains=query) | \
-                       Q(experience_level__icontains=query)
-        
-        # Also search in JSON fields (required_skills, keywords)
-        vacancies = Vacancy.objects.filter(vacancy_query, is_public=True, status='open')
-        
-        # Filter JSON fields in Python (since JSON field search is complex)
-        filtered_vacancies = []
-        for vacancy in vacancies:
-            # Check if query matches any skill or keyword
-            skills_match = any(query.lower() in str(skill).lower() for skill in vacancy.required_skills)
-            keywords_match = any(query.lower() in str(keyword).lower() for keyword in vacancy.keywords)
-            
-            if skills_match or keywords_match or vacancy in vacancies:
-                filtered_vacancies.append(vacancy)
-        
-        # Remove duplicates
-        vacancy_ids = set(v.id for v in filtered_vacancies)
-        vacancies = Vacancy.objects.filter(id__in=vacancy_ids, is_public=True, status='open')[:10]
-        
-        # Search Candidates (visible to all users)
-        candidate_query = Q(name__icontains=query) | \
-                        Q(email__icontains=query) | \
-                        Q(address__icontains=query) | \
-                        Q(availability__icontains=query)
-        
-        candidates = Candidate.objects.filter(candidate_query)
-        
-        # Filter JSON fields in Python
-        filtered_candidates = []
-        for candidate in candidates:
-            skills_match = any(query.lower() in str(skill).lower() for skill in candidate.skills)
-            prefs_match = any(query.lower() in str(pref).lower() for pref in candidate.job_preferences)
-            
-            if skills_match or prefs_match or candidate in candidates:
-                filtered_candidates.append(candidate)
-        
-        # Remove duplicates
-        candidate_ids = set(c.id for c in filtered_candidates)
-        candidates = Candidate.objects.filter(id__in=candidate_ids)[:10]
-        
-        # Search Organizations (visible to all authenticated users)
-        org_query = Q(name__icontains=query) | \
-                   Q(description__icontains=query) | \
-                   Q(location__icontains=query) | \
-                   Q(contact_email__icontains=query)
-        
-        organizations = Organization.objects.filter(org_query)[:10]
-        
+        offset = (page - 1) * page_size
+        # Misspelled skills ("pyhton") also match their nearest known spellings
+        expansions = expand_query(query)
+        results, counts = {}, {}
+        for kind in ('vacancies', 'candidates', 'organizations'):
+            found = search_index.search(kind, query, offset=offset, limit=page_size, expansions=expansions)
+            if found is None:
+                found = self._fallback_search(kind, query, offset, page_size)
+            results[kind], counts[kind] = found
+
         # Serialize results
-        vacancy_serializer = VacancySerializer(vacancies, many=True)
-        candidate_serializer = CandidateSerializer(candidates, many=True, context={'request': request})
-        org_serializer = OrganizationSerializer(organizations, many=True)
-        
-        total_results = len(vacancies) + len(candidates) + len(organizations)
-        
+        vacancy_serializer = VacancySerializer(results['vacancies'], many=True)
+        candidate_serializer = CandidateSerializer(results['candidates'], many=True, context={'request': request})
+        org_serializer = OrganizationSerializer(results['organizations'], many=True)
+
         return Response({
             'query': query,
             'vacancies': vacancy_serializer.data,
             'candidates': candidate_serializer.data,
             'organizations': org_serializer.data,
-            'total_results': total_results,
+            'total_results': sum(counts.values()),
+            'counts': counts,
+            'expanded_terms': expansions,
+            'page': page,
+            'page_size': page_size,
         })
 
 
 class SearchSuggestionsView(APIView):
     """
     Provides search suggestions/autocomplete based on partial query
-    Returns top 10 suggestions from each category
+    Returns up to 10 suggestions, from the in-memory prefix index of
+    vacancies, organizations, candidates, skills and locations
+    (see suggestions.py), most popular first within each type.
+    Terms match the start of a word (vacancies by title or location)
     """
     permission_classes = [IsAuthenticated]
 
+    EXPERIENCE_LEVELS = ['Entry Level', 'Mid Level', 'Senior Level', 'Lead', 'Manager']
+
     def get(self, request):
         query = request.query_params.get('q', '').strip()
         
@@ -615,90 +847,10 @@ class SearchSuggestionsView(APIView):
                 'suggestions': [],
             })
 
-        user = request.user
-        suggestions = []
-        
-        # Get vacancy titles and locations
-        vacancies = Vacancy.objects.filter(
-            Q(title__icontains=query) | Q(location__icontains=query),
-            is_public=True,
-            status='open'
-        )[:5]
-        
-        for vacancy in vacancies:
-            suggestions.append({
-                'type': 'vacancy',
-                'text': vacancy.title,
-                'subtitle': vacancy.location or 'Job',
-                'id': vacancy.id,
-            })
-        
-        # Get organization names (visible to all)
-        organizations = Organization.objects.filter(
-            Q(name__icontains=query)
-        )[:3]
-        
-        for org in organizations:
-            suggestions.append({
-                'type': 'organization',
-                'text': org.name,
-                'subtitle': 'Organization',
-                'id': org.id,
-            })
-        
-        # Get candidate names (visible to all users)
-        candidates = Candidate.objects.filter(
-            Q(name__icontains=query)
-        )[:3]
-        
-        for candidate in candidates:
-            suggestions.append({
-                'type': 'candidate',
-                'text': candidate.name,
-                'subtitle': 'Candidate',
-                'id': candidate.id,
-            })
-        
-        # Add skill-based suggestions from vacancies
-        all_vacancies = Vacancy.objects.filter(is_public=True, status='open')
-        skill_suggestions = set()
-        
-        for vacancy in all_vacancies:
-            for skill in vacancy.required_skills:
-                if query.lower() in str(skill).lower():
-                    skill_suggestions.add(str(skill))
-                    if len(skill_suggestions) >= 3:
-                        break
-            if len(skill_suggestions) >= 3:
-                break
-        
-        for skill in skill_suggestions:
-            suggestions.append({
-                'type': 'skill',
-                'text': skill,
-                'subtitle': 'Skill',
-                'id': None,
-            })
-        
-        # Add location-based suggestions from vacancies
-        location_suggestions = set()
-        for vacancy in all_vacancies:
-            if vacancy.location and query.lower() in vacancy.location.lower():
-                location_suggestions.add(vacancy.location)
-                if len(location_suggestions) >= 2:
-                    break
-        
-        for location in location_suggestions:
-            suggestions.append({
-                'type': 'location',
-                'text': location,
-                'subtitle': 'Location',
-                'id': None,
-            })
+        suggestions = suggest(query)
         
         # Add experience level suggestions
-        experience_levels = ['Entry Level', 'Mid Level', 'Senior Level', 'Lead', 'Manager']
-        for level in experience_levels:
+        for level in self.EXPERIENCE_LEVELS:
             if query.lower() in level.lower():
                 suggestions.append({
                     'type': 'experience',
@@ -713,6 +865,49 @@ class SearchSuggestionsView(APIView):
         })
 
 
+class VacancyFacetSearchView(APIView):
+    """
+    Open public vacancies filtered by facets, newest first, with the
+    number of matches per facet value (see facets.py):
+
+        ?skill=Python&skill=Django   any of these skills
+        ?location=Kathmandu          any of these locations
+        ?experience_level=Senior     any of these levels
+        ?salary_min=50000&salary_max=100000   salary range overlapping these bounds
+
+    Paginated with ?page= and ?page_size=.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _amount(self, request, name):
+        try:
+            return float(request.query_params[name])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def get(self, request):
+        page, page_size = _page_params(request)
+        params = request.query_params
+        filters = {
+            'skills': [value for value in params.getlist('skill') if value.strip()],
+            'locations': [value for value in params.getlist('location') if value.strip()],
+            'experience_levels': [value for value in params.getlist('experience_level') if value.strip()],
+            'salary_min': self._amount(request, 'salary_min'),
+            'salary_max': self._amount(request, 'salary_max'),
+        }
+
+        vacancies, total, facet_counts = facets.search(filters, offset=(page - 1) * page_size, limit=page_size)
+
+        return Response({
+            'results': VacancyListSerializer(vacancies, many=True).data,
+            'count': total,
+            'facets': facet_counts,
+            'filters': filters,
+            'page': page,
+            'page_size': page_size,
+        })
+
+
 class DownloadVacancyResumesView(APIView):
     """
     Download all resumes for a vacancy organized by category as a ZIP file
@@ -1052,9 +1247,10 @@ class SelfTestVacancyView(APIView):
             
             print(f"Updated candidate resume to: {saved_path}")
 
-            # Run ML scoring
+            # Run ML scoring (self-tests stay synchronous: the organization waits for the result)
             final_score = 0.0
             category = "no_visit"
+            scoring_state = "failed"
             
             try:
                 from .ml_scoring import score_application_and_store_resume
@@ -1063,7 +1259,9 @@ class SelfTestVacancyView(APIView):
                     candidate=test_candidate,
                     vacancy=vacancy,
                     application=application,
+                    with_summary=True,
                 )
+                scoring_state = "done"
                 print(f"ML scoring completed: score={final_score}, category={category}")
             except Exception as ml_error:
                 print(f"ML scoring failed for self-test: {ml_error}")
@@ -1083,7 +1281,8 @@ class SelfTestVacancyView(APIView):
             # Update application with scores
             application.final_score = final_score
             application.category = category
-            application.save(update_fields=['final_score', 'category'])
+            application.scoring_state = scoring_state
+            application.save(update_fields=['final_score', 'category', 'scoring_state'])
 
             # Refresh from DB to get the saved ml_result
             application.refresh_from_db()